@@ -0,0 +1,57 @@
+"""
+Compares the text layout engines on the typical calendar texts: the event titles, the notes and the texts
+in the scripts which need the complex shaping. Every text is measured and drawn, the caches are not used.
+
+    python benchmarks/text_layout.py --repeat 200
+"""
+import argparse
+import time
+from typing import List
+
+from PIL import Image, ImageDraw, ImageFont
+
+from calendar_view.config import style
+from calendar_view.core import text_layout
+
+
+TITLES: List[str] = ['Ashtanga, 90 mins', 'HOT Core Yoga, 75 mins', 'Vinyasa, 60 mins', 'Daily stand-up',
+                     'Sprint planning', 'Lunch', 'Retrospective', 'Café with Zoë', 'Встреча команды']
+NOTES: List[str] = ['Room 1\nBring the mat', 'with Anna', 'Meeting room 3, 2nd floor\nThe agenda is in the wiki',
+                    'Remote', 'Skip if the release\nis not ready']
+COMPLEX: List[str] = ['اجتماع الفريق', 'योग कक्षा', 'ประชุมทีม', 'ישיבת צוות', 'Yoga (योग)']
+
+
+def measure(layout: str, font: ImageFont.FreeTypeFont, texts: List[str], repeat: int) -> float:
+    """
+    :return: the microseconds per text
+    """
+    style.text_layout = layout
+    draw = ImageDraw.Draw(Image.new('L', (1000, 200)))
+    start: float = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            text_font = text_layout.font_for(font, text)
+            draw.multiline_textbbox((0, 0), text, font=text_font)
+            draw.multiline_text((10.5, 10.25), text, font=text_font, fill=255)
+    return (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=100, help='the number of the passes over the texts')
+    args = parser.parse_args()
+
+    if not text_layout.is_raqm_available():
+        print('libraqm is not installed: the raqm layout falls back to the basic one\n')
+    configured: str = style.text_layout
+    workloads = [('titles', style.event_title_font, TITLES), ('notes', style.event_notes_font, NOTES),
+                 ('complex scripts', style.event_title_font, COMPLEX)]
+    print(f"{'workload':<16}" + ''.join(f'{layout + ", us":>12}' for layout in text_layout.LAYOUTS))
+    for name, font, texts in workloads:
+        results: List[float] = [measure(layout, font, texts, args.repeat) for layout in text_layout.LAYOUTS]
+        print(f'{name:<16}' + ''.join(f'{result:>12.1f}' for result in results))
+    style.text_layout = configured
+
+
+if __name__ == '__main__':
+    main()
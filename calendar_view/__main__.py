@@ -0,0 +1,6 @@
+import sys
+
+from calendar_view.cli import main
+
+
+sys.exit(main())
@@ -1,15 +1,33 @@
-from typing import List, Tuple
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor
+from io import BytesIO
+from typing import List, Tuple, Union, BinaryIO, Optional, Iterable
 
-from PIL import Image, ImageDraw
+from PIL import Image
 
 from calendar_view.config import style
 from calendar_view.core.calendar_events import CalendarEvents
 from calendar_view.core.calendar_grid import CalendarGrid
 from calendar_view.core.config import CalendarConfig
+from calendar_view.core.deadline import CancellationToken, Deadline, NO_DEADLINE, RenderInterruptedError, \
+    RenderTimeoutError
+from calendar_view.core.estimate import AdmissionDecision, AdmissionPolicy, JobTooLargeError, RenderEstimate, \
+    estimate_render
 from calendar_view.core.event import Event
+from calendar_view.core.fingerprint import render_fingerprint
+from calendar_view.core.image_pool import ImagePool, image_pool
+from calendar_view.core.layout import CalendarLayout, EventBox, GridLayout, LegendPage, TextBlock
+from calendar_view.core import pixels
+from calendar_view.core.render_cache import RenderCache
+from calendar_view.core.renderers import PillowRenderer
+from calendar_view.core.tiles import TileRenderer
 from calendar_view.core.utils import StringUtils, FontUtils
 
 
+logger = logging.getLogger(__name__)
+
+
 class Calendar:
     @staticmethod
     def build(config: CalendarConfig = CalendarConfig()):
@@ -17,15 +35,25 @@ class Calendar:
         cal.draw_grid()
         return cal
 
-    def __init__(self, config: CalendarConfig):
+    def __init__(self, config: CalendarConfig, pool: Optional[ImagePool] = None, tiles: Optional[TileRenderer] = None):
+        """
+        :param pool: the pool of the image buffers, the shared 'image_pool' by default
+        :param tiles: if defined, the image is rendered in the row bands by the worker processes
+        """
         self.config = config
-        self.grid = CalendarGrid(config)
-        self.events = CalendarEvents(config)
+        self.pool: ImagePool = pool if pool is not None else image_pool
+        self.tiles: Optional[TileRenderer] = tiles
+        self.grid = CalendarGrid(config, self.pool)
+        self.events = CalendarEvents(config, self.pool)
+        self.events.geometry = self.grid.geometry
         self.full_image: Image = None
+        self.legend_pages: List[Image] = []  # the legend pages after the first one, see 'style.legend_max_height'
+        self._returned: bool = False  # 'full_image' is returned by 'render', it isn't given to the pool
 
     def draw_grid(self):
+        if self.grid.geometry.is_fit_enabled():
+            return  # the grid depends on the events, it is drawn while rendering
         self.grid.draw_grid()
-        self.events.draw_grid(self.grid.get_size())
 
     def add_events(self, events: List[Event]) -> None:
         """
@@ -47,53 +75,306 @@ class Calendar:
         if kwargs:
             self.events.add_event(Event(**kwargs))
 
-    def save(self, filename: str) -> None:
-        self.events.group_cascade_events()
-        self._build_image()
-        self.full_image.save(filename, "PNG")
+    def estimate(self) -> RenderEstimate:
+        """
+        Predicts the image size, the peak memory and the work of the render from the config and the events.
+        Nothing is drawn and the event texts are not fitted.
+        """
+        self.__fit_canvas()
+        return estimate_render(self.config, self.grid, self.events)
 
-    def _build_image(self):
-        grid_image: Image = self.grid.get_image()
-        event_image: Image = self.events.draw_events()
-        legend: Image = self.events.draw_legend()
+    def add_columns(self, start, end, title=None, notes=None, style=None) -> list:
+        """
+        Adds the events given as the columns of timestamps, titles, notes and styles. The columns are clipped
+        to the date range and split into days with numpy if it is installed, see 'calendar_view.core.columnar'.
+        :return: the 'EventRow' parents of the added segments in the order of the input, None for the hidden rows
+        """
+        from calendar_view.core import columnar
 
-        events: Image = Image.alpha_composite(grid_image, event_image)
-        combined: Image = self._combine_image(events, self.config.title, legend)
+        return columnar.add_columns(self.events, start, end, title, notes, style)
 
-        self.full_image = Image.new("RGBA", combined.size, style.image_bg)
-        self.full_image = Image.alpha_composite(self.full_image, combined)
+    def add_frame(self, frame, **columns: str) -> list:
+        """
+        Adds the events from the pandas DataFrame, Arrow Table or the dict of columns.
+        :param columns: the names of the columns if they differ from 'start', 'end', 'title', 'notes' and 'style'
+        """
+        from calendar_view.core import columnar
 
-    def destroy(self):
-        self.grid.destroy()
-        self.events.destroy()
-        del self.full_image
+        return columnar.add_frame(self.events, frame, **columns)
 
-    @staticmethod
-    def _combine_image(events: Image, title: str, legend: Image):
+    def save(self, filename: Union[str, BinaryIO], cache: Optional[RenderCache] = None,
+             deadline: Optional[Deadline] = None, policy: Optional[AdmissionPolicy] = None,
+             key: Optional[str] = None) -> None:
         """
-        Add title and combine all images into one.
+        Renders the calendar and writes the PNG image.
+        :param filename: the file name or the binary file object
+        :param cache: if defined, the image rendered before with the same config, events and styles is reused.
+            Nothing is drawn in this case and 'full_image' stays empty.
+        :param deadline: the time limit and the cancellation token of the render. RenderTimeoutError or
+            RenderCancelledError is raised when the render is stopped, the images drawn so far are released.
+        :param policy: the budget of the render checked with 'estimate' before drawing. JobTooLargeError is raised
+            for the rejected job, the downscaled job is saved as the preview of the allowed size without the cache.
+        :param key: the cache key, 'render_fingerprint' of the config and the added events by default. The caller
+            knowing the input events passes their fingerprint, so it can look the image up before building
+            the calendar: the recurring, split and hidden events are stored here after the expansion.
+        """
+        if policy is not None:
+            decision: AdmissionDecision = policy.decide(self.estimate())
+            if decision.action == AdmissionPolicy.REJECT:
+                raise JobTooLargeError(decision.estimate, decision.reasons)
+            if decision.action != AdmissionPolicy.RENDER:
+                logger.info(f'Rendering the preview {decision.preview_size}: {", ".join(decision.reasons)}')
+                self.save_preview(filename, *decision.preview_size)
+                return
+
+        if cache is None:
+            self._build_image(deadline)
+            (deadline or NO_DEADLINE).check('encode')
+            self.full_image.save(filename, "PNG")
+            return
+
+        key = key or render_fingerprint(self.config, self.events.events)
+        content: Optional[bytes] = cache.get(key)
+        if content is None:
+            buffer = BytesIO()
+            self.save(buffer, deadline=deadline)
+            content = buffer.getvalue()
+            cache.put(key, content)
+        if isinstance(filename, str):
+            with open(filename, 'wb') as f:
+                f.write(content)
+        else:
+            filename.write(content)
+
+    def save_legend_pages(self, filename_pattern: str) -> List[str]:
+        """
+        Writes the legend pages which didn't fit into the calendar image. Call it after 'save'.
+        :param filename_pattern: the file name with the page number placeholder, e.g. 'legend-{}.png'.
+            The numbering starts from 2, the first page is a part of the calendar image.
+        :return: the written file names
+        """
+        filenames: List[str] = []
+        for number, page in enumerate(self.legend_pages, start=2):
+            filename: str = filename_pattern.format(number)
+            page.save(filename, "PNG")
+            filenames.append(filename)
+        return filenames
+
+    def to_bytes(self, cache: Optional[RenderCache] = None, deadline: Optional[Deadline] = None,
+                 policy: Optional[AdmissionPolicy] = None, key: Optional[str] = None) -> bytes:
+        """
+        Renders the calendar and returns the PNG image in memory.
+        """
+        buffer = BytesIO()
+        self.save(buffer, cache, deadline, policy, key)
+        return buffer.getvalue()
+
+    def render(self, deadline: Optional[Deadline] = None) -> Image:
+        """
+        Renders the calendar and returns the RGBA image without encoding it. It is also kept in 'full_image'.
+        The returned image belongs to the caller: 'reset' and 'destroy' don't return it to the pool.
+        :param deadline: see 'save'
+        """
+        self._build_image(deadline)
+        self._returned = True
+        return self.full_image
+
+    def to_buffer(self, deadline: Optional[Deadline] = None) -> memoryview:
+        """
+        Renders the calendar and returns the RGBA pixels row by row, see 'calendar_view.core.pixels.get_pixels'.
+        The image rendered by 'TileRenderer' is not copied.
+        """
+        return pixels.get_pixels(self.render(deadline))
+
+    def to_array(self, deadline: Optional[Deadline] = None):
+        """
+        Renders the calendar and returns the pixels as the numpy array with the shape (height, width, 4).
+        """
+        return pixels.to_array(self.render(deadline))
+
+    def save_raw(self, filename: str, deadline: Optional[Deadline] = None) -> Tuple[int, int]:
         """
+        Renders the calendar and writes the RGBA pixels without encoding, 'pixels.map_raw' maps the file back.
+        :return: the width and the height of the image
+        """
+        image: Image = self.render(deadline)
+        pixels.save_raw(image, filename)
+        return image.size
+
+    async def render_async(self, executor: Optional[Executor] = None, timeout: Optional[float] = None,
+                           cache: Optional[RenderCache] = None) -> bytes:
+        """
+        Renders the calendar in the executor without blocking the event loop and returns the PNG image in memory.
+        :param executor: the thread or process pool. The default executor of the loop is used if not defined.
+            The process pool gets the config and the events and builds the calendar again in the worker process.
+        :param timeout: the time limit in seconds. asyncio.TimeoutError is raised when it is exceeded.
+        :param cache: the render cache, see 'save'
+        """
+        loop = asyncio.get_running_loop()
+        token = CancellationToken()
+        if isinstance(executor, ProcessPoolExecutor):
+            future = loop.run_in_executor(executor, render_png, self.config, self.events.events, cache, timeout)
+        else:
+            future = loop.run_in_executor(executor, self.to_bytes, cache, Deadline(timeout, token))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except RenderTimeoutError as e:
+            raise asyncio.TimeoutError(str(e)) from e
+        except BaseException:
+            # the awaiting coroutine is released immediately, the worker thread stops at the next check
+            token.cancel()
+            raise
+
+    def compute_layout(self) -> CalendarLayout:
+        """
+        The layout pass: positions the grid, the events, the title and the legend without drawing anything.
+        The layout can be rendered by any renderer from 'calendar_view.core.renderers'.
+        """
+        self.events.layout_events()
+        self.events.deadline.check('layout_events')
+        self.__fit_canvas()
+        grid: GridLayout = self.grid.layout_grid()
+        events: List[EventBox] = self.events.layout_event_boxes()
+        legend_pages: List[LegendPage] = self.events.layout_legend_pages()
+        legend: Optional[LegendPage] = legend_pages[0] if legend_pages else None
+        title: str = self.config.title
+
         if StringUtils.is_blank(title) and legend is None:
-            return events
+            return CalendarLayout(grid.size, style.image_bg, None, (0, 0), grid, events, (0, grid.size[1]), [])
 
-        event_width, event_height = events.size
+        event_width, event_height = grid.size
         legend_width, legend_height = (0, 0) if legend is None else legend.size
         title_size: Tuple[int, int] = FontUtils.get_multiline_text_size(style.title_font, title)
         title_width = title_size[0] + style.title_padding_left + style.title_padding_right
         title_height = title_size[1] + style.title_padding_top + style.title_padding_bottom
         final_width = max(event_width, title_width, legend_width)
 
-        combined: Image = Image.new("RGBA", (final_width, event_height + title_height + legend_height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(combined)
-        # title
         title_padding_left = max(style.title_padding_left, (final_width - title_size[0]) / 2)
-        draw.multiline_text((title_padding_left, style.title_padding_top), title, align='center',
-                            font=style.title_font, fill=style.title_color)
-        # events
+        title_block = TextBlock(title, (title_padding_left, style.title_padding_top), title_size, 'title_font',
+                                style.title_color, align='center')
         events_start = (int((final_width - event_width) / 2), title_height)
-        combined.paste(events, events_start)
-        if legend is not None:
-            legend_start = (0, title_height + event_height)
-            combined.paste(legend, legend_start)
+        legend_start = (0, title_height + event_height)
+        return CalendarLayout((final_width, event_height + title_height + legend_height), style.image_bg, title_block,
+                              events_start, grid, events, legend_start, legend_pages)
+
+    def compute_preview_layout(self, width: int, height: Optional[int] = None) -> CalendarLayout:
+        """
+        The layout of the preview: the grid lines and the coloured event blocks positioned directly at the target size.
+        The texts are not fitted, the title, the labels and the legend are skipped.
+        :param width: the width of the preview in pixels
+        :param height: the height of the preview in pixels, the aspect ratio of the grid is kept if not defined
+        """
+        self.events.group_cascade_events()
+        self.__fit_canvas()
+        grid: GridLayout = self.grid.layout_grid(labels=False)
+        events: List[EventBox] = self.events.layout_event_boxes(text=False)
+
+        # only the table is shown, the paddings for the labels are cut off
+        margin: int = style.line_day_width
+        origin: Tuple[float, float] = (style.padding_horizontal - margin,
+                                       style.padding_vertical + style.hour_height - margin)
+        table_size: Tuple[float, float] = (grid.size[0] - 2 * origin[0],
+                                           grid.size[1] - origin[1] - style.padding_vertical + margin)
+        if height is None:
+            height = max(1, round(table_size[1] * width / table_size[0]))
+        factor: Tuple[float, float] = (width / table_size[0], height / table_size[1])
+
+        preview_grid: GridLayout = grid.scaled((width, height), factor, origin)
+        preview_events: List[EventBox] = [e.scaled(factor, origin) for e in events]
+        return CalendarLayout((width, height), style.image_bg, None, (0, 0), preview_grid, preview_events,
+                              (0, height), [])
+
+    def render_preview(self, width: int, height: Optional[int] = None) -> Image:
+        """
+        Renders the small preview of the calendar, see 'compute_preview_layout'.
+        It is not needed to build the calendar (draw the full grid) before, 'Calendar(config)' is enough.
+        """
+        return PillowRenderer().render(self.compute_preview_layout(width, height))
+
+    def save_preview(self, filename: Union[str, BinaryIO], width: int, height: Optional[int] = None) -> None:
+        self.render_preview(width, height).save(filename, "PNG")
+
+    def _build_image(self, deadline: Optional[Deadline] = None):
+        deadline = deadline or NO_DEADLINE
+        self.events.deadline = deadline
+        self._returned = False
+        try:
+            renderer = PillowRenderer(deadline, self.pool)
+            layout: CalendarLayout = self.compute_layout()
+            deadline.check('render')
+            # the grid drawn before is used if it has the same geometry
+            grid_image: Optional[Image] = None if self.grid.geometry.is_fitted() else self.grid.get_image()
+            if self.tiles is not None:
+                self.full_image = self.tiles.render(layout, deadline)
+            else:
+                self.full_image = renderer.render(layout, grid_image=grid_image)
+            self.legend_pages = [renderer.render_legend_page(page) for page in layout.legend_pages[1:]]
+        except RenderInterruptedError:
+            self.full_image = None
+            self.legend_pages = []
+            raise
+        finally:
+            self.events.deadline = NO_DEADLINE
+
+    def _release_images(self) -> None:
+        self.pool.release(None if self._returned else self.full_image, *self.legend_pages)
+        self._returned = False
+
+    def __fit_canvas(self) -> None:
+        """
+        Fits the hour range and the day columns to the events, see 'config.fit_hours' and 'config.collapse_empty_days'.
+        """
+        self.events.geometry = self.grid.geometry  # the grid and the events can be replaced after '__init__'
+        self.grid.geometry.fit(self.events)
+
+    def reset(self) -> None:
+        """
+        Removes the events and returns the rendered images to the pool, so the calendar can be filled
+        and rendered again. The grid drawn for the config is kept. 'full_image' and the legend pages
+        must not be used after the reset, copy them before if needed. The image returned by 'render' stays valid.
+        """
+        self.events.reset()
+        self._release_images()
+        self.full_image = None
+        self.legend_pages = []
+
+    def destroy(self):
+        self.grid.destroy()
+        self.events.destroy()
+        self._release_images()
+        del self.full_image
+        del self.legend_pages
+
+
+def render_png(config: CalendarConfig, events: List[Event], cache: Optional[RenderCache] = None,
+               timeout: Optional[float] = None, policy: Optional[AdmissionPolicy] = None) -> bytes:
+    """
+    Builds and renders the calendar. Used to render in the worker threads and processes.
+    :param timeout: the time limit of the render in seconds, RenderTimeoutError is raised when it is exceeded
+    :param policy: the budget of the render, see 'Calendar.save'
+    """
+    deadline = Deadline(timeout)
+    # the grid is drawn while rendering, nothing is allocated before the admission
+    calendar = Calendar(config)
+    try:
+        calendar.add_events(events)
+        key: Optional[str] = render_fingerprint(config, events) if cache is not None else None
+        return calendar.to_bytes(cache, deadline, policy, key)
+    finally:
+        calendar.destroy()
+
 
-        return combined
+async def render_many_async(calendars: Iterable[Calendar], executor: Optional[Executor] = None,
+                            timeout: Optional[float] = None, cache: Optional[RenderCache] = None) -> List[bytes]:
+    """
+    Renders the calendars concurrently in the executor. Returns the PNG images in the same order.
+    If any render fails or is cancelled, the others are cancelled too.
+    :param timeout: the time limit for every calendar in seconds
+    """
+    tasks: List[asyncio.Future] = [asyncio.ensure_future(c.render_async(executor, timeout, cache)) for c in calendars]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
@@ -0,0 +1,226 @@
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional, Tuple
+
+from calendar_view import spec as job_spec
+from calendar_view.core.estimate import AdmissionPolicy
+from calendar_view.core.fingerprint import render_fingerprint
+from calendar_view.core.render_cache import RenderCache
+
+
+logger = logging.getLogger(__name__)
+
+FONT_WARM_UP_TEXT = 'Mo, 01.01 0123456789 ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz'
+
+
+class RenderJob(object):
+    """
+    One calendar to render: the job specification and the output file.
+    """
+    def __init__(self, spec: dict, source: str, output: str):
+        self.spec = spec
+        self.source = source
+        self.output = output
+        self.weight: int = job_spec.job_weight(spec)
+
+    def __repr__(self) -> str:
+        return f'RenderJob[source: {self.source}, output: {self.output}, weight: {self.weight}]'
+
+
+def warm_up_fonts() -> None:
+    """
+    Loads the fonts and rasterizes the common glyphs once per worker process.
+    The next jobs in the same process reuse them.
+    """
+    from calendar_view.config import style
+    from calendar_view.core.utils import FontUtils
+
+    for font in (style.title_font, style.hour_number_font, style.day_of_week_font, style.event_title_font,
+                 style.event_notes_font, style.legend_name_font):
+        FontUtils.get_multiline_text_size(font, FONT_WARM_UP_TEXT)
+
+
+def render_job(job: RenderJob, cache: Optional[RenderCache] = None) -> Tuple[str, float, int]:
+    """
+    Renders the job to the file. Returns the output file, the rendering time in seconds and the number of
+    rendered pixels (0 if the image is taken from the cache).
+    """
+    started: float = time.perf_counter()
+    os.makedirs(os.path.dirname(job.output) or '.', exist_ok=True)  # the output can be in the subdirectory
+    key: Optional[str] = None
+    if cache is not None:
+        # the cached image is found before the calendar and its grid are built,
+        # the key is the fingerprint of the input events, the same one is given to 'save'
+        config, events = job_spec.build_job(job.spec)
+        key = render_fingerprint(config, events)
+        content: Optional[bytes] = cache.get(key)
+        if content is not None:
+            with open(job.output, 'wb') as f:
+                f.write(content)
+            return job.output, time.perf_counter() - started, 0
+    calendar = job_spec.build_calendar(job.spec)
+    calendar.save(job.output, cache, key=key)
+    pixels: int = 0
+    if calendar.full_image is not None:
+        width, height = calendar.full_image.size
+        pixels = width * height
+    calendar.destroy()
+    return job.output, time.perf_counter() - started, pixels
+
+
+def collect_jobs(paths: List[str], output_dir: str) -> List[RenderJob]:
+    jobs: List[RenderJob] = []
+    for path in paths:
+        specs: List[dict] = job_spec.load_spec_file(path)
+        for index, spec in enumerate(specs):
+            output: str = os.path.join(output_dir, job_spec.output_name(spec, path, index, len(specs)))
+            jobs.append(RenderJob(spec, path, output))
+    # the largest jobs go first, so the small ones fill the gaps at the end
+    jobs.sort(key=lambda j: j.weight, reverse=True)
+    return jobs
+
+
+def run_jobs(jobs: List[RenderJob], workers: int, cache: Optional[RenderCache] = None) -> Tuple[int, int, int, int]:
+    """
+    Renders all jobs. Returns the number of rendered, cached and failed jobs and the total number of rendered pixels.
+    """
+    rendered, cached, failed, pixels = 0, 0, 0, 0
+
+    def report(job: RenderJob, result: Optional[Tuple[str, float, int]], error: Optional[BaseException]):
+        nonlocal rendered, cached, failed, pixels
+        if error is not None:
+            failed += 1
+            print(f'FAILED {job.source} -> {job.output}: {error}', file=sys.stderr)
+            return
+        rendered += 1
+        pixels += result[2]
+        if cache is not None and result[2] == 0:
+            cached += 1
+            print(f'{job.output} ({result[1]:.2f}s, cached)')
+        else:
+            print(f'{job.output} ({result[1]:.2f}s)')
+
+    if workers <= 1:
+        warm_up_fonts()
+        for job in jobs:
+            try:
+                report(job, render_job(job, cache), None)
+            except Exception as e:
+                report(job, None, e)
+        return rendered, cached, failed, pixels
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_up_fonts) as executor:
+        futures = {executor.submit(render_job, job, cache): job for job in jobs}
+        for future in as_completed(futures):
+            error: Optional[BaseException] = future.exception()
+            report(futures[future], None if error else future.result(), error)
+    return rendered, cached, failed, pixels
+
+
+def command_render(args: argparse.Namespace) -> int:
+    os.makedirs(args.output_dir, exist_ok=True)
+    try:
+        jobs: List[RenderJob] = collect_jobs(args.specs, args.output_dir)
+    except (OSError, ValueError) as e:
+        print(f'Cannot read the job specification: {e}', file=sys.stderr)
+        return 2
+
+    cache: Optional[RenderCache] = None
+    if args.cache_dir:
+        cache = RenderCache(args.cache_dir, max_size=args.cache_size * 1024 * 1024)
+
+    started: float = time.perf_counter()
+    rendered, cached, failed, pixels = run_jobs(jobs, args.jobs, cache)
+    elapsed: float = max(time.perf_counter() - started, 1e-9)
+    print(f'Rendered {rendered} of {len(jobs)} calendars in {elapsed:.2f}s with {args.jobs} worker(s): '
+          f'{rendered / elapsed:.2f} calendars/s, {pixels / elapsed / 1e6:.2f} Mpx/s'
+          + (f', {cached} from cache' if cache is not None else '')
+          + (f', {failed} failed' if failed else ''))
+    return 1 if failed else 0
+
+
+def command_serve(args: argparse.Namespace) -> int:
+    from calendar_view import server
+
+    disk_cache: Optional[RenderCache] = None
+    if args.cache_dir:
+        disk_cache = RenderCache(args.cache_dir, max_size=args.disk_cache_size * 1024 * 1024)
+    admission: Optional[AdmissionPolicy] = None
+    if args.max_pixels or args.max_memory:
+        admission = AdmissionPolicy(max_pixels=args.max_pixels,
+                                    max_memory=args.max_memory * 1024 * 1024 if args.max_memory else None,
+                                    action=args.over_budget)
+    server.serve(host=args.host, port=args.port, workers=args.jobs, max_queue=args.max_queue,
+                 executor=args.executor, cache_size=args.cache_size, disk_cache=disk_cache,
+                 render_timeout=args.render_timeout, admission=admission)
+    return 0
+
+
+def command_watch(args: argparse.Namespace) -> int:
+    from calendar_view.watch import SpecWatcher
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    warm_up_fonts()
+    watcher = SpecWatcher(args.specs, args.output_dir)
+
+    def report(output: str, days: Optional[List[int]]) -> None:
+        print(output if days is None else f'{output} (days: {", ".join(str(day) for day in days)})', flush=True)
+
+    try:
+        watcher.run(args.interval, report=report)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='calendar-view', description='Render calendar views from job specifications.')
+    parser.add_argument('-v', '--verbose', action='store_true', help='show the debug logs')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    render = commands.add_parser('render', help='render the JSON/YAML job specifications to PNG files')
+    render.add_argument('specs', nargs='+', help='the job specification files (*.json, *.yaml)')
+    render.add_argument('-o', '--output-dir', default='.', help='the directory for the rendered images')
+    render.add_argument('-j', '--jobs', type=int, default=1, help='the number of worker processes')
+    render.add_argument('--cache-dir', help='reuse the images rendered before from this directory')
+    render.add_argument('--cache-size', type=int, default=256, help='the maximum size of the cache in MB')
+    render.set_defaults(handler=command_render)
+
+    serve = commands.add_parser('serve', help='run the local HTTP render service')
+    serve.add_argument('--host', default='127.0.0.1', help='the address to listen on')
+    serve.add_argument('--port', type=int, default=8080, help='the port to listen on')
+    serve.add_argument('-j', '--jobs', type=int, default=2, help='the number of render workers')
+    serve.add_argument('--max-queue', type=int, default=8, help='the number of requests waiting for a free worker')
+    serve.add_argument('--executor', choices=('thread', 'process'), default='thread', help='the worker type')
+    serve.add_argument('--cache-size', type=int, default=64, help='the number of rendered images kept in memory')
+    serve.add_argument('--cache-dir', help='keep the rendered images in this directory')
+    serve.add_argument('--disk-cache-size', type=int, default=256, help='the maximum size of the disk cache in MB')
+    serve.add_argument('--render-timeout', type=float, help='stop the render after this number of seconds (504)')
+    serve.add_argument('--max-pixels', type=int, help='the maximal image size of one render in pixels')
+    serve.add_argument('--max-memory', type=int, help='the maximal estimated memory of one render in MB')
+    serve.add_argument('--over-budget', choices=AdmissionPolicy.ACTIONS, default=AdmissionPolicy.REJECT,
+                       help='what to do with the render over the limits (reject: 413)')
+    serve.set_defaults(handler=command_serve)
+
+    watch = commands.add_parser('watch', help='render the job specifications again when they are changed')
+    watch.add_argument('specs', nargs='+', help='the job specification files (*.json, *.yaml)')
+    watch.add_argument('-o', '--output-dir', default='.', help='the directory for the rendered images')
+    watch.add_argument('--interval', type=float, default=1.0, help='check the files every this number of seconds')
+    watch.set_defaults(handler=command_watch)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
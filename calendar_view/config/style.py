@@ -9,16 +9,23 @@ except ImportError:
 font_path: str = 'Roboto-Regular.ttf'
 
 
+# the layout engine of the texts: 'basic', 'raqm' (the complex shaping with libraqm) or 'auto':
+# the complex shaping only for the texts which need it, e.g. Arabic or Hindi, see 'calendar_view.core.text_layout'
+text_layout = 'auto'
+
+
 def image_font(size: int):
     res = files('calendar_view.resources.fonts') / font_path
     with as_file(res) as tmp_path:
-        return ImageFont.truetype(str(tmp_path), size)
+        # the other layout engine is chosen for the text while drawing, see 'text_layout'
+        return ImageFont.truetype(str(tmp_path), size, layout_engine=ImageFont.Layout.BASIC)
 
 
 image_bg = (255, 255, 255, 255)
 
 hour_height = 50
 day_width = 400
+collapsed_day_width = 60  # the width of the day without events, see 'collapse_empty_days' config
 padding_horizontal = 60
 padding_vertical = 30
 
@@ -59,5 +66,13 @@ legend_padding_left = 70
 legend_padding_right = 40
 legend_name_font = image_font(28)
 legend_name_color = 'black'
+legend_columns = 1
+legend_column_spacing = 60
+legend_max_height = None  # the legend is split into pages if it is higher (in pixels)
+
+now_line_color = (220, 50, 50, 255)
+now_line_width = 3
+now_event_border = (220, 50, 50, 255)
+now_event_border_width = 6
 
 # https://stackoverflow.com/questions/7510313/transparent-png-in-pil-turns-out-not-to-be-transparent
@@ -2,16 +2,21 @@ import logging
 import textwrap
 from collections import defaultdict
 from datetime import date, time, datetime, timedelta
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Set
 
 from PIL import Image, ImageDraw
 from PIL.ImageFont import FreeTypeFont
 
 from calendar_view.config import i18n, style
 from calendar_view.core import data, time_utils
+from calendar_view.core.calendar_grid import GridGeometry
 from calendar_view.core.config import CalendarConfig, VerticalAlign
-from calendar_view.core.event import Event
-from calendar_view.core.round_rectangle import draw_rounded_rectangle
+from calendar_view.core.deadline import Deadline, NO_DEADLINE
+from calendar_view.core.event import Event, EventSegment, EventStyle
+from calendar_view.core.image_pool import ImagePool
+from calendar_view.core.interval_index import IntervalIndex
+from calendar_view.core.layout import EventBox, LegendPage, TextBlock
+from calendar_view.core.renderers import PillowRenderer
 from calendar_view.core.utils import StringUtils, FontUtils
 
 
@@ -31,34 +36,96 @@ class MultilineTextMetadata(object):
         return f'MultilineTextMetadata[visible: {self.visible}, size: {self.size}, text: {self.text}]'
 
 
+class LegendEntry(object):
+    """
+    The measured line of the legend.
+    """
+    def __init__(self, text: str, size: Tuple[int, int]):
+        self.text: str = text
+        self.size: Tuple[int, int] = size
+
+    def __repr__(self) -> str:
+        return f'LegendEntry[size: {self.size}, text: {self.text}]'
+
+    @staticmethod
+    def column_height(entries: List['LegendEntry']) -> int:
+        return sum(e.size[1] for e in entries) + (len(entries) - 1) * style.legend_spacing
+
+    @staticmethod
+    def split_pages(entries: List['LegendEntry']) -> List[List[List['LegendEntry']]]:
+        """
+        Splits the entries into the pages of columns. Without 'style.legend_max_height' there is one page
+        with the columns of equal length. Otherwise, every column is filled up to the maximum height.
+        """
+        column_count: int = max(1, style.legend_columns)
+        if style.legend_max_height is None:
+            per_column: int = -(-len(entries) // column_count)
+            return [[entries[i:i + per_column] for i in range(0, len(entries), per_column)]]
+
+        max_column_height: int = style.legend_max_height - style.legend_padding_top - style.legend_padding_bottom
+        columns: List[List[LegendEntry]] = [[]]
+        column_height: int = 0
+        for entry in entries:
+            next_height: int = column_height + entry.size[1] + (style.legend_spacing if columns[-1] else 0)
+            if columns[-1] and next_height > max_column_height:
+                columns.append([])
+                next_height = entry.size[1]
+            columns[-1].append(entry)
+            column_height = next_height
+        return [columns[i:i + column_count] for i in range(0, len(columns), column_count)]
+
+
 class CalendarEvents(object):
-    def __init__(self, config: CalendarConfig):
+    def __init__(self, config: CalendarConfig, pool: Optional[ImagePool] = None):
+        """
+        :param pool: the event layer of 'draw_events' is taken from the pool and returned to it
+        """
         self.config = config
+        self.pool: Optional[ImagePool] = pool
         self.event_image: Image = None
         self.event_draw: ImageDraw = None
         self.full_image: Image = None
         self.events: List[Event] = []
+        self._legend: Optional[bool] = None
+        self._event_keys: Set[tuple] = set()  # see 'config.deduplicate'
+        self.geometry: GridGeometry = GridGeometry(config)
+        self.deadline: Deadline = NO_DEADLINE  # the deadline of the current render
+        self._index: Optional[IntervalIndex] = None
 
     def draw_grid(self, size: Tuple[float, float]):
-        self.event_image = Image.new("RGBA", size, (0, 0, 0, 0))
+        """
+        Creates the empty event layer of the grid size for 'draw_events'. The rendering doesn't use it.
+        """
+        self.__release_layer()
+        self.event_image = self.pool.acquire(size) if self.pool is not None else Image.new("RGBA", size, (0, 0, 0, 0))
         self.event_draw = ImageDraw.Draw(self.event_image)
 
+    def __release_layer(self) -> None:
+        if self.pool is not None and self.event_image is not None:
+            self.pool.release(self.event_image)
+        self.event_image, self.event_draw = None, None
+
     def add_event(self, event: Event) -> None:
         """
         Skip the empty events with a duration of fewer than 0 seconds.
         Splits events, if needed, to the separate days. The event in the result list has to be for 1 day only.
         Cut the event's time out of the visible time range.
         Validate events.
+        The recurring event is expanded to the occurrences in the visible date range.
         """
         if event.get_duration_seconds(self.config) < 1:
             logger.warning(f"Skipping event, the duration is too small: {event}")
             return
+        if event.recurrence is not None:
+            self.__add_recurring_event(event)
+            return
         end_date: date = event.get_end_date(self.config)
         start_date: date = event.get_start_date(self.config)
-        if end_date < self.config.get_date_range()[0]:
+        range_start, range_end = self.config.get_date_range()
+        if end_date < range_start:
             logger.warning(f"Skipping event, it ends before the visible range: {event}")
             return
-        if start_date > self.config.get_date_range()[1]:
+        if start_date > range_end:
             logger.warning(f"Skipping event, it starts after the visible range: {event}")
             return
 
@@ -66,82 +133,199 @@ class CalendarEvents(object):
             self.__do_add_event(event)
         else:
             logger.debug(f'Splitting the event: {event}')
-            iter_from: date = max(start_date, self.config.get_date_range()[0])
-            iter_to: date = min(end_date, self.config.get_date_range()[1])
+            iter_from: date = max(start_date, range_start)
+            iter_to: date = min(end_date, range_end)
+            # the time range is validated once for the parent event: only the first and the last days are partial
+            data.validate_time_range(event.start_time if iter_from == start_date else None,
+                                     event.end_time if iter_to == end_date else None, self.config)
             for single_date in time_utils.date_range(iter_from, iter_to):
-                next_date: date = single_date + timedelta(days=1)
+                start_minute: int = 0
+                end_minute: int = EventSegment.MINUTES_PER_DAY
                 if single_date == start_date:
-                    fr: datetime = datetime.combine(single_date, event.start_time)
-                    to: datetime = datetime.combine(next_date, time(0, 0))
+                    start_minute = event.start_time.hour * 60 + event.start_time.minute
                 elif single_date == end_date:
-                    fr: datetime = datetime.combine(single_date, time(0, 0))
-                    to: datetime = datetime.combine(single_date, event.end_time)
-                else:
-                    fr: datetime = datetime.combine(single_date, time(0, 0))
-                    to: datetime = datetime.combine(next_date, time(0, 0))
-                self.__do_add_event(Event(title=event.title, style=event.style, start=fr, end=to, notes=event.notes))
-
-    def __do_add_event(self, event: Event) -> None:
-        data.validate_event(event, self.config)
+                    end_minute = event.end_time.hour * 60 + event.end_time.minute
+                if end_minute > start_minute:
+                    segment = EventSegment(event, (single_date - range_start).days, start_minute, end_minute,
+                                           single_date)
+                    self.__do_add_event(segment, validate=False)
+
+    def __add_recurring_event(self, event: Event) -> None:
+        start_date: date = event.get_start_date(self.config)
+        span: timedelta = event.get_end_date(self.config) - start_date
+        date_from, date_to = self.config.get_date_range()
+        # the occurrence started before the range can continue in it
+        for day in event.recurrence.occurrences(start_date, date_from - span, date_to):
+            self.add_event(Event(title=event.title, notes=event.notes, style=event.style,
+                                 start=datetime.combine(day, event.start_time),
+                                 end=datetime.combine(day + span, event.end_time)))
+
+    def add_segments(self, segments: List[EventSegment]) -> None:
+        """
+        Adds the one-day segments prepared and validated before, see 'calendar_view.core.columnar'.
+        They are not split and validated again.
+        """
+        if self.config.deduplicate:
+            segments = [s for s in segments if not self.__is_duplicate(s)]
+        self.events.extend(segments)
+        self._legend = None
+        self._index = None
+        logger.debug(f'Added {len(segments)} internal segments')
+
+    def __is_duplicate(self, event: Event) -> bool:
+        key: tuple = self.__event_key(event)
+        if key in self._event_keys:
+            logger.debug(f'Skipping the duplicate event: {event}')
+            return True
+        self._event_keys.add(key)
+        return False
+
+    def __do_add_event(self, event: Event, validate: bool = True) -> None:
+        if self.config.deduplicate and self.__is_duplicate(event):
+            return
+        if validate:
+            data.validate_event(event, self.config)
         self.events.append(event)
+        self._legend = None
+        self._index = None
         logger.debug(f'Added internal event: {event}')
 
-        # if legend is needed
-        if self.config.legend is None and event.title is not None:
+    def layout_events(self) -> None:
+        """
+        The layout pass before drawing: groups the overlapping events and decides if the legend is needed.
+        """
+        if self.config.merge_adjacent:
+            self.merge_adjacent_events()
+        self.group_cascade_events()
+        self._legend = self.__is_legend_needed()
+
+    def merge_adjacent_events(self) -> None:
+        """
+        Merges the back-to-back events of the same day with the same title, notes and style into one segment.
+        The merged segment takes the place of the earliest event of the run.
+        """
+        runs: Dict[tuple, List[int]] = defaultdict(list)
+        for i, e in enumerate(self.events):
+            runs[(e.get_start_date(self.config), e.title, e.notes) + self.__style_key(e.style)].append(i)
+
+        merged: Dict[int, Optional[Event]] = {}
+        for indexes in runs.values():
+            if len(indexes) < 2:
+                continue
+            indexes.sort(key=lambda i: self.get_minute_range(self.events[i]))
+            first: int = indexes[0]
+            start, end = self.get_minute_range(self.events[first])
+            count: int = 1
+            for i in indexes[1:]:
+                next_start, next_end = self.get_minute_range(self.events[i])
+                if next_start == end:
+                    end = max(end, next_end)
+                    merged[i] = None
+                    count += 1
+                    continue
+                if count > 1:
+                    merged[first] = self.make_segment(self.events[first], (start, end))
+                first, start, end, count = i, next_start, next_end, 1
+            if count > 1:
+                merged[first] = self.make_segment(self.events[first], (start, end))
+
+        if merged:
+            logger.debug(f'Merged the adjacent events: {len(self.events)} -> '
+                         f'{len(self.events) - sum(1 for e in merged.values() if e is None)}')
+            self.events = [merged.get(i, e) for i, e in enumerate(self.events) if merged.get(i, e) is not None]
+            self._legend = None
+
+    def make_segment(self, event: Event, minute_range: Optional[Tuple[int, int]] = None) -> EventSegment:
+        """
+        Returns the new segment of the one-day event with the same parent.
+        :param minute_range: the minute range of the event by default
+        """
+        parent: Event = event.event if isinstance(event, EventSegment) else event
+        day: date = event.get_start_date(self.config)
+        start, end = minute_range or self.get_minute_range(event)
+        return EventSegment(parent, (day - self.config.get_date_range()[0]).days, start, end, day)
+
+    def get_minute_range(self, event: Event) -> Tuple[int, int]:
+        """
+        The start and end minute of the one-day event, the end of the day is 1440.
+        """
+        start: int = event.start_time.hour * 60 + event.start_time.minute
+        end: int = event.end_time.hour * 60 + event.end_time.minute
+        if end == 0 and event.get_end_date(self.config) > event.get_start_date(self.config):
+            end = EventSegment.MINUTES_PER_DAY
+        return start, end
+
+    def __event_key(self, event: Event) -> tuple:
+        return (event.get_start_date(self.config), event.start_time, event.end_time, event.title, event.notes) \
+            + self.__style_key(event.style)
+
+    @staticmethod
+    def __style_key(event_style: EventStyle) -> tuple:
+        return tuple(c if isinstance(c, str) else tuple(c) for c in (event_style.event_border, event_style.event_fill))
+
+    def is_legend_visible(self) -> bool:
+        """
+        The legend decision of the current render. The config is not changed by it.
+        """
+        if self._legend is None:
+            self._legend = self.__is_legend_needed()
+        return self._legend
+
+    def __is_legend_needed(self) -> bool:
+        """
+        If 'legend' is not configured, the legend is needed when any title doesn't fit into its event.
+        """
+        if self.config.legend is not None:
+            return self.config.legend
+        for event in self.events:
+            if event.title is None:
+                continue
             y = self.__get_event_y(event.start_time, event.end_time)
             height = y[1] - y[0]
-            width = style.day_width
+            width = self.geometry.get_day_width()
             text_size: Tuple[int, int] = FontUtils.get_multiline_text_size(style.event_title_font, event.title)
             if width < text_size[0] or height < text_size[1]:
-                self.config.legend = True
+                return True
+        return False
+
+    def get_index(self) -> IntervalIndex:
+        """
+        The interval index of the events for the overlap and free/busy queries.
+        It is built once and rebuilt after the events are changed.
+        """
+        if self._index is None or self._index.events is not self.events:
+            self._index = IntervalIndex.build(self)
+        return self._index
 
     def group_cascade_events(self) -> None:
-        group_counter: int = 1
-        groups: dict[int, list[Event]] = defaultdict(list)
-        for i in self.events:
-            for j in self.events:
-                if j == i:
-                    pass
-                else:
-                    if i.start_time <= j.start_time < i.end_time \
-                            and i.get_start_date(self.config) == j.get_start_date(self.config):
-                        if i.cascade_group == 0 and j.cascade_group == 0:
-                            i.cascade_group = group_counter
-                            j.cascade_group = group_counter
-                            group_counter += 1
-                        elif i.cascade_group == 0 and j.cascade_group != 0 or i.cascade_group != 0 \
-                                and j.cascade_group == 0:
-                            group_index: int = max(i.cascade_group, j.cascade_group)
-                            i.cascade_group, j.cascade_group = group_index, group_index
-                        elif i.cascade_group != j.cascade_group:
-                            for k in self.events:
-                                if k.cascade_group == i.cascade_group:
-                                    k.cascade_group = j.cascade_group
-
-        for i in self.events:
-            if i.cascade_group > 0:
-                group: list[Event] = groups[i.cascade_group]
-                group.append(i)
-        for i in groups.values():
-            total_group_cascade: int = len(i)
-            event_index: int = 1
-            for j in i:
-                j.cascade_index = event_index
-                event_index += 1
-                j.cascade_total = total_group_cascade
-
-        for i in groups.values():
-            for j in i:
-                for k in i:
+        """
+        Splits the day column between the overlapping events. The groups come from the interval index.
+        """
+        for event in self.events:
+            event.cascade_group, event.cascade_index, event.cascade_total = 0, 1, 1
+        for group_number, group in enumerate(self.get_index().cascade_groups(), start=1):
+            self.deadline.check('group_cascade_events')
+            if len(group) == 1:
+                continue
+            for event_index, event in enumerate(group, start=1):
+                event.cascade_group = group_number
+                event.cascade_index = event_index
+                event.cascade_total = len(group)
+            for j in group:
+                for k in group:
                     if j.cascade_index > k.cascade_index and j.start_time < k.start_time:
                         j.cascade_index, k.cascade_index = k.cascade_index, j.cascade_index
 
     def _draw_event(self, event: Event) -> None:
+        PillowRenderer.draw_event_box(self.event_image, self.event_draw, self.layout_event(event))
+
+    def layout_event(self, event: Event, text: bool = True) -> EventBox:
         """
         The events have already been split to the separate days. The event is for 1 day only.
+        :param text: if False, only the box is positioned, the title and notes are not fitted
         """
         day_number = (event.get_start_date(self.config) - self.config.get_date_range()[0]).days
-        x = self.__get_event_x(day_number)
+        x = self.get_day_x(day_number)
         y = self.__get_event_y(event.start_time, event.end_time)
         event_width: int = x[1] - x[0] - style.line_day_width
         cascade_event_width: int = event_width / event.cascade_total
@@ -149,23 +333,25 @@ class CalendarEvents(object):
         x2 = x1 + cascade_event_width
         p1 = (x1, y[0])
         p2 = (x2, y[1])
-        draw_rounded_rectangle(self.event_draw, [p1, p2], style.event_radius, outline=event.style.event_border,
-                               fill=event.style.event_fill, width=style.event_border_width)
+        box = EventBox(day_number, (x1, y[0], x2, y[1]), event.style.event_border, event.style.event_fill,
+                       style.event_border_width, style.event_radius)
 
-        if self.config.legend:
-            return  # The title and notes are printed in the legend. Skip drawing here.
+        if not text or self.is_legend_visible():
+            return box  # The title and notes are printed in the legend. Skip drawing here.
 
         cell_inner_size: Tuple[int, int] = EventDrawHelper.count_cell_inner_size(x, y)
         if cell_inner_size[0] == 0 or cell_inner_size[1] == 0:
-            return  # not possible to draw nothing inside the event cell
+            return box  # not possible to draw nothing inside the event cell
 
         # calculate text block sizes
-        title_metadata: MultilineTextMetadata = EventDrawHelper.build_title_metadata(event.title, cell_inner_size)
+        title_metadata: MultilineTextMetadata = EventDrawHelper.build_title_metadata(event.title, cell_inner_size,
+                                                                                     self.deadline)
         notes_inner_size: Tuple[int, int] = (
             cell_inner_size[0],
             cell_inner_size[1] - (title_metadata.size[1] + style.event_title_margin if title_metadata.visible else 0)
         )
-        notes_metadata: MultilineTextMetadata = EventDrawHelper.build_notes_metadata(event.notes, notes_inner_size)
+        notes_metadata: MultilineTextMetadata = EventDrawHelper.build_notes_metadata(event.notes, notes_inner_size,
+                                                                                     self.deadline)
 
         total_height: int = EventDrawHelper.count_final_text_height(title_metadata, notes_metadata)
         y_top_offset: int = y[0] + style.event_padding
@@ -181,8 +367,8 @@ class CalendarEvents(object):
                 (p1[0] + p2[0]) / 2 - title_metadata.size[0] / 2,
                 y_top_offset + y_text_offset
             )
-            self.event_draw.multiline_text(title_pos, title_metadata.text, align='center',
-                                           font=style.event_title_font, fill=style.event_title_color)
+            box.title = TextBlock(title_metadata.text, title_pos, title_metadata.size, 'event_title_font',
+                                  style.event_title_color, align='center')
             # update offset for notes
             y_top_offset = title_pos[1] + title_metadata.size[1] + style.event_title_margin
 
@@ -200,46 +386,119 @@ class CalendarEvents(object):
                 p1[0] + style.event_padding,
                 y_top_offset + y_text_offset
             )
-            self.event_draw.multiline_text(notes_pos, notes_metadata.text, align='left',
-                                           font=style.event_notes_font, fill=style.event_notes_color)
+            box.notes = TextBlock(notes_metadata.text, notes_pos, notes_metadata.size, 'event_notes_font',
+                                  style.event_notes_color, align='left')
+        return box
+
+    def reset(self) -> None:
+        """
+        Removes the events. The event layer drawn by 'draw_events' is returned to the pool.
+        """
+        self.events = []
+        self._event_keys.clear()
+        self._legend = None
+        self._index = None
+        self.__release_layer()
 
     def destroy(self):
+        self.__release_layer()
         del self.event_image
         del self.event_draw
         del self.full_image
 
     def draw_events(self) -> Image:
+        """
+        Draws the events on the event layer of the grid size. The layer is created here from the pool, the rendering
+        doesn't need it: see 'Calendar.render'. With 'config.fit_hours' or 'config.collapse_empty_days',
+        the geometry is fitted to the events first, draw the grid after it: 'Calendar.grid.draw_grid()'.
+        """
+        if self.geometry.is_fit_enabled():
+            self.geometry.fit(self)
+        size: Tuple[int, int] = self.geometry.get_grid_size()
+        if self.event_image is None or self.event_image.size != size:
+            self.draw_grid(size)
         for e in self.events:
+            self.deadline.check('draw_events')
             self._draw_event(e)
         return self.event_image
 
-    def draw_legend(self) -> Image:
-        if not self.config.legend or len(self.events) == 0:
-            return None
-        width = 0
-        height = 0
+    def layout_event_boxes(self, text: bool = True) -> List[EventBox]:
+        boxes: List[EventBox] = []
         for e in self.events:
-            text = self._get_event_legend_text(e)
-            text_width, text_height = FontUtils.get_multiline_text_size(style.legend_name_font, text)
-            width = max(width, text_width)
-            height += text_height
+            self.deadline.check('layout_event_boxes')
+            boxes.append(self.layout_event(e, text))
+        return boxes
 
-        width += style.legend_padding_left + style.legend_padding_right
-        height += (len(self.events) - 1) * style.legend_spacing + style.legend_padding_top + style.legend_padding_bottom
+    def draw_legend(self) -> Optional[Image]:
+        """
+        Returns the first page of the legend or None if the legend is not needed.
+        """
+        pages: List[Image] = self.draw_legend_pages()
+        return pages[0] if pages else None
 
-        legend_image: Image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-        legend_draw = ImageDraw.Draw(legend_image)
+    def draw_legend_pages(self) -> List[Image]:
+        renderer = PillowRenderer()
+        return [renderer.render_legend_page(page) for page in self.layout_legend_pages()]
 
-        x = style.legend_padding_left
-        y = style.legend_padding_top
+    def layout_legend_pages(self) -> List[LegendPage]:
+        """
+        Every legend line is measured once. The lines flow into 'style.legend_columns' columns,
+        the next page is started if the page is higher than 'style.legend_max_height'.
+        """
+        if not self.is_legend_visible() or len(self.events) == 0:
+            return []
+        entries: List[LegendEntry] = []
         for e in self.events:
-            _, text_height = FontUtils.get_multiline_text_size(style.event_title_font, e.title)
-            text = self._get_event_legend_text(e)
-            legend_draw.multiline_text((x, y), text, font=style.legend_name_font, fill=style.legend_name_color)
-            y += text_height + style.legend_spacing
+            self.deadline.check('layout_legend_pages')
+            entries.append(self._build_legend_entry(e))
+        return [self._layout_legend_page(columns) for columns in LegendEntry.split_pages(entries)]
+
+    def estimate_legend_sizes(self) -> List[Tuple[int, int]]:
+        """
+        The approximate sizes of the legend pages. The longest line is measured for the width, every line is as high
+        as the first measured line with the same number of text lines.
+        """
+        if not self.is_legend_visible() or len(self.events) == 0:
+            return []
+        texts: List[str] = [self._get_event_legend_text(e) for e in self.events]
+        width: int = FontUtils.get_multiline_text_size(style.legend_name_font, max(texts, key=len))[0]
+        heights: Dict[int, int] = {}
+        entries: List[LegendEntry] = []
+        for text in texts:
+            line_count: int = text.count('\n') + 1
+            if line_count not in heights:
+                heights[line_count] = FontUtils.get_multiline_text_size(style.legend_name_font, text)[1]
+            entries.append(LegendEntry(text, (width, heights[line_count])))
+        return [self._layout_legend_page(columns).size for columns in LegendEntry.split_pages(entries)]
+
+    def get_cascade_sizes(self) -> List[int]:
+        """
+        The sizes of the groups of the overlapping events of the same day, 1 for the single events.
+        The group splits the day column between its events, see 'group_cascade_events'.
+        """
+        return [len(group) for group in self.get_index().cascade_groups()]
 
-        del legend_draw
-        return legend_image
+    def _build_legend_entry(self, event: Event) -> 'LegendEntry':
+        text: str = self._get_event_legend_text(event)
+        return LegendEntry(text, FontUtils.get_multiline_text_size(style.legend_name_font, text))
+
+    @staticmethod
+    def _layout_legend_page(columns: List[List['LegendEntry']]) -> LegendPage:
+        column_widths: List[int] = [max(e.size[0] for e in column) for column in columns]
+        width: int = sum(column_widths) + (len(columns) - 1) * style.legend_column_spacing \
+            + style.legend_padding_left + style.legend_padding_right
+        height: int = max(LegendEntry.column_height(column) for column in columns) \
+            + style.legend_padding_top + style.legend_padding_bottom
+
+        texts: List[TextBlock] = []
+        x = style.legend_padding_left
+        for column, column_width in zip(columns, column_widths):
+            y = style.legend_padding_top
+            for entry in column:
+                texts.append(TextBlock(entry.text, (x, y), entry.size, 'legend_name_font', style.legend_name_color))
+                y += entry.size[1] + style.legend_spacing
+            x += column_width + style.legend_column_spacing
+        return LegendPage((width, height), texts)
 
     def _get_event_legend_text(self, event: Event) -> str:
         date_text = self._get_day_title(event.get_start_date(self.config))
@@ -255,23 +514,23 @@ class CalendarEvents(object):
             return '{}, {}'.format(weekday, date)
 
     def __get_event_y(self, start: time, end: time):
-        start_hour: int = start.hour
-        end_hour: int = 24 if (end.hour == 0 and end.minute == 0) else end.hour
-        config_start_hour = self.config.get_hours_range()[0]
-        if config_start_hour > 0:
-            start_hour -= config_start_hour
-            end_hour -= config_start_hour
-
-        y_start = style.padding_vertical + style.hour_height + start_hour * style.hour_height + (
-                    start.minute / 60) * style.hour_height
-        y_end = style.padding_vertical + style.hour_height + end_hour * style.hour_height + (
-                    end.minute / 60) * style.hour_height
-        return y_start, y_end
+        return self.get_time_y(start), self.get_time_y(end, end_of_day=True)
 
-    @staticmethod
-    def __get_event_x(day_number: int):
-        x_start = style.padding_horizontal + day_number * style.day_width
-        return x_start, x_start + style.day_width
+    def get_time_y(self, value: time, end_of_day: bool = False) -> float:
+        """
+        The vertical position of the time on the grid.
+        :param end_of_day: if True, '00:00' is the end of the day
+        """
+        hour: int = 24 if (end_of_day and value.hour == 0 and value.minute == 0) else value.hour
+        hour -= self.geometry.get_hours_range()[0]
+        return style.padding_vertical + style.hour_height + hour * style.hour_height + (
+                    value.minute / 60) * style.hour_height
+
+    def get_day_x(self, day_number: int) -> Tuple[int, int]:
+        """
+        The horizontal borders of the day column on the grid.
+        """
+        return self.geometry.get_day_x(day_number)
 
 
 class EventDrawHelper:
@@ -295,18 +554,20 @@ class EventDrawHelper:
         return height
 
     @staticmethod
-    def build_title_metadata(title: Optional[str], cell_inner_size: Tuple[int, int]) -> MultilineTextMetadata:
+    def build_title_metadata(title: Optional[str], cell_inner_size: Tuple[int, int],
+                             deadline: Deadline = NO_DEADLINE) -> MultilineTextMetadata:
         """
         Try to fit the title in the event inner cell. Split the text into the multiple lines if required.
         """
-        return EventDrawHelper.__build_text_metadata(title, cell_inner_size, style.event_title_font, True)
+        return EventDrawHelper.__build_text_metadata(title, cell_inner_size, style.event_title_font, True, deadline)
 
     @staticmethod
-    def build_notes_metadata(notes: Optional[str], notes_inner_size: Tuple[int, int]) -> MultilineTextMetadata:
+    def build_notes_metadata(notes: Optional[str], notes_inner_size: Tuple[int, int],
+                             deadline: Deadline = NO_DEADLINE) -> MultilineTextMetadata:
         """
         Try to fit notes in the event inner cell. Split the text into the multiple lines if required.
         """
-        return EventDrawHelper.__build_text_metadata(notes, notes_inner_size, style.event_notes_font, False)
+        return EventDrawHelper.__build_text_metadata(notes, notes_inner_size, style.event_notes_font, False, deadline)
 
     @staticmethod
     def calculate_text_y_position_offset(vertical_align: VerticalAlign, box_height: int, text_height: int,
@@ -327,8 +588,8 @@ class EventDrawHelper:
         raise RuntimeError(f'Wrong vertical align value: {vertical_align}')
 
     @staticmethod
-    def __build_text_metadata(text: Optional[str], box_size: Tuple[int, int], font: FreeTypeFont, strip_lines: bool) \
-            -> MultilineTextMetadata:
+    def __build_text_metadata(text: Optional[str], box_size: Tuple[int, int], font: FreeTypeFont, strip_lines: bool,
+                              deadline: Deadline = NO_DEADLINE) -> MultilineTextMetadata:
         """
         Try to fit text in the given box. Split the text into the multiple lines if required.
         """
@@ -350,6 +611,7 @@ class EventDrawHelper:
         new_text: str = ''
         new_text_size: Tuple[int, int] = (0, 0)
         for retry_count in range(0, 12, 2):
+            deadline.check('build_text_metadata')
             new_test_width: int = base_new_text_width - retry_count
             if new_test_width <= 0:
                 return MultilineTextMetadata(text, text_size)  # no place to fit the text
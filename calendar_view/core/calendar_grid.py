@@ -1,18 +1,104 @@
 from datetime import date, timedelta
-from typing import Tuple
+from typing import Tuple, List, Optional, Set, TYPE_CHECKING
 
-from PIL import Image, ImageDraw
+from PIL import Image
 
 from calendar_view.config import i18n, style
 from calendar_view.core.config import CalendarConfig
+from calendar_view.core.image_pool import ImagePool
+from calendar_view.core.layout import GridLayout, LineShape, TextBlock
+from calendar_view.core.renderers import PillowRenderer
 from calendar_view.core.utils import FontUtils
 
+if TYPE_CHECKING:
+    from calendar_view.core.calendar_events import CalendarEvents
 
-class CalendarGrid(object):
+
+class GridGeometry(object):
+    """
+    The hour range and the day columns of the grid. By default, they are defined by the config.
+    With 'config.fit_hours' or 'config.collapse_empty_days', 'fit' adjusts them to the events before the layout.
+    """
     def __init__(self, config: CalendarConfig):
         self.config = config
+        self.hours_range: Optional[Tuple[int, int]] = None
+        self.day_widths: Optional[List[int]] = None
+        self._day_offsets: Optional[List[int]] = None
+        self.min_day_width: int = 0  # the day column can be wider than 'style.day_width', e.g. for the resources
+
+    def is_fit_enabled(self) -> bool:
+        return self.config.fit_hours or self.config.collapse_empty_days
+
+    def is_fitted(self) -> bool:
+        return self.hours_range is not None or self.day_widths is not None
+
+    def get_day_width(self) -> int:
+        return max(style.day_width, self.min_day_width)
+
+    def fit(self, events: 'CalendarEvents') -> None:
+        """
+        Shrinks the hour range to the span of the events and collapses the days without events.
+        """
+        self.hours_range, self.day_widths, self._day_offsets = None, None, None
+        if not self.is_fit_enabled() or len(events.events) == 0:
+            return
+        if self.config.fit_hours:
+            minutes: List[Tuple[int, int]] = [events.get_minute_range(e) for e in events.events]
+            hour_from, hour_to = self.config.get_hours_range()
+            start: int = max(hour_from, min(m[0] for m in minutes) // 60)
+            end: int = min(hour_to, -(-max(m[1] for m in minutes) // 60))
+            if start < end:
+                self.hours_range = (start, end)
+        if self.config.collapse_empty_days:
+            date_from, date_to = self.config.get_date_range()
+            days: Set[int] = {(e.get_start_date(self.config) - date_from).days for e in events.events}
+            self.day_widths = [self.get_day_width() if i in days else style.collapsed_day_width
+                               for i in range((date_to - date_from).days + 1)]
+            self._day_offsets = [0]
+            for width in self.day_widths:
+                self._day_offsets.append(self._day_offsets[-1] + width)
+
+    def get_hours_range(self) -> Tuple[int, int]:
+        return self.hours_range or self.config.get_hours_range()
+
+    def get_day_x(self, day_number: int) -> Tuple[int, int]:
+        """
+        The horizontal borders of the day column on the grid.
+        """
+        if self._day_offsets is None:
+            x_start = style.padding_horizontal + day_number * self.get_day_width()
+            return x_start, x_start + self.get_day_width()
+        x_start = style.padding_horizontal + self._day_offsets[day_number]
+        return x_start, x_start + (self.day_widths[day_number] if day_number < len(self.day_widths)
+                                   else self.get_day_width())
+
+    def is_collapsed(self, day_number: int) -> bool:
+        return self.day_widths is not None and self.day_widths[day_number] != self.get_day_width()
+
+    def get_table_width(self, day_count: int) -> int:
+        return self.get_day_x(day_count)[0] - style.padding_horizontal
+
+    def get_grid_size(self) -> Tuple[int, int]:
+        """
+        The size of the grid image for the current hour range and day columns.
+        """
+        date_from, date_to = self.config.get_date_range()
+        day_count = (date_to - date_from).days + 1
+        hour_from, hour_to = self.get_hours_range()
+        day_height = (hour_to - hour_from) * style.hour_height
+        table_width = self.get_table_width(day_count)
+        return table_width + 2 * style.padding_horizontal, style.hour_height + day_height + 2 * style.padding_vertical
+
+
+class CalendarGrid(object):
+    def __init__(self, config: CalendarConfig, pool: Optional[ImagePool] = None):
+        """
+        :param pool: the grid image is taken from the pool and returned to it by 'destroy'
+        """
+        self.config = config
+        self.geometry: GridGeometry = GridGeometry(config)
+        self.pool: Optional[ImagePool] = pool
         self._grid_image: Image = None
-        self._grid_draw: ImageDraw = None
 
     def get_image(self) -> Image:
         return self._grid_image
@@ -21,27 +107,42 @@ class CalendarGrid(object):
         return self._grid_image.size
 
     def draw_grid(self):
+        self._grid_image = PillowRenderer(pool=self.pool).render_grid(self.layout_grid())
+
+    def get_layout_size(self) -> Tuple[int, int]:
+        """
+        The size of the grid image for the current geometry.
+        """
+        return self.geometry.get_grid_size()
+
+    def layout_grid(self, labels: bool = True) -> GridLayout:
+        """
+        :param labels: if False, the hour numbers and the day titles are not measured and not added
+        """
         date_from, date_to = self.config.get_date_range()
         day_count = (date_to - date_from).days + 1
-        hour_from, hour_to = self.config.get_hours_range()
+        hour_from, hour_to = self.geometry.get_hours_range()
         hour_count = hour_to - hour_from
         day_height = hour_count * style.hour_height
-        size = (day_count * style.day_width + 2 * style.padding_horizontal, style.hour_height + day_height + 2 * style.padding_vertical)
-        self._grid_image = Image.new("RGBA", size, (0, 0, 0, 0))
-        self._grid_draw = ImageDraw.Draw(self._grid_image)
+        table_width = self.geometry.get_table_width(day_count)
+        size = self.get_layout_size()
+        lines: List[LineShape] = []
+        texts: List[TextBlock] = []
 
         # draw hours
-        table_width = day_count * style.day_width
         x = (style.padding_horizontal, style.padding_horizontal + table_width)
         for i in range(1, hour_count + 2):
             y = style.padding_vertical + i * style.hour_height
-            self._grid_draw.line([(x[0], y), (x[1], y)], fill=style.line_hour_color, width=style.line_hour_width)
+            lines.append(LineShape((x[0], y), (x[1], y), style.line_hour_color, style.line_hour_width))
 
         # draw days
         for i in range(day_count + 1):
-            x = self.__get_event_x(i)
+            x = self.geometry.get_day_x(i)
             y = style.padding_vertical + style.hour_height
-            self._grid_draw.line([(x[0], y), (x[0], y + day_height)], fill=style.line_day_color, width=style.line_day_width)
+            lines.append(LineShape((x[0], y), (x[0], y + day_height), style.line_day_color, style.line_day_width))
+
+        if not labels:
+            return GridLayout(size, lines, texts)
 
         # write hour numbers
         for i in range(hour_count + 1):
@@ -49,21 +150,27 @@ class CalendarGrid(object):
             text_size: Tuple[int, int] = FontUtils.get_text_size(style.hour_number_font, text)
             x = style.padding_horizontal - text_size[0] - 10
             y = style.padding_vertical + style.hour_height + i * style.hour_height - text_size[1] / 2
-
-            self._grid_draw.text((x, y), text, font=style.hour_number_font, fill=style.hour_number_color)
+            texts.append(TextBlock(text, (x, y), text_size, 'hour_number_font', style.hour_number_color))
 
         # write day of week
         for i in range(day_count):
             day = date_from + timedelta(days=i)
-            text = self._get_day_title(day)
+            if self.geometry.is_collapsed(i):
+                text = i18n.day_of_week(day.weekday(), self.config.lang)
+            else:
+                text = self._get_day_title(day)
             text_size: Tuple[int, int] = FontUtils.get_text_size(style.day_of_week_font, text)
-            x = style.padding_horizontal + i * style.day_width + style.day_width / 2 - text_size[0] / 2
+            x_day: Tuple[int, int] = self.geometry.get_day_x(i)
+            x = x_day[0] + (x_day[1] - x_day[0]) / 2 - text_size[0] / 2
             y = style.padding_vertical + text_size[1] / 2
-            self._grid_draw.text((x, y), text, font=style.day_of_week_font, fill=style.day_of_week_color)
+            texts.append(TextBlock(text, (x, y), text_size, 'day_of_week_font', style.day_of_week_color))
+
+        return GridLayout(size, lines, texts)
 
     def destroy(self):
+        if self.pool is not None:
+            self.pool.release(self._grid_image)
         del self._grid_image
-        del self._grid_draw
 
     def _get_day_title(self, day: date) -> str:
         weekday = i18n.day_of_week(day.weekday(), self.config.lang)
@@ -72,8 +179,3 @@ class CalendarGrid(object):
         else:
             date_value = day.strftime('%d.%m') + (day.strftime('.%Y') if self.config.show_year else '')
             return '{}, {}'.format(weekday, date_value)
-
-    @staticmethod
-    def __get_event_x(day_number: int):
-        x_start = style.padding_horizontal + day_number * style.day_width
-        return x_start, x_start + style.day_width
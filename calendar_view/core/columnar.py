@@ -0,0 +1,241 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from calendar_view.core.calendar_events import CalendarEvents
+from calendar_view.core.event import EventSegment, EventStyle, EventStyles
+
+try:
+    import numpy
+except ImportError:  # the columns are processed row by row
+    numpy = None
+
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = EventSegment.MINUTES_PER_DAY
+EPOCH = datetime(1970, 1, 1)
+
+
+class EventRow(object):
+    """
+    The parent of the segments added from the columns. It keeps the row number in the input table instead of
+    the parsed event, so the queries like 'IntervalIndex.conflicts' can be mapped back to the table rows.
+    """
+    __slots__ = ('row', 'title', 'notes', 'style')
+
+    def __init__(self, row: int, title: Optional[str], notes: Optional[str], style: EventStyle):
+        self.row: int = row
+        self.title: Optional[str] = title
+        self.notes: Optional[str] = notes
+        self.style: EventStyle = style
+
+    def __repr__(self) -> str:
+        return f'EventRow[row: {self.row}, title: {self.title}]'
+
+
+class DaySpans(object):
+    """
+    The one-day parts of the visible rows: the row number, the day index in the date range
+    and the minute range of the day. The columns are numpy arrays if numpy is installed, otherwise the lists.
+    """
+    def __init__(self, rows: Sequence[int], days: Sequence[int], starts: Sequence[int], ends: Sequence[int],
+                 skipped: int):
+        self.rows: Sequence[int] = rows
+        self.days: Sequence[int] = days
+        self.starts: Sequence[int] = starts
+        self.ends: Sequence[int] = ends
+        self.skipped: int = skipped  # the rows without the start or the end and the rows of zero duration
+
+
+def add_columns(events: CalendarEvents, start: Sequence, end: Sequence, title: Optional[Sequence] = None,
+                notes: Optional[Sequence] = None, style: Optional[Sequence] = None) -> List[EventRow]:
+    """
+    Adds the events given as the columns. The range clipping, the splitting into days and the validation are done
+    for the whole columns with numpy if it is installed, the segments are added to the events without parsing.
+    The rows are checked the same way with and without numpy. ValueError is raised if the end of a row is before
+    its start, as 'Event' does. The rows without the start or the end (None, NaN, NaT) and the rows of zero
+    duration are skipped with a warning, as 'CalendarEvents.add_event' does.
+    :param start: the start timestamps: numpy datetime64 array, pandas or Arrow column or the list of datetimes
+        or ISO 8601 strings, e.g. '2024-01-02T09:30'
+    :param end: the end timestamps
+    :param title: the titles, the missing values are None or NaN
+    :param notes: the notes
+    :param style: EventStyle objects or the names of EventStyles, e.g. 'green'
+    :return: the rows in the order of the input, None for the rows without the visible part
+    """
+    date_from, date_to = events.config.get_date_range()
+    spans: DaySpans = _split_numpy(start, end, date_from, date_to) if numpy is not None \
+        else _split_python(start, end, date_from, date_to)
+    if spans.skipped:
+        logger.warning(f'Skipping {spans.skipped} events without the time or with the duration less than a minute')
+    _validate_hours(events, spans)
+
+    titles: List[Any] = _to_list(title)
+    notes_values: List[Any] = _to_list(notes)
+    styles: List[Any] = _to_list(style)
+    parents: Dict[int, EventRow] = {}
+    style_cache: Dict[Any, EventStyle] = {}
+    segments: List[EventSegment] = []
+    for row, day, start_minute, end_minute in zip(_to_list(spans.rows), _to_list(spans.days), _to_list(spans.starts),
+                                                  _to_list(spans.ends)):
+        parent: Optional[EventRow] = parents.get(row)
+        if parent is None:
+            parent = EventRow(row, _value(titles, row), _value(notes_values, row),
+                              _style(_value(styles, row), style_cache))
+            parents[row] = parent
+        segments.append(EventSegment(parent, day, start_minute, end_minute))
+    events.add_segments(segments)
+    return [parents.get(row) for row in range(len(start))]
+
+
+def add_frame(events: CalendarEvents, frame, start: str = 'start', end: str = 'end', title: str = 'title',
+              notes: str = 'notes', style: str = 'style') -> List[EventRow]:
+    """
+    Adds the events from the table: pandas DataFrame, Arrow Table or the dict of columns.
+    The optional columns can be missing. See 'add_columns'.
+    :param start: the name of the start column, and so on
+    """
+    return add_columns(events, _column(frame, start, True), _column(frame, end, True), _column(frame, title),
+                       _column(frame, notes), _column(frame, style))
+
+
+def _split_numpy(start: Sequence, end: Sequence, date_from: date, date_to: date) -> DaySpans:
+    start_minutes, start_missing = _minutes_numpy(start)
+    end_minutes, end_missing = _minutes_numpy(end)
+    first_visible: int = (date_from - EPOCH.date()).days
+    last_visible: int = (date_to - EPOCH.date()).days
+
+    present = ~start_missing & ~end_missing
+    _check_order(numpy.nonzero(present & (end_minutes < start_minutes))[0].tolist())
+    valid = (end_minutes > start_minutes) & present
+    start_day = start_minutes // MINUTES_PER_DAY
+    end_day = (end_minutes - 1) // MINUTES_PER_DAY  # the event ending at midnight ends on the day before
+    rows = numpy.nonzero(valid & (end_day >= first_visible) & (start_day <= last_visible))[0]
+    first_day = numpy.maximum(start_day[rows], first_visible)
+    last_day = numpy.minimum(end_day[rows], last_visible)
+
+    # one segment for every visible day of the row
+    counts = last_day - first_day + 1
+    segment_rows = numpy.repeat(rows, counts)
+    offsets = numpy.arange(int(counts.sum())) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+    segment_days = numpy.repeat(first_day, counts) + offsets
+    starts = numpy.where(segment_days == start_day[segment_rows], start_minutes[segment_rows] % MINUTES_PER_DAY, 0)
+    ends = numpy.where(segment_days == end_day[segment_rows],
+                       (end_minutes[segment_rows] - 1) % MINUTES_PER_DAY + 1, MINUTES_PER_DAY)
+    return DaySpans(segment_rows, segment_days - first_visible, starts, ends, int(len(valid) - valid.sum()))
+
+
+def _minutes_numpy(values: Sequence) -> Tuple[Any, Any]:
+    """
+    The minutes since the epoch as the int64 array and the mask of the missing values.
+    """
+    if hasattr(values, 'to_numpy'):  # pandas and Arrow columns
+        values = values.to_numpy()
+    array = numpy.asarray(values)
+    if array.dtype.kind != 'M':
+        array = array.astype('datetime64[s]')
+    array = array.astype('datetime64[m]')
+    return array.astype(numpy.int64), numpy.isnat(array)
+
+
+def _split_python(start: Sequence, end: Sequence, date_from: date, date_to: date) -> DaySpans:
+    first_visible: int = (date_from - EPOCH.date()).days
+    last_visible: int = (date_to - EPOCH.date()).days
+    rows, days, starts, ends = [], [], [], []
+    skipped: int = 0
+    minutes: List[Tuple[Optional[int], Optional[int]]] = [(_minutes_python(start_value), _minutes_python(end_value))
+                                                          for start_value, end_value in zip(_to_list(start), _to_list(end))]
+    _check_order([row for row, (start_minute, end_minute) in enumerate(minutes)
+                  if start_minute is not None and end_minute is not None and end_minute < start_minute])
+    for row, (start_minute, end_minute) in enumerate(minutes):
+        if start_minute is None or end_minute is None or end_minute <= start_minute:
+            skipped += 1
+            continue
+        start_day: int = start_minute // MINUTES_PER_DAY
+        end_day: int = (end_minute - 1) // MINUTES_PER_DAY
+        for day in range(max(start_day, first_visible), min(end_day, last_visible) + 1):
+            rows.append(row)
+            days.append(day - first_visible)
+            starts.append(start_minute % MINUTES_PER_DAY if day == start_day else 0)
+            ends.append((end_minute - 1) % MINUTES_PER_DAY + 1 if day == end_day else MINUTES_PER_DAY)
+    return DaySpans(rows, days, starts, ends, skipped)
+
+
+def _minutes_python(value: Any) -> Optional[int]:
+    """
+    The minutes since the epoch of the datetime, date or ISO 8601 string, None for None, NaN and NaT.
+    """
+    if value is None or value != value:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    elif not isinstance(value, datetime):
+        raise ValueError(f'Wrong timestamp: {value!r}')
+    return (value - EPOCH) // timedelta(minutes=1)
+
+
+def _check_order(rows: List[int]) -> None:
+    if rows:
+        raise ValueError(f"The end is before the start in {len(rows)} row(s), the first ones: {rows[:5]}")
+
+
+def _validate_hours(events: CalendarEvents, spans: DaySpans) -> None:
+    """
+    The same checks as 'data.validate_event', reported once for all rows.
+    """
+    hour_from, hour_to = events.config.get_hours_range()
+    if numpy is not None:
+        early: int = int(numpy.count_nonzero(spans.starts < hour_from * 60))
+        late: int = int(numpy.count_nonzero(spans.ends > hour_to * 60)) if hour_to < 24 else 0
+    else:
+        early = sum(1 for s in spans.starts if s < hour_from * 60)
+        late = sum(1 for e in spans.ends if e > hour_to * 60) if hour_to < 24 else 0
+    if early or late:
+        logger.warning(f"{early + late} event parts can't be shown completely, they are out of the hours range: "
+                       f"{early} start before {hour_from}:00, {late} end after {hour_to}:00")
+
+
+def _column(frame, name: str, required: bool = False) -> Optional[Sequence]:
+    if hasattr(frame, 'column_names'):  # Arrow Table
+        found: bool = name in frame.column_names
+    else:
+        found = name in frame
+    if found:
+        return frame.column(name) if hasattr(frame, 'column_names') else frame[name]
+    if required:
+        raise ValueError(f"The required column is missing: '{name}'")
+    return None
+
+
+def _to_list(values: Optional[Sequence]) -> Optional[List[Any]]:
+    if values is None:
+        return None
+    if hasattr(values, 'to_pylist'):  # Arrow
+        return values.to_pylist()
+    if hasattr(values, 'tolist'):  # numpy and pandas
+        return values.tolist()
+    return list(values)
+
+
+def _value(values: Optional[List[Any]], row: int) -> Any:
+    if values is None:
+        return None
+    value = values[row]
+    if value != value:  # NaN of the missing value in pandas
+        return None
+    return value
+
+
+def _style(value: Any, cache: Dict[Any, EventStyle]) -> EventStyle:
+    if isinstance(value, EventStyle):
+        return value
+    style: Optional[EventStyle] = cache.get(value)
+    if style is None:
+        style = EventStyle() if value is None else getattr(EventStyles, str(value).upper(), None)
+        if not isinstance(style, EventStyle):
+            raise ValueError(f'Unknown event style: {value}')
+        cache[value] = style
+    return style
@@ -1,6 +1,6 @@
 import logging
 from datetime import date, timedelta
-from typing import Tuple, List, Literal
+from typing import Tuple, List, Literal, Optional
 
 from calendar_view.core import time_utils
 from calendar_view.core.utils import StringUtils
@@ -31,7 +31,11 @@ class CalendarConfig(object):
                  show_date: bool = True,
                  show_year: bool = False,
                  legend: bool = None,
-                 title_vertical_align: VerticalAlign = 'center'):
+                 title_vertical_align: VerticalAlign = 'center',
+                 deduplicate: bool = False,
+                 merge_adjacent: bool = False,
+                 fit_hours: bool = False,
+                 collapse_empty_days: bool = False):
         self.lang = lang
         self.title = title
         self.dates = dates
@@ -43,6 +47,11 @@ class CalendarConfig(object):
         self.show_year = show_year
         self.legend = legend
         self.title_vertical_align = title_vertical_align
+        self.deduplicate = deduplicate
+        self.merge_adjacent = merge_adjacent
+        self.fit_hours = fit_hours
+        self.collapse_empty_days = collapse_empty_days
+        self._parsed_dates: Optional[Tuple[Tuple[str, str], Tuple[date, date]]] = None  # see 'get_date_range'
         self._configure_mode()
 
     def _configure_mode(self):
@@ -79,7 +88,11 @@ class CalendarConfig(object):
         Returns tuple of start and end day for visualisation. For example, 'date(2019, 05, 17), date(2019, 05, 20)'
         """
         if StringUtils.is_not_blank(self.dates):
-            return time_utils.parse_date_interval(self.dates, lang=self.lang)
+            # the range is needed for every event, it is parsed again only after 'dates' or 'lang' is changed
+            key: Tuple[str, str] = (self.dates, self.lang)
+            if self._parsed_dates is None or self._parsed_dates[0] != key:
+                self._parsed_dates = key, time_utils.parse_date_interval(self.dates, lang=self.lang)
+            return self._parsed_dates[1]
         if self.days:
             return date.today(), date.today() + timedelta(days=self.days - 1)
 
@@ -1,5 +1,6 @@
 import logging
 from datetime import time
+from typing import Optional
 
 from calendar_view.core.config import CalendarConfig
 from calendar_view.core.event import Event
@@ -20,22 +21,28 @@ def validate_config(config: CalendarConfig):
 
 def validate_event(event: Event, config: CalendarConfig):
     start_date, end_date = config.get_date_range()
-    start_time = time(hour=config.get_hours_range()[0])
-    end_hour = config.get_hours_range()[1]
     if not (start_date <= event.get_start_date(config) <= end_date):
         logger.warning("Event can't be shown, because it is not in configured date range: {} not in [{}, {}]".format(
             event.get_start_date(config).strftime('%Y-%m-%d'),
             start_date.strftime('%Y-%m-%d'),
             end_date.strftime('%Y-%m-%d')
         ))
-    if event.start_time < start_time:
+    validate_time_range(event.start_time, event.end_time, config)
+
+
+def validate_time_range(start: Optional[time], end: Optional[time], config: CalendarConfig):
+    """
+    Warns if the start or the end is out of the configured hours. None is not checked.
+    """
+    start_hour, end_hour = config.get_hours_range()
+    if start is not None and start < time(hour=start_hour):
         logger.warning("Event can't be shown, because its start is before time range: {} is before {}".format(
-            event.start_time.strftime('%H:%M'),
-            start_time.strftime('%H:%M')
+            start.strftime('%H:%M'),
+            time(hour=start_hour).strftime('%H:%M')
         ))
-    if end_hour < 24 and time(hour=end_hour) < event.end_time:
+    if end is not None and end_hour < 24 and time(hour=end_hour) < end:
         logger.warning("Event can't be shown, because its end is after time range: {} is before {}".format(
-            event.end_time.strftime('%H:%M'),
+            end.strftime('%H:%M'),
             time(hour=end_hour).strftime('%H:%M')
         ))
 
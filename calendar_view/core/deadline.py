@@ -0,0 +1,78 @@
+import threading
+import time
+from typing import Optional
+
+
+class RenderInterruptedError(RuntimeError):
+    """
+    The render is stopped before it is finished.
+    """
+
+
+class RenderTimeoutError(RenderInterruptedError):
+    """
+    The render took longer than its deadline.
+    """
+
+
+class RenderCancelledError(RenderInterruptedError):
+    """
+    The render is cancelled by its cancellation token.
+    """
+
+
+class CancellationToken(object):
+    """
+    Cancels the render from another thread. The render stops at the next check.
+    """
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def __repr__(self) -> str:
+        return f'CancellationToken[cancelled: {self.cancelled}]'
+
+
+class Deadline(object):
+    """
+    The time limit and the cancellation token of one render. 'check' is called at the stage boundaries
+    and inside the loops over the events.
+    """
+    def __init__(self, timeout: Optional[float] = None, token: Optional[CancellationToken] = None):
+        """
+        :param timeout: the time limit in seconds, not limited if not defined
+        :param token: the token to cancel the render
+        """
+        self.timeout: Optional[float] = timeout
+        self.token: Optional[CancellationToken] = token
+        self._expires_at: Optional[float] = time.monotonic() + timeout if timeout is not None else None
+
+    def remaining(self) -> Optional[float]:
+        """
+        The remaining time in seconds or None if there is no time limit.
+        """
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def check(self, stage: str = '') -> None:
+        """
+        Raises RenderCancelledError or RenderTimeoutError if the render has to stop.
+        :param stage: the name of the current stage for the error message
+        """
+        if self.token is not None and self.token.cancelled:
+            raise RenderCancelledError(f'The render is cancelled at the stage: {stage}')
+        if self._expires_at is not None and time.monotonic() > self._expires_at:
+            raise RenderTimeoutError(f'The render exceeded the time limit of {self.timeout} s at the stage: {stage}')
+
+    def __repr__(self) -> str:
+        return f'Deadline[timeout: {self.timeout}, remaining: {self.remaining()}, token: {self.token}]'
+
+
+NO_DEADLINE = Deadline()
@@ -0,0 +1,171 @@
+import math
+from typing import List, Optional, Tuple
+
+from calendar_view.config import style
+from calendar_view.core.calendar_events import CalendarEvents
+from calendar_view.core.calendar_grid import CalendarGrid
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.utils import StringUtils, FontUtils
+
+
+BYTES_PER_PIXEL = 4  # RGBA
+GRID_LAYERS = 3  # the grid (or the grid drawn before), the event layer and their composition
+FULL_LAYERS = 3  # the title and legend layer, the background and the final composition
+PREVIEW_LAYERS = 6  # the preview draws all layers at the target size
+PIXEL_WORK = 4e-6  # one pass over a megapixel costs about as much as 4 text measurements
+CROWDED_RETRIES = 3  # the text of the narrow cascaded box is usually wrapped a few times
+
+
+class RenderEstimate(object):
+    """
+    The predicted cost of the render computed from the config and the events without drawing anything.
+    'work' is measured in the text measurements: one unit is about one fitted line of the event title.
+    """
+    def __init__(self, size: Tuple[int, int], grid_size: Tuple[int, int], legend_sizes: List[Tuple[int, int]],
+                 events: int, overlapping: int, max_cascade: int, text_fits: int):
+        self.size: Tuple[int, int] = size
+        self.grid_size: Tuple[int, int] = grid_size
+        self.legend_sizes: List[Tuple[int, int]] = legend_sizes
+        self.events: int = events
+        self.overlapping: int = overlapping
+        self.max_cascade: int = max_cascade
+        self.text_fits: int = text_fits
+
+    @property
+    def pixels(self) -> int:
+        return int(self.size[0] * self.size[1])
+
+    @property
+    def peak_memory(self) -> int:
+        """
+        The bytes of the image layers alive at the same time while rendering.
+        """
+        grid_pixels: float = self.grid_size[0] * self.grid_size[1]
+        legend_pixels: float = sum(w * h for w, h in self.legend_sizes)
+        return int(BYTES_PER_PIXEL * (GRID_LAYERS * grid_pixels + FULL_LAYERS * self.pixels + legend_pixels))
+
+    @property
+    def work(self) -> int:
+        return self.text_fits + int(self.peak_memory / BYTES_PER_PIXEL * PIXEL_WORK)
+
+    def __repr__(self) -> str:
+        return f'RenderEstimate[size: {self.size}, peak_memory: {self.peak_memory}, work: {self.work}, ' \
+               f'events: {self.events}, overlapping: {self.overlapping}, legend_pages: {len(self.legend_sizes)}]'
+
+
+def estimate_render(config: CalendarConfig, grid: CalendarGrid, events: CalendarEvents) -> RenderEstimate:
+    """
+    Mirrors 'Calendar.compute_layout' with the cheap approximations: the legend lines and the event texts
+    are not measured one by one. The grid geometry has to be fitted to the events before.
+    """
+    grid_size: Tuple[int, int] = grid.get_layout_size()
+    legend_sizes: List[Tuple[int, int]] = events.estimate_legend_sizes()
+    cascade_sizes: List[int] = events.get_cascade_sizes()
+    overlapping: int = sum(size for size in cascade_sizes if size > 1)
+
+    if events.is_legend_visible():
+        text_fits: int = len(events.events)  # the legend lines
+    else:
+        texts: int = sum((e.title is not None) + (e.notes is not None) for e in events.events)
+        text_fits = texts + CROWDED_RETRIES * overlapping
+
+    width, height = grid_size
+    if not StringUtils.is_blank(config.title) or legend_sizes:
+        title_size: Tuple[int, int] = FontUtils.get_multiline_text_size(style.title_font, config.title)
+        legend_width, legend_height = legend_sizes[0] if legend_sizes else (0, 0)
+        width = max(width, title_size[0] + style.title_padding_left + style.title_padding_right, legend_width)
+        height += title_size[1] + style.title_padding_top + style.title_padding_bottom + legend_height
+    return RenderEstimate((int(width), int(height)), grid_size, legend_sizes, len(events.events), overlapping,
+                          max(cascade_sizes, default=0), text_fits)
+
+
+class JobTooLargeError(Exception):
+    """
+    The estimated render is over the budget of the admission policy.
+    """
+    def __init__(self, estimate: RenderEstimate, reasons: List[str]):
+        super().__init__('The render is over the budget: {}'.format(', '.join(reasons)))
+        self.estimate: RenderEstimate = estimate
+        self.reasons: List[str] = reasons
+
+    def __reduce__(self):
+        # the error is raised in the worker processes and pickled back to the parent
+        return JobTooLargeError, (self.estimate, self.reasons)
+
+
+class AdmissionDecision(object):
+    def __init__(self, action: str, estimate: RenderEstimate, reasons: List[str],
+                 preview_size: Optional[Tuple[int, Optional[int]]] = None):
+        """
+        :param action: 'render' or the action of the policy
+        :param reasons: the exceeded limits
+        :param preview_size: the width and the height of the preview for 'downscale' and 'preview'
+        """
+        self.action: str = action
+        self.estimate: RenderEstimate = estimate
+        self.reasons: List[str] = reasons
+        self.preview_size: Optional[Tuple[int, Optional[int]]] = preview_size
+
+    def __repr__(self) -> str:
+        return f'AdmissionDecision[action: {self.action}, reasons: {self.reasons}, preview_size: {self.preview_size}]'
+
+
+class AdmissionPolicy(object):
+    """
+    The budget of one render. The jobs over the budget are rejected or rendered as the preview without the texts:
+    'downscale' keeps the largest size within the budget, 'preview' uses 'preview_width'.
+    """
+    RENDER = 'render'
+    REJECT = 'reject'
+    DOWNSCALE = 'downscale'
+    PREVIEW = 'preview'
+    ACTIONS = (REJECT, DOWNSCALE, PREVIEW)
+
+    def __init__(self, max_pixels: Optional[int] = None, max_memory: Optional[int] = None,
+                 max_work: Optional[int] = None, action: str = REJECT, preview_width: int = 800):
+        """
+        :param max_pixels: the maximal size of the image in pixels
+        :param max_memory: the maximal peak memory of the image layers in bytes
+        :param max_work: the maximal work, see 'RenderEstimate.work'
+        :param action: what to do with the job over the budget: 'reject', 'downscale' or 'preview'
+        """
+        if action not in AdmissionPolicy.ACTIONS:
+            raise ValueError(f"Wrong admission action: {action}. Use: {', '.join(AdmissionPolicy.ACTIONS)}")
+        self.max_pixels: Optional[int] = max_pixels
+        self.max_memory: Optional[int] = max_memory
+        self.max_work: Optional[int] = max_work
+        self.action: str = action
+        self.preview_width: int = preview_width
+
+    def get_exceeded_limits(self, estimate: RenderEstimate) -> List[str]:
+        reasons: List[str] = []
+        if self.max_pixels is not None and estimate.pixels > self.max_pixels:
+            reasons.append(f'{estimate.pixels} pixels > {self.max_pixels}')
+        if self.max_memory is not None and estimate.peak_memory > self.max_memory:
+            reasons.append(f'{estimate.peak_memory} bytes > {self.max_memory}')
+        if self.max_work is not None and estimate.work > self.max_work:
+            reasons.append(f'{estimate.work} work units > {self.max_work}')
+        return reasons
+
+    def decide(self, estimate: RenderEstimate) -> AdmissionDecision:
+        reasons: List[str] = self.get_exceeded_limits(estimate)
+        if not reasons:
+            return AdmissionDecision(AdmissionPolicy.RENDER, estimate, reasons)
+        if self.action == AdmissionPolicy.REJECT:
+            return AdmissionDecision(self.action, estimate, reasons)
+        if self.action == AdmissionPolicy.PREVIEW:
+            return AdmissionDecision(self.action, estimate, reasons, (self.preview_width, None))
+        return AdmissionDecision(self.action, estimate, reasons, self.__downscaled_size(estimate))
+
+    def __downscaled_size(self, estimate: RenderEstimate) -> Tuple[int, int]:
+        allowed_pixels: float = estimate.pixels
+        if self.max_pixels is not None:
+            allowed_pixels = min(allowed_pixels, self.max_pixels)
+        if self.max_memory is not None:
+            allowed_pixels = min(allowed_pixels, self.max_memory / (BYTES_PER_PIXEL * PREVIEW_LAYERS))
+        factor: float = min(1.0, math.sqrt(allowed_pixels / max(1, estimate.pixels)))
+        return max(1, int(estimate.size[0] * factor)), max(1, int(estimate.size[1] * factor))
+
+    def __repr__(self) -> str:
+        return f'AdmissionPolicy[action: {self.action}, max_pixels: {self.max_pixels}, ' \
+               f'max_memory: {self.max_memory}, max_work: {self.max_work}]'
@@ -2,6 +2,7 @@ from typing import Union
 
 from calendar_view.config import style
 from calendar_view.core.config import CalendarConfig
+from calendar_view.core.recurrence import RecurrenceRule
 from calendar_view.core.time_utils import *
 
 
@@ -41,7 +42,12 @@ class EventStyles(object):
 class Event(object):
     def __init__(self, title: str = None, notes: str = None, day_of_week: int = None,
                  day: Union[date, datetime, str] = None, start: Union[datetime, time, str] = None,
-                 end: Union[datetime, time, str] = None, style: EventStyle = None) -> None:
+                 end: Union[datetime, time, str] = None, style: EventStyle = None,
+                 recurrence: RecurrenceRule = None) -> None:
+        """
+        :param recurrence: the rule of the recurring event. The event defines the first occurrence of the series,
+            so it has to be defined with the date.
+        """
         if day_of_week and not (0 <= day_of_week <= 6):
             raise ValueError("'day_of_week' has to be in the interval [0, 6]. Current value is: {}".format(day_of_week))
         if not start:
@@ -52,6 +58,7 @@ class Event(object):
         self.title: Optional[str] = title
         self.notes: Optional[str] = notes
         self.style: EventStyle = style if style else EventStyle()
+        self.recurrence: Optional[RecurrenceRule] = recurrence
 
         # parse date of the event
         self.__start_date: date = self.__parse_start_date(day_of_week, day, start)
@@ -127,6 +134,8 @@ class Event(object):
             raise ValueError("Event's start date has to be before end date")
         if self.__start_time == self.__end_time and self.__end_time < self.__start_time:
             raise ValueError("Event's start time has to be before end time")
+        if self.recurrence is not None and self.__start_date is None:
+            raise ValueError("The recurring event has to be defined with the date of the first occurrence.")
 
     def get_start_date(self, config: CalendarConfig) -> date:
         if self.__start_date:
@@ -175,7 +184,7 @@ class Event(object):
     def __repr__(self) -> str:
         return f'Event[title: {self.title}, notes: {self.notes}, style: {self.style}, ' \
                f'day_of_week: {self.__day_of_week}, start_date: {self.__start_date}, end_date: {self.__end_date}, ' \
-               f'start_time: {self.start_time}, end_time: {self.end_time},' \
+               f'start_time: {self.start_time}, end_time: {self.end_time}, recurrence: {self.recurrence}, ' \
                f'cascade_group: {self.cascade_group}, cascade_total: {self.cascade_total}, ' \
                f'cascade_index: {self.cascade_index}]'
 
@@ -189,6 +198,90 @@ class Event(object):
                and self.__end_date == other.__end_date \
                and self.start_time == other.start_time \
                and self.end_time == other.end_time \
+               and self.recurrence == other.recurrence \
+               and self.cascade_group == other.cascade_group \
+               and self.cascade_total == other.cascade_total \
+               and self.cascade_index == other.cascade_index
+
+
+class EventSegment(object):
+    """
+    The part of the multi-day event on one visible day. It references the parent event and keeps only the day index
+    in the configured date range and the minute range, so the split doesn't parse and validate the event again.
+    The segment is drawn and laid out the same way as the one-day event.
+    """
+    __slots__ = ('event', 'day_index', 'day', 'start_minute', 'end_minute', 'cascade_total', 'cascade_index',
+                 'cascade_group')
+
+    MINUTES_PER_DAY = 24 * 60
+
+    def __init__(self, event: Event, day_index: int, start_minute: int, end_minute: int,
+                 day: Optional[date] = None) -> None:
+        """
+        :param event: the parent event
+        :param day_index: the index of the day in the configured date range
+        :param start_minute: the minute of the day when the segment starts
+        :param end_minute: the minute of the day when the segment ends, 1440 for the end of the day
+        :param day: the date of the day if it is known, it is computed from the date range by default
+        """
+        self.event: Event = event
+        self.day_index: int = day_index
+        self.day: Optional[date] = day
+        self.start_minute: int = start_minute
+        self.end_minute: int = end_minute
+        self.cascade_total: int = 1
+        self.cascade_index: int = 1
+        self.cascade_group: int = 0
+
+    @property
+    def title(self) -> Optional[str]:
+        return self.event.title
+
+    @property
+    def notes(self) -> Optional[str]:
+        return self.event.notes
+
+    @property
+    def style(self) -> EventStyle:
+        return self.event.style
+
+    @property
+    def recurrence(self) -> None:
+        return None
+
+    @property
+    def start_time(self) -> time:
+        return time(self.start_minute // 60, self.start_minute % 60)
+
+    @property
+    def end_time(self) -> time:
+        return time(self.end_minute // 60 % 24, self.end_minute % 60)
+
+    def get_start_date(self, config: CalendarConfig) -> date:
+        if self.day is not None:
+            return self.day
+        return config.get_date_range()[0] + timedelta(days=self.day_index)
+
+    def get_end_date(self, config: CalendarConfig) -> date:
+        day: date = self.get_start_date(config)
+        return day + timedelta(days=1) if self.end_minute == EventSegment.MINUTES_PER_DAY else day
+
+    def get_duration_seconds(self, config: CalendarConfig) -> float:
+        return (self.end_minute - self.start_minute) * 60
+
+    def __repr__(self) -> str:
+        return f'EventSegment[title: {self.title}, day_index: {self.day_index}, start_time: {self.start_time}, ' \
+               f'end_time: {self.end_time}, cascade_group: {self.cascade_group}, ' \
+               f'cascade_total: {self.cascade_total}, cascade_index: {self.cascade_index}]'
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, EventSegment) \
+               and self.title == other.title \
+               and self.notes == other.notes \
+               and self.style == other.style \
+               and self.day_index == other.day_index \
+               and self.start_minute == other.start_minute \
+               and self.end_minute == other.end_minute \
                and self.cascade_group == other.cascade_group \
                and self.cascade_total == other.cascade_total \
                and self.cascade_index == other.cascade_index
@@ -0,0 +1,95 @@
+import hashlib
+import json
+from typing import List, Iterable, Optional
+
+from PIL.ImageFont import FreeTypeFont
+
+from calendar_view.config import style
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.event import Event
+from calendar_view.core.recurrence import RecurrenceRule
+
+
+FINGERPRINT_VERSION = 2
+
+
+def config_key(config: CalendarConfig) -> list:
+    """
+    The normalized configuration: the parsed ranges instead of the raw 'dates', 'days', 'hours' and 'mode' values.
+    """
+    date_from, date_to = config.get_date_range()
+    return [
+        config.lang,
+        config.title,
+        date_from.isoformat(),
+        date_to.isoformat(),
+        list(config.get_hours_range()),
+        config.show_date,
+        config.show_year,
+        config.legend,
+        config.title_vertical_align,
+        config.deduplicate,
+        config.merge_adjacent,
+        config.fit_hours,
+        config.collapse_empty_days,
+    ]
+
+
+def event_key(event: Event, config: CalendarConfig) -> list:
+    """
+    The resolved event: the day of the week is replaced by the date in the configured range.
+    """
+    return [
+        event.title,
+        event.notes,
+        event.get_start_date(config).isoformat(),
+        event.get_end_date(config).isoformat(),
+        event.start_time.isoformat(),
+        event.end_time.isoformat(),
+        list(event.style.event_border),
+        list(event.style.event_fill),
+        recurrence_key(event.recurrence),
+    ]
+
+
+def recurrence_key(rule: Optional[RecurrenceRule]) -> Optional[list]:
+    if rule is None:
+        return None
+    return [
+        rule.frequency,
+        rule.interval,
+        rule.days_of_week,
+        rule.count,
+        rule.until.isoformat() if rule.until else None,
+        sorted(d.isoformat() for d in rule.exceptions),
+    ]
+
+
+def style_key() -> list:
+    """
+    The effective values of the style module. The fonts are identified by the file and the size.
+    """
+    values: list = []
+    for name in sorted(vars(style)):
+        if name.startswith('_'):
+            continue
+        value = getattr(style, name)
+        if isinstance(value, FreeTypeFont):
+            values.append([name, str(value.path), value.size])
+        elif isinstance(value, (int, float, str, tuple, list, type(None))):
+            values.append([name, value])
+    return values
+
+
+def render_fingerprint(config: CalendarConfig, events: Iterable[Event]) -> str:
+    """
+    The content hash of everything that defines the rendered image: the same fingerprint means the same image.
+    """
+    payload: List[object] = [
+        FINGERPRINT_VERSION,
+        config_key(config),
+        [event_key(e, config) for e in events],
+        style_key(),
+    ]
+    encoded: bytes = json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
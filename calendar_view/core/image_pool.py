@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Union
+
+from PIL import Image
+
+
+Color = Union[str, Tuple[int, ...]]
+
+
+class ImagePool(object):
+    """
+    The bounded pool of the free image buffers by mode and size. The renders borrow the canvases with 'acquire'
+    and return them with 'release', so the back-to-back renders of the same size reuse the memory.
+    The least recently returned sizes are dropped first when the pool is full.
+    The released image must not be used by its previous owner anymore.
+    """
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self._size: int = 0
+        self._free: 'OrderedDict[tuple, List[Image.Image]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, size: Tuple[int, int], color: Color = (0, 0, 0, 0), mode: str = 'RGBA') -> Image.Image:
+        """
+        Returns the image filled with the color, the same as 'Image.new(mode, size, color)'.
+        """
+        key: tuple = (mode, tuple(size))
+        with self._lock:
+            images: Optional[List[Image.Image]] = self._free.get(key)
+            image: Optional[Image.Image] = images.pop() if images else None
+            if image is not None:
+                self._size -= self._bytes(image)
+                if not images:
+                    del self._free[key]
+                self.hits += 1
+            else:
+                self.misses += 1
+        if image is None:
+            return Image.new(mode, size, color)
+        image.paste(color, (0, 0) + image.size)
+        return image
+
+    def release(self, *images: Optional[Image.Image]) -> None:
+        """
+        Returns the images to the pool. The image larger than the whole pool is closed.
+        The read-only views of the other buffers, e.g. the images of 'TileRenderer', are not pooled.
+        """
+        for image in images:
+            if image is None or image.readonly:
+                continue
+            image_bytes: int = self._bytes(image)
+            if image_bytes > self.max_bytes:
+                image.close()
+                continue
+            evicted: List[Image.Image] = []
+            with self._lock:
+                key: tuple = (image.mode, image.size)
+                self._free.setdefault(key, []).append(image)
+                self._free.move_to_end(key)
+                self._size += image_bytes
+                while self._size > self.max_bytes:
+                    oldest: List[Image.Image] = next(iter(self._free.values()))
+                    evicted.append(oldest.pop(0))
+                    self._size -= self._bytes(evicted[-1])
+                    if not oldest:
+                        self._free.popitem(last=False)
+            for evicted_image in evicted:
+                evicted_image.close()
+
+    def clear(self) -> None:
+        with self._lock:
+            images: List[Image.Image] = [image for free in self._free.values() for image in free]
+            self._free.clear()
+            self._size = 0
+        for image in images:
+            image.close()
+
+    @staticmethod
+    def _bytes(image: Image.Image) -> int:
+        return image.size[0] * image.size[1] * len(image.getbands())
+
+    def __repr__(self) -> str:
+        return f'ImagePool[images: {sum(len(free) for free in self._free.values())}, bytes: {self._size}, ' \
+               f'hits: {self.hits}, misses: {self.misses}]'
+
+
+image_pool = ImagePool()
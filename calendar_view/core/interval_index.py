@@ -0,0 +1,215 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.event import Event, EventSegment
+
+if TYPE_CHECKING:
+    from calendar_view.core.calendar_events import CalendarEvents
+
+
+MINUTES_PER_DAY = EventSegment.MINUTES_PER_DAY
+
+
+class DayIntervals(object):
+    """
+    The minute ranges of the events of one day in the sorted arrays and the union of the ranges with
+    the cumulative busy minutes. The queries are binary searches over the arrays.
+    """
+    def __init__(self, spans: List[Tuple[int, int, int, Event]]):
+        """
+        :param spans: the start minute, the end minute, the position in the calendar and the event
+        """
+        # the longer event goes first if they start together, so it opens the group
+        spans = sorted(spans, key=lambda s: (s[0], -s[1]))
+        self.starts: List[int] = [s[0] for s in spans]
+        self.ends: List[int] = [s[1] for s in spans]
+        self.positions: List[int] = [s[2] for s in spans]
+        self.events: List[Event] = [s[3] for s in spans]
+        self.max_length: int = max((end - start for start, end in zip(self.starts, self.ends)), default=0)
+
+        # the union of the ranges, 'busy_before[i]' is the number of the busy minutes before 'busy_starts[i]'
+        self.busy_starts: List[int] = []
+        self.busy_ends: List[int] = []
+        self.busy_before: List[int] = []
+        total: int = 0
+        for start, end in zip(self.starts, self.ends):
+            if end <= start:
+                continue
+            if self.busy_ends and start <= self.busy_ends[-1]:
+                if end > self.busy_ends[-1]:
+                    total += end - self.busy_ends[-1]
+                    self.busy_ends[-1] = end
+            else:
+                self.busy_starts.append(start)
+                self.busy_ends.append(end)
+                self.busy_before.append(total)
+                total += end - start
+
+    def overlapping(self, start: int, end: int) -> List[Event]:
+        """
+        The events intersecting the range [start, end). Only the events starting later than 'start - max_length'
+        can reach the range, so the candidates are found by the binary search.
+        """
+        first: int = bisect_right(self.starts, start - self.max_length)
+        last: int = bisect_left(self.starts, end)
+        return [self.events[i] for i in range(first, last) if self.ends[i] > start]
+
+    def busy_before_minute(self, minute: int) -> int:
+        """
+        The number of the busy minutes in the range [0, minute).
+        """
+        index: int = bisect_right(self.busy_starts, minute) - 1
+        if index < 0:
+            return 0
+        return self.busy_before[index] + min(minute, self.busy_ends[index]) - self.busy_starts[index]
+
+    def free_ranges(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """
+        The gaps between the busy ranges in the range [start, end).
+        """
+        ranges: List[Tuple[int, int]] = []
+        cursor: int = start
+        index: int = bisect_right(self.busy_ends, start)
+        while index < len(self.busy_starts) and self.busy_starts[index] < end:
+            if self.busy_starts[index] > cursor:
+                ranges.append((cursor, self.busy_starts[index]))
+            cursor = max(cursor, self.busy_ends[index])
+            index += 1
+        if cursor < end:
+            ranges.append((cursor, end))
+        return ranges
+
+    def cascade_groups(self) -> List[List[int]]:
+        """
+        The indexes of the connected groups of the overlapping events. One sweep: the event joins the current group
+        if it starts before the latest end of the group.
+        """
+        groups: List[List[int]] = []
+        group_end: int = -1
+        for i, (start, end) in enumerate(zip(self.starts, self.ends)):
+            if groups and start < group_end:
+                groups[-1].append(i)
+                group_end = max(group_end, end)
+            else:
+                groups.append([i])
+                group_end = end
+        return groups
+
+    def __repr__(self) -> str:
+        return f'DayIntervals[events: {len(self.events)}, busy_ranges: {len(self.busy_starts)}]'
+
+
+class IntervalIndex(object):
+    """
+    The per-day interval index of the calendar events for the conflict and free/busy queries.
+    The multi-day events are indexed by their day segments, the queries return the original events.
+    The minutes are counted from the start of the day, the end of the day is 1440.
+    """
+    def __init__(self, config: CalendarConfig, events: List[Event], days: Dict[date, DayIntervals]):
+        self.config: CalendarConfig = config
+        self.events: List[Event] = events  # the indexed list, see 'CalendarEvents.get_index'
+        self.days: Dict[date, DayIntervals] = days
+
+    @staticmethod
+    def build(calendar_events: 'CalendarEvents') -> 'IntervalIndex':
+        config = calendar_events.config
+        spans: Dict[date, List[Tuple[int, int, int, Event]]] = {}
+        for position, event in enumerate(calendar_events.events):
+            start, end = calendar_events.get_minute_range(event)
+            spans.setdefault(event.get_start_date(config), []).append((start, end, position, event))
+        days: Dict[date, DayIntervals] = {day: DayIntervals(day_spans) for day, day_spans in spans.items()}
+        return IntervalIndex(config, calendar_events.events, days)
+
+    def overlapping(self, day: date, start: int, end: int) -> List[Event]:
+        """
+        The events of the day intersecting the minute range [start, end).
+        """
+        intervals: Optional[DayIntervals] = self.days.get(day)
+        if intervals is None:
+            return []
+        return self.__unique_events(intervals.overlapping(start, end))
+
+    def conflicts(self, event: Event) -> List[Event]:
+        """
+        The events overlapping the event. It can be the event of the calendar or the new one, e.g. the booking
+        request. The event itself is not included.
+        """
+        own: Event = event.event if isinstance(event, EventSegment) else event
+        start_date: date = event.get_start_date(self.config)
+        end_date: date = event.get_end_date(self.config)
+        start_minute: int = event.start_time.hour * 60 + event.start_time.minute
+        end_minute: int = event.end_time.hour * 60 + event.end_time.minute
+        found: List[Event] = []
+        day: date = start_date
+        while day <= end_date:
+            start: int = start_minute if day == start_date else 0
+            end: int = end_minute if day == end_date else MINUTES_PER_DAY
+            if start < end:
+                found.extend(self.overlapping(day, start, end))
+            day += timedelta(days=1)
+        return [e for e in self.__unique_events(found) if e is not own]
+
+    def busy_minutes(self, day: date, start: int = 0, end: int = MINUTES_PER_DAY) -> int:
+        """
+        The number of the minutes of the range [start, end) covered by at least one event.
+        """
+        intervals: Optional[DayIntervals] = self.days.get(day)
+        if intervals is None or end <= start:
+            return 0
+        return intervals.busy_before_minute(end) - intervals.busy_before_minute(start)
+
+    def busy_minutes_per_hour(self, day: date, hours: Tuple[int, int] = (0, 24)) -> List[int]:
+        """
+        The busy minutes of every hour in the range of hours [from, to).
+        """
+        return [self.busy_minutes(day, hour * 60, (hour + 1) * 60) for hour in range(*hours)]
+
+    def free_slots(self, days: Iterable[date], min_minutes: int, hours: Optional[Tuple[int, int]] = None) \
+            -> List[Tuple[datetime, datetime]]:
+        """
+        The free time ranges of at least 'min_minutes' minutes.
+        :param days: the days to search
+        :param hours: the range of hours [from, to) to search, the hours of the config by default
+        """
+        hour_from, hour_to = hours or self.config.get_hours_range()
+        slots: List[Tuple[datetime, datetime]] = []
+        for day in days:
+            intervals: Optional[DayIntervals] = self.days.get(day)
+            ranges: List[Tuple[int, int]] = [(hour_from * 60, hour_to * 60)] if intervals is None \
+                else intervals.free_ranges(hour_from * 60, hour_to * 60)
+            midnight: datetime = datetime.combine(day, time())
+            slots.extend((midnight + timedelta(minutes=start), midnight + timedelta(minutes=end))
+                         for start, end in ranges if end - start >= min_minutes)
+        return slots
+
+    def cascade_groups(self) -> List[List[Event]]:
+        """
+        The groups of the overlapping events of every day. The events of the group keep their order in the calendar.
+        """
+        groups: List[List[Event]] = []
+        for day in sorted(self.days):
+            intervals: DayIntervals = self.days[day]
+            for group in intervals.cascade_groups():
+                group.sort(key=lambda i: intervals.positions[i])
+                groups.append([intervals.events[i] for i in group])
+        return groups
+
+    @staticmethod
+    def __unique_events(events: Iterable[Event]) -> List[Event]:
+        """
+        Replaces the segments with their events, every event is returned once.
+        """
+        seen: Set[int] = set()
+        unique: List[Event] = []
+        for event in events:
+            if isinstance(event, EventSegment):
+                event = event.event
+            if id(event) not in seen:
+                seen.add(id(event))
+                unique.append(event)
+        return unique
+
+    def __repr__(self) -> str:
+        return f'IntervalIndex[days: {len(self.days)}, events: {len(self.events)}]'
@@ -0,0 +1,235 @@
+from typing import List, Optional, Tuple, Union
+
+from calendar_view.config import style
+
+
+Color = Union[str, Tuple[int, ...]]
+Point = Tuple[float, float]
+
+
+def _color(value) -> Color:
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _point(value) -> Point:
+    return value[0], value[1]
+
+
+def _scale_point(point: Point, factor: Tuple[float, float], origin: Point) -> Point:
+    return (point[0] - origin[0]) * factor[0], (point[1] - origin[1]) * factor[1]
+
+
+def _shift_point(point: Point, offset: Point) -> Point:
+    return point[0] + offset[0], point[1] + offset[1]
+
+
+def _scale_width(width: int, factor: Tuple[float, float]) -> int:
+    return max(1, round(width * min(factor))) if width > 0 else 0
+
+
+class TextBlock(object):
+    """
+    The positioned multiline text. The font is the name of the font in the style module, e.g. 'event_title_font'.
+    """
+    def __init__(self, text: str, position: Point, size: Tuple[int, int], font: str, color: Color,
+                 align: str = 'left'):
+        self.text: str = text
+        self.position: Point = position
+        self.size: Tuple[int, int] = size
+        self.font: str = font
+        self.color: Color = color
+        self.align: str = align
+
+    @property
+    def lines(self) -> List[str]:
+        return self.text.split('\n')
+
+    def to_dict(self) -> dict:
+        return {
+            'text': self.text,
+            'lines': self.lines,
+            'position': list(self.position),
+            'size': list(self.size),
+            'font': self.font,
+            'font_size': getattr(style, self.font).size,
+            'color': self.color,
+            'align': self.align,
+        }
+
+    def shifted(self, offset: Point) -> 'TextBlock':
+        return TextBlock(self.text, _shift_point(self.position, offset), self.size, self.font, self.color, self.align)
+
+    @staticmethod
+    def from_dict(value: Optional[dict]) -> Optional['TextBlock']:
+        if value is None:
+            return None
+        return TextBlock(value['text'], _point(value['position']), _point(value['size']), value['font'],
+                         _color(value['color']), value['align'])
+
+    def __repr__(self) -> str:
+        return f'TextBlock[position: {self.position}, size: {self.size}, font: {self.font}, text: {self.text}]'
+
+
+class LineShape(object):
+    def __init__(self, start: Point, end: Point, color: Color, width: int):
+        self.start: Point = start
+        self.end: Point = end
+        self.color: Color = color
+        self.width: int = width
+
+    def to_dict(self) -> dict:
+        return {'start': list(self.start), 'end': list(self.end), 'color': self.color, 'width': self.width}
+
+    def scaled(self, factor: Tuple[float, float], origin: Point = (0, 0)) -> 'LineShape':
+        return LineShape(_scale_point(self.start, factor, origin), _scale_point(self.end, factor, origin), self.color,
+                         _scale_width(self.width, factor))
+
+    def shifted(self, offset: Point) -> 'LineShape':
+        return LineShape(_shift_point(self.start, offset), _shift_point(self.end, offset), self.color, self.width)
+
+    @staticmethod
+    def from_dict(value: dict) -> 'LineShape':
+        return LineShape(_point(value['start']), _point(value['end']), _color(value['color']), value['width'])
+
+    def __repr__(self) -> str:
+        return f'LineShape[start: {self.start}, end: {self.end}]'
+
+
+class EventBox(object):
+    """
+    The rounded rectangle of the event for one day with its fitted title and notes.
+    """
+    def __init__(self, day: int, rect: Tuple[float, float, float, float], border: Color, fill: Color,
+                 border_width: int, radius: int, title: Optional[TextBlock] = None, notes: Optional[TextBlock] = None):
+        self.day: int = day
+        self.rect: Tuple[float, float, float, float] = rect
+        self.border: Color = border
+        self.fill: Color = fill
+        self.border_width: int = border_width
+        self.radius: int = radius
+        self.title: Optional[TextBlock] = title
+        self.notes: Optional[TextBlock] = notes
+
+    def to_dict(self) -> dict:
+        return {
+            'day': self.day,
+            'rect': list(self.rect),
+            'border': self.border,
+            'fill': self.fill,
+            'border_width': self.border_width,
+            'radius': self.radius,
+            'title': self.title.to_dict() if self.title else None,
+            'notes': self.notes.to_dict() if self.notes else None,
+        }
+
+    def scaled(self, factor: Tuple[float, float], origin: Point = (0, 0)) -> 'EventBox':
+        """
+        Scales the box geometry. The title and notes are not scaled, they are dropped.
+        """
+        x1, y1 = _scale_point(self.rect[:2], factor, origin)
+        x2, y2 = _scale_point(self.rect[2:], factor, origin)
+        return EventBox(self.day, (x1, y1, x2, y2), self.border, self.fill, _scale_width(self.border_width, factor),
+                        round(self.radius * min(factor)))
+
+    def shifted(self, offset: Point) -> 'EventBox':
+        x1, y1 = _shift_point(self.rect[:2], offset)
+        x2, y2 = _shift_point(self.rect[2:], offset)
+        return EventBox(self.day, (x1, y1, x2, y2), self.border, self.fill, self.border_width, self.radius,
+                        self.title.shifted(offset) if self.title else None,
+                        self.notes.shifted(offset) if self.notes else None)
+
+    @staticmethod
+    def from_dict(value: dict) -> 'EventBox':
+        return EventBox(value['day'], tuple(value['rect']), _color(value['border']), _color(value['fill']),
+                        value['border_width'], value['radius'], TextBlock.from_dict(value['title']),
+                        TextBlock.from_dict(value['notes']))
+
+    def __repr__(self) -> str:
+        return f'EventBox[day: {self.day}, rect: {self.rect}, title: {self.title}, notes: {self.notes}]'
+
+
+class GridLayout(object):
+    """
+    The hour and day lines with the hour numbers and the day titles.
+    """
+    def __init__(self, size: Tuple[int, int], lines: List[LineShape], texts: List[TextBlock]):
+        self.size: Tuple[int, int] = size
+        self.lines: List[LineShape] = lines
+        self.texts: List[TextBlock] = texts
+
+    def to_dict(self) -> dict:
+        return {
+            'size': list(self.size),
+            'lines': [line.to_dict() for line in self.lines],
+            'texts': [text.to_dict() for text in self.texts],
+        }
+
+    def scaled(self, size: Tuple[int, int], factor: Tuple[float, float], origin: Point = (0, 0)) -> 'GridLayout':
+        """
+        Scales the lines to the new size. The texts are dropped.
+        """
+        return GridLayout(size, [line.scaled(factor, origin) for line in self.lines], [])
+
+    @staticmethod
+    def from_dict(value: dict) -> 'GridLayout':
+        return GridLayout(_point(value['size']), [LineShape.from_dict(line) for line in value['lines']],
+                          [TextBlock.from_dict(text) for text in value['texts']])
+
+
+class LegendPage(object):
+    def __init__(self, size: Tuple[int, int], texts: List[TextBlock]):
+        self.size: Tuple[int, int] = size
+        self.texts: List[TextBlock] = texts
+
+    def to_dict(self) -> dict:
+        return {'size': list(self.size), 'texts': [text.to_dict() for text in self.texts]}
+
+    @staticmethod
+    def from_dict(value: dict) -> 'LegendPage':
+        return LegendPage(_point(value['size']), [TextBlock.from_dict(text) for text in value['texts']])
+
+
+class CalendarLayout(object):
+    """
+    The geometry of the whole calendar image without any pixels. The grid and the events are positioned relative to
+    'events_origin', the legend pages relative to 'legend_origin'. The first legend page is a part of the image.
+    """
+    def __init__(self, size: Tuple[int, int], background: Color, title: Optional[TextBlock], events_origin: Point,
+                 grid: GridLayout, events: List[EventBox], legend_origin: Point, legend_pages: List[LegendPage]):
+        self.size: Tuple[int, int] = size
+        self.background: Color = background
+        self.title: Optional[TextBlock] = title
+        self.events_origin: Point = events_origin
+        self.grid: GridLayout = grid
+        self.events: List[EventBox] = events
+        self.legend_origin: Point = legend_origin
+        self.legend_pages: List[LegendPage] = legend_pages
+
+    def to_dict(self) -> dict:
+        return {
+            'size': list(self.size),
+            'background': self.background,
+            'title': self.title.to_dict() if self.title else None,
+            'events_origin': list(self.events_origin),
+            'grid': self.grid.to_dict(),
+            'events': [e.to_dict() for e in self.events],
+            'legend_origin': list(self.legend_origin),
+            'legend_pages': [page.to_dict() for page in self.legend_pages],
+        }
+
+    @staticmethod
+    def from_dict(value: dict) -> 'CalendarLayout':
+        return CalendarLayout(
+            size=_point(value['size']),
+            background=_color(value['background']),
+            title=TextBlock.from_dict(value['title']),
+            events_origin=_point(value['events_origin']),
+            grid=GridLayout.from_dict(value['grid']),
+            events=[EventBox.from_dict(e) for e in value['events']],
+            legend_origin=_point(value['legend_origin']),
+            legend_pages=[LegendPage.from_dict(page) for page in value['legend_pages']],
+        )
+
+    def __repr__(self) -> str:
+        return f'CalendarLayout[size: {self.size}, events: {len(self.events)}, ' \
+               f'legend_pages: {len(self.legend_pages)}]'
@@ -0,0 +1,63 @@
+import mmap
+from typing import Any, Optional, Tuple
+
+from PIL import Image
+
+
+BYTES_PER_PIXEL = 4  # RGBA
+
+
+def map_buffer(buffer: Any, size: Tuple[int, int], owner: Optional[Any] = None) -> Image.Image:
+    """
+    Returns the read-only RGBA image over the buffer without copying. Drawing on the image makes a copy.
+    :param buffer: the object with the buffer protocol, e.g. the memory map, with the RGBA pixels row by row
+    :param owner: the object keeping the buffer alive, it is freed after the image
+    """
+    image: Image.Image = Image.frombuffer('RGBA', size, buffer, 'raw', 'RGBA', 0, 1)
+    image.pixel_buffer = buffer
+    image.buffer_owner = owner
+    return image
+
+
+def get_pixels(image: Image.Image) -> memoryview:
+    """
+    The RGBA pixels of the image row by row. The image over a buffer, e.g. rendered by 'TileRenderer' or mapped by
+    'map_raw', is not copied. The other images are copied once: Pillow doesn't expose its own memory.
+    """
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+    buffer: Optional[Any] = getattr(image, 'pixel_buffer', None)
+    if buffer is not None and image.readonly:
+        return memoryview(buffer)[:image.size[0] * image.size[1] * BYTES_PER_PIXEL]
+    return memoryview(image.tobytes())
+
+
+def to_array(image: Image.Image):
+    """
+    The pixels as the read-only numpy array with the shape (height, width, 4) over 'get_pixels'.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('numpy is required for the array export, install it: pip install calendar-view[columnar]')
+    width, height = image.size
+    return numpy.frombuffer(get_pixels(image), dtype=numpy.uint8).reshape(height, width, BYTES_PER_PIXEL)
+
+
+def save_raw(image: Image.Image, filename: str) -> None:
+    """
+    Writes the RGBA pixels row by row without any header or compression. 'map_raw' maps the file back.
+    """
+    with open(filename, 'wb') as f:
+        f.write(get_pixels(image))
+
+
+def map_raw(filename: str, size: Tuple[int, int]) -> Image.Image:
+    """
+    Maps the file written by 'save_raw' to memory and returns the read-only image over it.
+    The pages are read from the disk on demand, so the large images are not loaded whole.
+    :param size: the width and the height of the image
+    """
+    with open(filename, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), size[0] * size[1] * BYTES_PER_PIXEL, access=mmap.ACCESS_READ)
+    return map_buffer(mapped, size)
@@ -0,0 +1,117 @@
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Set, Union
+
+from calendar_view.core.time_utils import parse_date
+
+
+DateValue = Union[date, datetime, str]
+
+
+def _to_date(value: DateValue) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return parse_date(value, None)
+
+
+class RecurrenceRule(object):
+    """
+    The rule of the recurring event. The occurrences are computed arithmetically for the requested window only,
+    so the cost depends on the visible occurrences and not on the length of the series.
+    'count' includes the excluded dates, like COUNT and EXDATE in RFC 5545.
+    """
+    DAILY = 'daily'
+    WEEKLY = 'weekly'
+
+    def __init__(self, frequency: str = WEEKLY, interval: int = 1, days_of_week: Iterable[int] = None,
+                 count: int = None, until: DateValue = None, exceptions: Iterable[DateValue] = None) -> None:
+        """
+        :param frequency: 'daily' or 'weekly'
+        :param interval: every n-th day or week
+        :param days_of_week: the days of the weekly series [0, 6]. The day of the first event if not defined.
+        :param count: the maximal number of the occurrences
+        :param until: the last possible date of the series (inclusive)
+        :param exceptions: the dates without the occurrence
+        """
+        if frequency not in (RecurrenceRule.DAILY, RecurrenceRule.WEEKLY):
+            raise ValueError(f"'frequency' has to be '{RecurrenceRule.DAILY}' or '{RecurrenceRule.WEEKLY}'. "
+                             f"Current value is: {frequency}")
+        if interval < 1:
+            raise ValueError(f"'interval' has to be positive. Current value is: {interval}")
+        if count is not None and count < 1:
+            raise ValueError(f"'count' has to be positive. Current value is: {count}")
+        self.frequency: str = frequency
+        self.interval: int = interval
+        self.days_of_week: Optional[List[int]] = sorted(set(days_of_week)) if days_of_week else None
+        if self.days_of_week and not all(0 <= d <= 6 for d in self.days_of_week):
+            raise ValueError(f"'days_of_week' have to be in the interval [0, 6]. Current value is: {days_of_week}")
+        if self.days_of_week and frequency == RecurrenceRule.DAILY:
+            raise ValueError("'days_of_week' can be defined for the weekly series only.")
+        self.count: Optional[int] = count
+        self.until: Optional[date] = _to_date(until) if until else None
+        self.exceptions: Set[date] = {_to_date(d) for d in exceptions} if exceptions else set()
+
+    def occurrences(self, start: date, date_from: date, date_to: date) -> Iterator[date]:
+        """
+        Returns the dates of the occurrences in the interval [date_from, date_to].
+        :param start: the date of the first event of the series
+        """
+        if self.until is not None:
+            date_to = min(date_to, self.until)
+        date_from = max(date_from, start)
+        if date_from > date_to:
+            return iter(())
+        if self.frequency == RecurrenceRule.DAILY:
+            dates = self.__daily(start, date_from, date_to)
+        else:
+            dates = self.__weekly(start, date_from, date_to)
+        return (d for d in dates if d not in self.exceptions)
+
+    def __daily(self, start: date, date_from: date, date_to: date) -> Iterator[date]:
+        first: int = -(-(date_from - start).days // self.interval)
+        last: int = (date_to - start).days // self.interval
+        if self.count is not None:
+            last = min(last, self.count - 1)
+        for index in range(first, last + 1):
+            yield start + timedelta(days=index * self.interval)
+
+    def __weekly(self, start: date, date_from: date, date_to: date) -> Iterator[date]:
+        days: List[int] = self.days_of_week or [start.weekday()]
+        first_week: date = start - timedelta(days=start.weekday())
+        first_week_count: int = sum(1 for d in days if d >= start.weekday())
+
+        # the first active week which can have the occurrences in the window
+        weeks_before: int = (date_from - first_week).days // 7
+        block: int = -(-weeks_before // self.interval)
+        while True:
+            week: date = first_week + timedelta(weeks=block * self.interval)
+            if week > date_to:
+                return
+            index: int = 0 if block == 0 else first_week_count + (block - 1) * len(days)
+            for day in days:
+                if block == 0 and day < start.weekday():
+                    continue
+                if self.count is not None and index >= self.count:
+                    return
+                occurrence: date = week + timedelta(days=day)
+                index += 1
+                if occurrence > date_to:
+                    return
+                if occurrence >= date_from:
+                    yield occurrence
+            block += 1
+
+    def __repr__(self) -> str:
+        return f'RecurrenceRule[frequency: {self.frequency}, interval: {self.interval}, ' \
+               f'days_of_week: {self.days_of_week}, count: {self.count}, until: {self.until}, ' \
+               f'exceptions: {sorted(self.exceptions)}]'
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RecurrenceRule) \
+               and self.frequency == other.frequency \
+               and self.interval == other.interval \
+               and self.days_of_week == other.days_of_week \
+               and self.count == other.count \
+               and self.until == other.until \
+               and self.exceptions == other.exceptions
@@ -0,0 +1,135 @@
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Optional, List, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class RenderCache(object):
+    """
+    The content-addressed cache of the encoded images on the disk. The key is the render fingerprint
+    (see 'fingerprint.render_fingerprint'), so the entries never have to be invalidated, only evicted.
+
+    The files are written to a temporary file and renamed, so the readers never see a partial image, and
+    several processes can share the same directory. The least recently used entries are removed
+    when the total size exceeds 'max_size' bytes.
+
+    The size is counted by every instance from the writes since its last scan of the directory, the directory is
+    scanned again only when the count crosses 'max_size'. The entries written by the other processes are found
+    by the next scan, so the shared cache can grow over the limit by their writes until then.
+    """
+    LOCK_FILE = '.lock'
+    SUFFIX = '.png'
+    EVICT_TO = 0.9  # the eviction frees some room, so the next writes don't scan the directory again
+
+    def __init__(self, directory: str, max_size: int = 256 * 1024 * 1024):
+        if max_size <= 0:
+            raise ValueError(f"'max_size' has to be positive. Current value is: {max_size}")
+        self.directory = directory
+        self.max_size = max_size
+        self._size: Optional[int] = None  # the estimated size, unknown before the first scan
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Returns the cached image or None. The hit marks the entry as recently used.
+        """
+        path: str = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                content: bytes = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None  # not cached or just evicted by another process
+        logger.debug(f'Render cache hit: {key}')
+        return content
+
+    def put(self, key: str, content: bytes) -> None:
+        path: str = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            os.utime(path)
+            return  # the same key has the same content
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if self._size is not None:
+            self._size += len(content)
+        if self._size is None or self._size > self.max_size:
+            self.evict()
+
+    def evict(self) -> None:
+        """
+        Scans the directory and removes the least recently used entries if the cache doesn't fit into 'max_size'.
+        """
+        with self._lock():
+            entries: List[Tuple[float, int, str]] = []
+            total: int = 0
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if not name.endswith(RenderCache.SUFFIX):
+                        continue
+                    path: str = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+            if total <= self.max_size:
+                self._size = total
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_size * RenderCache.EVICT_TO:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                logger.debug(f'Render cache evicted: {path}')
+            self._size = total
+
+    def clear(self) -> None:
+        with self._lock():
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith(RenderCache.SUFFIX):
+                        os.remove(os.path.join(root, name))
+            self._size = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + RenderCache.SUFFIX)
+
+    @contextmanager
+    def _lock(self):
+        """
+        The lock between processes for the eviction. Readers and writers don't need it.
+        """
+        with open(os.path.join(self.directory, RenderCache.LOCK_FILE), 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def __repr__(self) -> str:
+        return f'RenderCache[directory: {self.directory}, max_size: {self.max_size}]'
@@ -0,0 +1,325 @@
+import json
+import math
+from typing import List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from PIL import Image, ImageDraw
+
+from calendar_view.config import style
+from calendar_view.core import text_layout
+from calendar_view.core.deadline import Deadline, NO_DEADLINE, RenderInterruptedError
+from calendar_view.core.image_pool import ImagePool
+from calendar_view.core.layout import CalendarLayout, Color, EventBox, GridLayout, LegendPage, LineShape, TextBlock
+from calendar_view.core.round_rectangle import draw_rounded_rectangle
+from calendar_view.core.text_cache import text_masks
+
+
+class PillowRenderer(object):
+    """
+    Rasterizes the layout with Pillow. The grid, the events and the legend are drawn on separate transparent layers
+    and then composed on the background.
+    """
+    def __init__(self, deadline: Deadline = NO_DEADLINE, pool: Optional[ImagePool] = None):
+        """
+        :param deadline: checked between the layers and for every event box
+        :param pool: the canvases are taken from the pool and the intermediate layers are returned to it
+        """
+        self.deadline: Deadline = deadline
+        self.pool: Optional[ImagePool] = pool
+
+    def render(self, layout: CalendarLayout, grid_image: Optional[Image.Image] = None) -> Image.Image:
+        """
+        :param grid_image: the grid drawn before, it is drawn from the layout if not defined
+        """
+        allocated: List[Image.Image] = []
+        try:
+            if grid_image is None:
+                grid_image = self.render_grid(layout.grid)
+                allocated.append(grid_image)
+            self.deadline.check('render_events')
+            event_image: Image.Image = self._new_image(layout.grid.size)
+            allocated.append(event_image)
+            self.draw_event_boxes(event_image, layout.events)
+            events: Image.Image = Image.alpha_composite(grid_image, event_image)
+            allocated.append(events)
+
+            self.deadline.check('combine_image')
+            combined: Image.Image = self._new_image(layout.size)
+            allocated.append(combined)
+            if layout.title is not None:
+                self.draw_text(ImageDraw.Draw(combined), layout.title)
+            combined.paste(events, self._int_point(layout.events_origin))
+            if layout.legend_pages:
+                legend: Image.Image = self.render_legend_page(layout.legend_pages[0])
+                allocated.append(legend)
+                combined.paste(legend, self._int_point(layout.legend_origin))
+
+            full_image: Image.Image = self._new_image(layout.size, layout.background)
+            allocated.append(full_image)
+            result: Image.Image = Image.alpha_composite(full_image, combined)
+        except RenderInterruptedError:
+            # the interrupted render frees its canvases right away, the traceback keeps the references
+            self._free_images(allocated)
+            raise
+        self._free_images(allocated)
+        return result
+
+    def render_band(self, layout: CalendarLayout, top: int, bottom: int) -> Image.Image:
+        """
+        Renders the rows [top, bottom) of the image with the same pixels as 'render'. Only the shapes crossing
+        the band are drawn, so the bands can be rendered in parallel, see 'calendar_view.core.tiles'.
+        """
+        events_x, events_y = self._int_point(layout.events_origin)
+        legend_x, legend_y = self._int_point(layout.legend_origin)
+        title: Optional[TextBlock] = layout.title \
+            if layout.title is not None and self._text_crosses(layout.title, top, bottom) else None
+        lines: List[LineShape] = [line for line in layout.grid.lines
+                                  if self._line_crosses(line, top - events_y, bottom - events_y)]
+        grid_texts: List[TextBlock] = [text for text in layout.grid.texts
+                                       if self._text_crosses(text, top - events_y, bottom - events_y)]
+        boxes: List[EventBox] = [box for box in layout.events
+                                 if self._box_crosses(box, top - events_y, bottom - events_y)]
+        page: Optional[LegendPage] = layout.legend_pages[0] if layout.legend_pages else None
+        legend_texts: List[TextBlock] = [] if page is None else \
+            [text for text in page.texts if self._text_crosses(text, top - legend_y, bottom - legend_y)]
+
+        # Pillow places the glyphs at the negative coordinates differently, so the texts crossing the top
+        # of the band are drawn at the positive coordinates: the canvas starts at the highest of them
+        tops: List[float] = [top] if title is None else [top, title.position[1]]
+        tops.extend(text.position[1] + events_y for text in grid_texts)
+        tops.extend(text.position[1] + events_y for box in boxes for text in (box.title, box.notes)
+                    if text is not None and self._text_crosses(text, top - events_y, bottom - events_y))
+        tops.extend(text.position[1] + legend_y for text in legend_texts)
+        first: int = max(0, min(top, math.floor(min(tops))))
+
+        combined: Image.Image = self._new_image((layout.size[0], bottom - first))
+        if title is not None:
+            self.draw_text(ImageDraw.Draw(combined), title.shifted((0, -first)))
+
+        band_top, band_bottom = max(first, events_y), min(bottom, events_y + layout.grid.size[1])
+        if band_top < band_bottom:
+            # the grid and the event layers are cut to the band
+            offset: Tuple[int, int] = (0, events_y - band_top)
+            grid_image: Image.Image = self.render_grid(GridLayout((layout.grid.size[0], band_bottom - band_top),
+                                                                  [line.shifted(offset) for line in lines],
+                                                                  [text.shifted(offset) for text in grid_texts]))
+            event_image: Image.Image = self._new_image(grid_image.size)
+            self.draw_event_boxes(event_image, [box.shifted(offset) for box in boxes])
+            events: Image.Image = Image.alpha_composite(grid_image, event_image)
+            combined.paste(events, (events_x, band_top - first))
+            self._free_images([grid_image, event_image, events])
+
+        if page is not None:
+            band_top, band_bottom = max(first, legend_y), min(bottom, legend_y + page.size[1])
+            if band_top < band_bottom:
+                legend: Image.Image = self.render_legend_page(LegendPage(
+                    (page.size[0], band_bottom - band_top),
+                    [text.shifted((0, legend_y - band_top)) for text in legend_texts]))
+                combined.paste(legend, (legend_x, band_top - first))
+                self._free_images([legend])
+
+        full_image: Image.Image = self._new_image(combined.size, layout.background)
+        result: Image.Image = Image.alpha_composite(full_image, combined)
+        self._free_images([combined, full_image])
+        if first < top:
+            band: Image.Image = result.crop((0, top - first, result.size[0], result.size[1]))
+            result.close()
+            return band
+        return result
+
+    def redraw_columns(self, image: Image.Image, layout: CalendarLayout, left: int, right: int,
+                       grid_image: Optional[Image.Image] = None) -> None:
+        """
+        Draws the columns [left, right) of the grid again on the image rendered before from the layout with the same
+        grid, title and legend, e.g. after the events of one day are changed. The pixels are the same as 'render'
+        gives for the new layout. Only the event boxes crossing the columns are drawn, see 'calendar_view.watch'.
+        :param left: the left border in the grid coordinates
+        :param grid_image: the grid drawn before, it is drawn from the layout if not defined
+        """
+        left, right = max(0, left), min(layout.grid.size[0], right)
+        if left >= right:
+            return
+        allocated: List[Image.Image] = []
+        if grid_image is None:
+            grid_image = self.render_grid(layout.grid)
+            allocated.append(grid_image)
+        # the boxes are drawn at their positions on the whole layer, so the glyphs are placed the same way
+        event_image: Image.Image = self._new_image(layout.grid.size)
+        allocated.append(event_image)
+        self.draw_event_boxes(event_image, [box for box in layout.events
+                                            if self._columns_cross(self.box_columns(box), left, right)])
+        region: Tuple[int, int, int, int] = (left, 0, right, layout.grid.size[1])
+        events: Image.Image = Image.alpha_composite(grid_image.crop(region), event_image.crop(region))
+        background: Image.Image = self._new_image(events.size, layout.background)
+        allocated.append(background)
+        columns: Image.Image = Image.alpha_composite(background, events)
+        events_x, events_y = self._int_point(layout.events_origin)
+        image.paste(columns, (events_x + left, events_y))
+        self._free_images(allocated + [events, columns])
+
+    @staticmethod
+    def box_columns(box: EventBox) -> Tuple[float, float]:
+        """
+        The horizontal span of the grid which the box, its border and its texts can change.
+        """
+        left, right = box.rect[0] - box.border_width, box.rect[2] + box.border_width
+        for text in (box.title, box.notes):
+            if text is not None:
+                # the glyphs can reach out of the measured size by about the font size
+                margin: int = getattr(style, text.font).size
+                left, right = min(left, text.position[0] - margin), max(right, text.position[0] + text.size[0] + margin)
+        return left, right
+
+    def render_grid(self, grid: GridLayout) -> Image.Image:
+        image: Image.Image = self._new_image(grid.size)
+        draw = ImageDraw.Draw(image)
+        for line in grid.lines:
+            draw.line([line.start, line.end], fill=line.color, width=line.width)
+        for text in grid.texts:
+            self.draw_text(draw, text)
+        return image
+
+    def draw_event_boxes(self, image: Image.Image, boxes: List[EventBox]) -> None:
+        draw = ImageDraw.Draw(image)
+        for box in boxes:
+            self.deadline.check('draw_event_boxes')
+            self.draw_event_box(image, draw, box)
+
+    @staticmethod
+    def draw_event_box(image: Image.Image, draw: ImageDraw.ImageDraw, box: EventBox) -> None:
+        draw_rounded_rectangle(draw, [box.rect[:2], box.rect[2:]], box.radius, outline=box.border, fill=box.fill,
+                               width=box.border_width)
+        for text in (box.title, box.notes):
+            if text is not None:
+                text_masks.draw_multiline_text(image, text.position, text.text, font=getattr(style, text.font),
+                                               fill=text.color, align=text.align)
+
+    def render_legend_page(self, page: LegendPage) -> Image.Image:
+        image: Image.Image = self._new_image(page.size)
+        draw = ImageDraw.Draw(image)
+        for text in page.texts:
+            self.draw_text(draw, text)
+        return image
+
+    @staticmethod
+    def draw_text(draw: ImageDraw.ImageDraw, text: TextBlock) -> None:
+        draw.multiline_text(text.position, text.text, font=text_layout.font_for(getattr(style, text.font), text.text),
+                            fill=text.color, align=text.align)
+
+    def _new_image(self, size: Tuple[int, int], color: Color = (0, 0, 0, 0)) -> Image.Image:
+        if self.pool is not None:
+            return self.pool.acquire(size, color)
+        return Image.new("RGBA", size, color)
+
+    def _free_images(self, images: List[Image.Image]) -> None:
+        if self.pool is not None:
+            self.pool.release(*images)
+        else:
+            for image in images:
+                image.close()
+
+    @staticmethod
+    def _text_crosses(text: TextBlock, top: float, bottom: float) -> bool:
+        # the glyphs can reach out of the measured size by about the font size
+        margin: int = getattr(style, text.font).size
+        return text.position[1] - margin < bottom and text.position[1] + text.size[1] + margin >= top
+
+    @staticmethod
+    def _line_crosses(line: LineShape, top: float, bottom: float) -> bool:
+        return min(line.start[1], line.end[1]) - line.width < bottom and \
+            max(line.start[1], line.end[1]) + line.width >= top
+
+    @staticmethod
+    def _box_crosses(box: EventBox, top: float, bottom: float) -> bool:
+        if box.rect[1] - box.border_width < bottom and box.rect[3] + box.border_width >= top:
+            return True
+        return any(text is not None and PillowRenderer._text_crosses(text, top, bottom)
+                   for text in (box.title, box.notes))
+
+    @staticmethod
+    def _columns_cross(span: Tuple[float, float], left: float, right: float) -> bool:
+        return span[0] < right and span[1] >= left
+
+    @staticmethod
+    def _int_point(point: Tuple[float, float]) -> Tuple[int, int]:
+        return int(point[0]), int(point[1])
+
+
+class SvgRenderer(object):
+    """
+    Renders the layout as an SVG document. The text positions are the same, but the glyphs are rendered by the viewer,
+    so the text can look slightly different.
+    """
+    FONT_FAMILY = 'Roboto, Arial, sans-serif'
+
+    def render(self, layout: CalendarLayout) -> str:
+        width, height = layout.size
+        parts: List[str] = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}">',
+            f'<rect width="{width}" height="{height}" {self._fill(layout.background)}/>',
+        ]
+        if layout.title is not None:
+            parts.append(self._text(layout.title))
+
+        parts.append('<g transform="translate({},{})">'.format(*layout.events_origin))
+        for line in layout.grid.lines:
+            parts.append(f'<line x1="{line.start[0]}" y1="{line.start[1]}" x2="{line.end[0]}" y2="{line.end[1]}" '
+                         f'{self._stroke(line.color)} stroke-width="{line.width}"/>')
+        for text in layout.grid.texts:
+            parts.append(self._text(text))
+        for box in layout.events:
+            x1, y1, x2, y2 = box.rect
+            parts.append(f'<rect x="{x1}" y="{y1}" width="{x2 - x1}" height="{y2 - y1}" rx="{box.radius}" '
+                         f'{self._fill(box.fill)} {self._stroke(box.border)} stroke-width="{box.border_width}"/>')
+            for text in (box.title, box.notes):
+                if text is not None:
+                    parts.append(self._text(text))
+        parts.append('</g>')
+
+        if layout.legend_pages:
+            parts.append('<g transform="translate({},{})">'.format(*layout.legend_origin))
+            for text in layout.legend_pages[0].texts:
+                parts.append(self._text(text))
+            parts.append('</g>')
+        parts.append('</svg>')
+        return '\n'.join(parts)
+
+    def _text(self, text: TextBlock) -> str:
+        lines: List[str] = text.lines
+        line_height: float = text.size[1] / len(lines) if text.size[1] else getattr(style, text.font).size
+        if text.align == 'center':
+            x, anchor = text.position[0] + text.size[0] / 2, 'middle'
+        else:
+            x, anchor = text.position[0], 'start'
+        spans: str = ''.join(
+            f'<tspan x="{x}" y="{text.position[1] + i * line_height}">{escape(line)}</tspan>'
+            for i, line in enumerate(lines)
+        )
+        return f'<text font-family="{self.FONT_FAMILY}" font-size="{getattr(style, text.font).size}" ' \
+               f'text-anchor="{anchor}" dominant-baseline="text-before-edge" {self._fill(text.color)}>{spans}</text>'
+
+    @staticmethod
+    def _fill(color: Color) -> str:
+        value, opacity = SvgRenderer._color(color)
+        return f'fill="{value}" fill-opacity="{opacity}"'
+
+    @staticmethod
+    def _stroke(color: Color) -> str:
+        value, opacity = SvgRenderer._color(color)
+        return f'stroke="{value}" stroke-opacity="{opacity}"'
+
+    @staticmethod
+    def _color(color: Color) -> Tuple[str, float]:
+        if isinstance(color, str):
+            return escape(color, {'"': '&quot;'}), 1
+        opacity: float = round(color[3] / 255, 3) if len(color) > 3 else 1
+        return 'rgb({},{},{})'.format(*color[:3]), opacity
+
+
+class JsonRenderer(object):
+    """
+    Serializes the layout for the client-side drawing. 'CalendarLayout.from_dict' reads it back.
+    """
+    def render(self, layout: CalendarLayout) -> str:
+        return json.dumps(layout.to_dict(), ensure_ascii=False)
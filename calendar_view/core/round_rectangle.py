@@ -2,9 +2,10 @@ from PIL.ImageDraw import ImageDraw
 
 
 def draw_rounded_rectangle(draw: ImageDraw, xy, corner_radius, fill=None, outline=None, width=None):
-    rad = corner_radius
     upper_left = xy[0]
     bottom_right = xy[1]
+    # the corners of the narrow box, e.g. in the resource column, can't be larger than the box
+    rad = max(0, min(corner_radius, (bottom_right[0] - upper_left[0]) / 2, (bottom_right[1] - upper_left[1]) / 2))
     draw.rectangle(
         [
             (upper_left[0], upper_left[1] + rad),
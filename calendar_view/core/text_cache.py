@@ -0,0 +1,92 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import Tuple, Union
+
+from PIL import Image, ImageDraw
+from PIL.ImageFont import FreeTypeFont
+
+from calendar_view.core import text_layout
+
+
+Color = Union[str, Tuple[int, ...]]
+
+
+class TextMaskCache(object):
+    """
+    The bounded cache of the rendered text masks. The key is the font, the wrapped text, the alignment and
+    the fractional part of the position (the glyphs are rasterized with the sub-pixel offset).
+    The recurring titles and notes are rasterized once and then pasted in the text color,
+    the result is the same as ImageDraw.multiline_text.
+    """
+    PADDING = 2
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self._size: int = 0
+        self._masks: 'OrderedDict[tuple, Tuple[Image.Image, Tuple[int, int]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._measure_draw = ImageDraw.Draw(Image.new('L', (1, 1)))
+
+    def draw_multiline_text(self, image: Image.Image, xy: Tuple[float, float], text: str, font: FreeTypeFont,
+                            fill: Color, align: str = 'left') -> None:
+        fraction_x, x = math.modf(xy[0])
+        fraction_y, y = math.modf(xy[1])
+        if fraction_x < 0:
+            fraction_x, x = fraction_x + 1, x - 1
+        if fraction_y < 0:
+            fraction_y, y = fraction_y + 1, y - 1
+        offset = (fraction_x, fraction_y)
+
+        mask, origin = self.get_mask(font, text, align, offset)
+        image.paste(fill, (int(x) - origin[0], int(y) - origin[1]), mask)
+
+    def get_mask(self, font: FreeTypeFont, text: str, align: str, offset: Tuple[float, float]) \
+            -> Tuple[Image.Image, Tuple[int, int]]:
+        """
+        Returns the text mask and the position of the text origin inside the mask.
+        :param offset: the fractional part of the text position
+        """
+        font = text_layout.font_for(font, text)
+        key: tuple = (font, text, align, offset)
+        with self._lock:
+            cached = self._masks.get(key)
+            if cached is not None:
+                self._masks.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+            left, top, right, bottom = self._measure_draw.multiline_textbbox((0, 0), text, font=font, align=align)
+
+        # the text origin stays non-negative, otherwise Pillow splits the position into the other sub-pixel offset
+        origin: Tuple[int, int] = (TextMaskCache.PADDING + max(0, -math.floor(left)),
+                                   TextMaskCache.PADDING + max(0, -math.floor(top)))
+        size = (origin[0] + math.ceil(right) + TextMaskCache.PADDING,
+                origin[1] + math.ceil(bottom) + TextMaskCache.PADDING)
+        mask: Image.Image = Image.new('L', size, 0)
+        position = (origin[0] + offset[0], origin[1] + offset[1])
+        ImageDraw.Draw(mask).multiline_text(position, text, font=font, fill=255, align=align)
+
+        entry_size: int = size[0] * size[1]
+        with self._lock:
+            if key not in self._masks and entry_size <= self.max_bytes:
+                self._masks[key] = (mask, origin)
+                self._size += entry_size
+                while self._size > self.max_bytes:
+                    _, (evicted, _) = self._masks.popitem(last=False)
+                    self._size -= evicted.size[0] * evicted.size[1]
+        return mask, origin
+
+    def clear(self) -> None:
+        with self._lock:
+            self._masks.clear()
+            self._size = 0
+
+    def __repr__(self) -> str:
+        return f'TextMaskCache[entries: {len(self._masks)}, bytes: {self._size}, hits: {self.hits}, ' \
+               f'misses: {self.misses}]'
+
+
+text_masks = TextMaskCache()
@@ -0,0 +1,81 @@
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from PIL import ImageFont, features
+
+from calendar_view.config import style
+
+
+BASIC = 'basic'
+RAQM = 'raqm'
+AUTO = 'auto'
+LAYOUTS = (BASIC, RAQM, AUTO)
+
+# the scripts which need the shaping even without the combining marks
+COMPLEX_SCRIPT_RANGES = (
+    (0x0590, 0x08FF),  # Hebrew, Arabic, Syriac, Thaana, N'Ko
+    (0x0900, 0x0DFF),  # Indic
+    (0x0E00, 0x0FFF),  # Thai, Lao, Tibetan
+    (0x1000, 0x109F),  # Myanmar
+    (0x1780, 0x17FF),  # Khmer
+    (0xFB1D, 0xFDFF),  # Hebrew and Arabic presentation forms
+    (0xFE70, 0xFEFF),  # Arabic presentation forms
+)
+
+_variants: Dict[Tuple[ImageFont.FreeTypeFont, int], ImageFont.FreeTypeFont] = {}
+
+
+@lru_cache(maxsize=8192)
+def needs_shaping(text: str) -> bool:
+    """
+    True if the text has the characters which the basic layout can't place: the right-to-left and Indic scripts,
+    the combining marks and the joiners. The Latin, Cyrillic, Greek and CJK texts are laid out by the basic layout.
+    """
+    if text.isascii():
+        return False
+    for char in text:
+        code: int = ord(char)
+        if code < 0x0300:
+            continue
+        if unicodedata.combining(char) or unicodedata.category(char) in ('Mn', 'Mc', 'Cf'):
+            return True
+        if any(start <= code <= end for start, end in COMPLEX_SCRIPT_RANGES):
+            return True
+    return False
+
+
+def font_for(font: ImageFont.FreeTypeFont, text: str) -> ImageFont.FreeTypeFont:
+    """
+    The variant of the font with the layout engine for the text, see 'style.text_layout'.
+    """
+    layout: str = style.text_layout
+    if layout == AUTO:
+        layout = RAQM if needs_shaping(text) else BASIC
+    elif layout not in LAYOUTS:
+        raise ValueError(f"Wrong text layout: {layout}. Use: {', '.join(LAYOUTS)}")
+    return get_variant(font, layout)
+
+
+def get_variant(font: ImageFont.FreeTypeFont, layout: str) -> ImageFont.FreeTypeFont:
+    """
+    The same font with the layout engine: 'basic' or 'raqm'. The basic layout is used if libraqm is not installed.
+    """
+    if not isinstance(font, ImageFont.FreeTypeFont):
+        return font  # the bitmap fonts have no layout engines
+    engine: int = ImageFont.Layout.RAQM if layout == RAQM and is_raqm_available() else ImageFont.Layout.BASIC
+    if font.layout_engine == engine:
+        return font
+    variant = _variants.get((font, engine))
+    if variant is None:
+        try:
+            variant = font.font_variant(layout_engine=engine)
+        except OSError:
+            variant = font  # the font was loaded from the file which is not available anymore
+        _variants[(font, engine)] = variant
+    return variant
+
+
+@lru_cache(maxsize=1)
+def is_raqm_available() -> bool:
+    return features.check_feature('raqm')
@@ -0,0 +1,129 @@
+import os
+import sys
+from concurrent.futures import Executor, FIRST_EXCEPTION, Future, ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker, shared_memory
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+from calendar_view.core.deadline import Deadline, NO_DEADLINE
+from calendar_view.core.layout import CalendarLayout
+from calendar_view.core.pixels import BYTES_PER_PIXEL, map_buffer
+from calendar_view.core.renderers import PillowRenderer
+
+
+MIN_BAND_HEIGHT = 64  # the thinner bands cost more to schedule than to draw
+POLL_INTERVAL = 0.05  # how often the cancellation token is checked while waiting for the workers
+
+
+class ImageMemory(shared_memory.SharedMemory):
+    """
+    The shared memory under the image rendered by the tiles. The image keeps it mapped, the memory is closed
+    after the image is freed.
+    """
+    def __del__(self):
+        try:
+            self.close()
+        except BufferError:
+            pass  # the image is still alive at the interpreter exit, the mapping is freed by the OS
+
+
+def _attach_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Opens the shared memory created by the other process without registering it in the resource tracker.
+    The creating process owns the memory and unlinks it. The worker registering the memory in its own tracker
+    (not the tracker of the parent, depending on the start method) gets the leak warnings at the exit
+    and the memory is unlinked while the parent still uses it.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    # before 3.13 every opened memory is registered, the worker process runs one band at a time
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args: None
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+def render_band(layout: CalendarLayout, top: int, bottom: int, memory_name: str) -> None:
+    """
+    Renders the rows [top, bottom) of the image into the shared memory. Runs in the worker process.
+    """
+    memory = _attach_memory(memory_name)
+    try:
+        band: Image.Image = PillowRenderer().render_band(layout, top, bottom)
+        row_bytes: int = layout.size[0] * BYTES_PER_PIXEL
+        memory.buf[top * row_bytes:bottom * row_bytes] = band.tobytes()
+        band.close()
+    finally:
+        memory.close()
+
+
+class TileRenderer(object):
+    """
+    Rasterizes the layout in the row bands by the worker processes, every band is written into one shared
+    memory buffer. The returned image is the view of the buffer without copying, it is read-only:
+    drawing on it makes a copy. The layout is computed before in the calling process.
+    """
+    def __init__(self, executor: Optional[Executor] = None, bands: Optional[int] = None):
+        """
+        :param executor: the process pool, the pool with a worker per CPU core is created if not defined
+        :param bands: the number of the bands, the number of the CPU cores by default
+        """
+        self._owns_executor: bool = executor is None
+        self.executor: Executor = executor or ProcessPoolExecutor()
+        self.bands: int = bands or os.cpu_count() or 1
+
+    def get_bands(self, height: int) -> List[Tuple[int, int]]:
+        """
+        The row ranges [top, bottom) of the bands of the same height.
+        """
+        count: int = max(1, min(self.bands, height // MIN_BAND_HEIGHT))
+        return [(height * i // count, height * (i + 1) // count) for i in range(count)]
+
+    def render(self, layout: CalendarLayout, deadline: Optional[Deadline] = None) -> Image.Image:
+        """
+        :param deadline: checked while waiting for the workers, the pending bands are cancelled when it is exceeded
+        """
+        deadline = deadline or NO_DEADLINE
+        width, height = layout.size
+        memory = ImageMemory(create=True, size=max(1, width * height * BYTES_PER_PIXEL))
+        futures: List[Future] = []
+        try:
+            futures = [self.executor.submit(render_band, layout, top, bottom, memory.name)
+                       for top, bottom in self.get_bands(height)]
+            self.__wait(futures, deadline)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            memory.close()
+            raise
+        finally:
+            # the name is not needed anymore, the mapping stays until it is closed
+            memory.unlink()
+        return map_buffer(memory.buf, (width, height), memory)
+
+    @staticmethod
+    def __wait(futures: List[Future], deadline: Deadline) -> None:
+        pending = futures
+        while pending:
+            deadline.check('render_tiles')
+            remaining: Optional[float] = deadline.remaining()
+            timeout: float = POLL_INTERVAL if remaining is None else min(POLL_INTERVAL, remaining)
+            done, pending = wait(pending, timeout, return_when=FIRST_EXCEPTION)
+            for future in done:
+                future.result()  # the error of the worker
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self.executor.shutdown()
+
+    def __enter__(self) -> 'TileRenderer':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'TileRenderer[bands: {self.bands}]'
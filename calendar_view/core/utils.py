@@ -1,7 +1,10 @@
+from functools import lru_cache
 from typing import Union, List, Tuple
 
 from PIL import ImageFont, ImageDraw, Image
 
+from calendar_view.core import text_layout
+
 
 class StringUtils:
     @staticmethod
@@ -42,6 +45,7 @@ class StringUtils:
 class FontUtils:
     @staticmethod
     def get_text_size(font: ImageFont, text: str) -> Tuple[int, int]:
+        font = text_layout.font_for(font, text)
         if hasattr(font, 'getsize'):
             return font.getsize(text)
 
@@ -51,10 +55,18 @@ class FontUtils:
 
     @staticmethod
     def get_multiline_text_size(font: ImageFont, text: str) -> Tuple[int, int]:
-        if hasattr(font, 'getsize_multiline'):
-            return font.getsize_multiline(text)
+        """
+        The sizes are cached: the same titles, legend lines and wrapping attempts are measured once.
+        """
+        return _get_multiline_text_size(text_layout.font_for(font, text), text)
 
-        dummy_draw: ImageDraw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
-        # More information: https://pillow.readthedocs.io/en/stable/deprecations.html
-        left, top, right, bottom = dummy_draw.multiline_textbbox((0, 0), text, font=font)
-        return right - left, bottom - top
+
+@lru_cache(maxsize=8192)
+def _get_multiline_text_size(font: ImageFont, text: str) -> Tuple[int, int]:
+    if hasattr(font, 'getsize_multiline'):
+        return font.getsize_multiline(text)
+
+    dummy_draw: ImageDraw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    # More information: https://pillow.readthedocs.io/en/stable/deprecations.html
+    left, top, right, bottom = dummy_draw.multiline_textbbox((0, 0), text, font=font)
+    return right - left, bottom - top
@@ -0,0 +1,86 @@
+import logging
+from datetime import date, datetime
+from typing import BinaryIO, List, Optional, Union
+
+from PIL import Image, ImageDraw
+
+from calendar_view.calendar import Calendar
+from calendar_view.config import style
+from calendar_view.core.event import Event
+from calendar_view.core.layout import CalendarLayout, EventBox
+from calendar_view.core.renderers import PillowRenderer
+from calendar_view.core.round_rectangle import draw_rounded_rectangle
+
+
+logger = logging.getLogger(__name__)
+
+
+class LiveCalendar(object):
+    """
+    The calendar for the live dashboards. The base image is rendered once and kept in memory,
+    every 'render' copies it and draws only the current time line and the border of the current events.
+    Call 'refresh' after the events are changed.
+    """
+    def __init__(self, calendar: Calendar):
+        self.calendar: Calendar = calendar
+        self.base_image: Optional[Image.Image] = None
+        self._layout: Optional[CalendarLayout] = None
+
+    def refresh(self) -> None:
+        """
+        Renders the base image of the calendar.
+        """
+        if self.calendar.grid.get_image() is None:
+            self.calendar.draw_grid()
+        self._layout = self.calendar.compute_layout()
+        self.base_image = PillowRenderer().render(self._layout, grid_image=self.calendar.grid.get_image())
+
+    def render(self, now: Optional[datetime] = None) -> Image.Image:
+        """
+        Returns the copy of the base image with the overlays for the moment.
+        :param now: the current local time by default
+        """
+        if self.base_image is None:
+            self.refresh()
+        now = now or datetime.now()
+        image: Image.Image = self.base_image.copy()
+
+        date_from, date_to = self.calendar.config.get_date_range()
+        hour_from, hour_to = self.calendar.grid.geometry.get_hours_range()
+        if not (date_from <= now.date() <= date_to and hour_from <= now.hour < hour_to):
+            return image  # the moment is not visible
+
+        draw = ImageDraw.Draw(image)
+        origin = self._layout.events_origin
+        for box in self.current_event_boxes(now):
+            x1, y1, x2, y2 = box.rect
+            draw_rounded_rectangle(draw, [(x1 + origin[0], y1 + origin[1]), (x2 + origin[0], y2 + origin[1])],
+                                   box.radius, outline=style.now_event_border, width=style.now_event_border_width)
+
+        x = self.calendar.events.get_day_x((now.date() - date_from).days)
+        y: float = self.calendar.events.get_time_y(now.time()) + origin[1]
+        draw.line([(x[0] + origin[0], y), (x[1] + origin[0], y)], fill=style.now_line_color, width=style.now_line_width)
+        return image
+
+    def current_event_boxes(self, now: datetime) -> List[EventBox]:
+        """
+        The laid out boxes of the events which are going on at the moment.
+        """
+        config = self.calendar.config
+        day: date = now.date()
+        current: List[EventBox] = []
+        # the boxes are laid out in the order of the events
+        for event, box in zip(self.calendar.events.events, self._layout.events):
+            if event.get_start_date(config) == day and event.start_time <= now.time() \
+                    and (now.time() < event.end_time or self.__ends_at_midnight(event)):
+                current.append(box)
+        return current
+
+    def save(self, filename: Union[str, BinaryIO], now: Optional[datetime] = None) -> None:
+        self.render(now).save(filename, "PNG")
+
+    def __ends_at_midnight(self, event: Event) -> bool:
+        return event.get_end_date(self.calendar.config) > event.get_start_date(self.calendar.config)
+
+    def __repr__(self) -> str:
+        return f'LiveCalendar[events: {len(self.calendar.events.events)}, rendered: {self.base_image is not None}]'
@@ -0,0 +1,116 @@
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from io import BytesIO
+from typing import BinaryIO, List, Optional, Union
+
+from PIL import Image
+
+from calendar_view.calendar import Calendar
+from calendar_view.core.deadline import Deadline, NO_DEADLINE
+from calendar_view.core.image_pool import ImagePool
+
+
+def encode_png(image: Image.Image, filename: Optional[Union[str, BinaryIO]] = None) -> Optional[bytes]:
+    """
+    Writes the PNG image. Returns the PNG bytes if the file is not defined.
+    """
+    if filename is not None:
+        image.save(filename, "PNG")
+        return None
+    buffer = BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class EncodePipeline(object):
+    """
+    Encodes the rendered calendars in the background while the caller draws the next one.
+    'submit' draws the calendar in the calling thread and hands the image over to the encoder, so a batch takes
+    about max(draw, encode) per calendar instead of their sum. At most 'max_in_flight' images wait for the encoder,
+    'submit' blocks until one of them is written.
+    Pillow releases the GIL while compressing, so the default thread encoder runs in parallel with drawing.
+    """
+    def __init__(self, max_in_flight: int = 2, executor: Optional[Executor] = None):
+        """
+        :param max_in_flight: the maximal number of the images drawn but not encoded yet
+        :param executor: the encoder threads or processes, one thread by default. The process pool gets the copy
+            of the image, the files have to be given by name in this case.
+        """
+        if max_in_flight < 1:
+            raise ValueError(f'max_in_flight must be positive: {max_in_flight}')
+        self.max_in_flight: int = max_in_flight
+        self._owns_executor: bool = executor is None
+        self.executor: Executor = executor or ThreadPoolExecutor(1, thread_name_prefix='calendar-encoder')
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+
+    def submit(self, calendar: Calendar, filename: Optional[Union[str, BinaryIO]] = None,
+               deadline: Optional[Deadline] = None) -> Future:
+        """
+        Draws the calendar and queues its image for encoding. The image is taken from the calendar:
+        'full_image' is empty after the call, so the calendar can be reset and filled right away.
+        :param filename: the file name or the binary file object, the future gets the PNG bytes if not defined
+        :param deadline: the deadline of drawing, see 'Calendar.save'
+        :return: the future of 'encode_png'
+        """
+        calendar._build_image(deadline)
+        (deadline or NO_DEADLINE).check('encode')
+        image: Image.Image = calendar.full_image
+        calendar.full_image = None
+        return self.submit_image(image, filename, calendar.pool)
+
+    def submit_image(self, image: Image.Image, filename: Optional[Union[str, BinaryIO]] = None,
+                     pool: Optional[ImagePool] = None) -> Future:
+        """
+        Queues the image for encoding, it must not be changed until the future is done.
+        :param pool: the image is returned to the pool after encoding
+        """
+        self._slots.acquire()
+        try:
+            future: Future = self.executor.submit(encode_png, image, filename)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._futures.append(future)
+        future.add_done_callback(lambda _: self.__done(image, pool))
+        return future
+
+    def in_flight(self) -> int:
+        """
+        The number of the images waiting for the encoder or being encoded.
+        """
+        with self._lock:
+            return sum(1 for f in self._futures if not f.done())
+
+    def wait(self) -> None:
+        """
+        Waits until all submitted images are written. Raises the first encoding error.
+        """
+        with self._lock:
+            futures: List[Future] = list(self._futures)
+            self._futures = []
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        try:
+            self.wait()
+        finally:
+            if self._owns_executor:
+                self.executor.shutdown()
+
+    def __done(self, image: Image.Image, pool: Optional[ImagePool]) -> None:
+        self._slots.release()
+        if pool is not None:
+            pool.release(image)
+
+    def __enter__(self) -> 'EncodePipeline':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'EncodePipeline[max_in_flight: {self.max_in_flight}, in_flight: {self.in_flight()}]'
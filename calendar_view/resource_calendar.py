@@ -0,0 +1,256 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple, Union, BinaryIO
+
+from calendar_view.calendar import Calendar
+from calendar_view.config import style
+from calendar_view.core.calendar_events import CalendarEvents
+from calendar_view.core.calendar_grid import CalendarGrid
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.event import Event
+from calendar_view.core.layout import GridLayout, LineShape, TextBlock
+from calendar_view.core.utils import FontUtils
+
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceCalendar(object):
+    """
+    The calendars of several resources (rooms, people) with the same config. The events are stored once
+    and indexed by the resource key. The grid is drawn once and shared by the calendars of all resources.
+    """
+    def __init__(self, config: CalendarConfig):
+        self.config: CalendarConfig = config
+        self.grid: CalendarGrid = CalendarGrid(config)
+        self._events: Dict[str, CalendarEvents] = {}
+
+    @property
+    def resources(self) -> List[str]:
+        """
+        The resource keys in the order they were added.
+        """
+        return list(self._events)
+
+    def add_events(self, resource: str, events: Iterable[Event]) -> None:
+        resource_events: CalendarEvents = self.__get_resource_events(resource)
+        for e in events:
+            resource_events.add_event(e)
+
+    def add_event(self, resource: str, *events: Event, **kwargs) -> None:
+        """
+        Adds the event(s) of the resource.
+        :param resource: the resource key, e.g. the name of the room
+        :param events: the event objects
+        :param kwargs: the input arguments for the Event constructor
+        """
+        resource_events: CalendarEvents = self.__get_resource_events(resource)
+        for event in events:
+            resource_events.add_event(event)
+        if kwargs:
+            resource_events.add_event(Event(**kwargs))
+
+    def get_events(self, resource: str) -> List[Event]:
+        """
+        The events of the resource, split to the days.
+        """
+        resource_events: Optional[CalendarEvents] = self._events.get(resource)
+        return resource_events.events if resource_events else []
+
+    def calendar(self, resource: str) -> Calendar:
+        """
+        Returns the calendar of the resource. It shares the grid and the events with this object,
+        so it can't be reset or destroyed, see 'ResourceView'.
+        """
+        calendar = ResourceView(self.config)
+        calendar.grid = self.__get_grid()
+        calendar.events = self.__get_resource_events(resource)
+        return calendar
+
+    def save(self, resource: str, filename: Union[str, BinaryIO]) -> None:
+        self.calendar(resource).save(filename)
+
+    def save_all(self, filename_pattern: str) -> List[str]:
+        """
+        Renders the calendar of every resource.
+        :param filename_pattern: the file name with the resource placeholder, e.g. 'room-{}.png'
+        :return: the written file names
+        """
+        filenames: List[str] = []
+        for resource in self._events:
+            filename: str = filename_pattern.format(resource)
+            self.save(resource, filename)
+            filenames.append(filename)
+        return filenames
+
+    def side_by_side(self, resources: Optional[List[str]] = None) -> Calendar:
+        """
+        Returns the calendar with the resources side by side within each day.
+        Every day column is split into the equal columns of the resources, their names are written under the grid.
+        :param resources: the resources to show, all of them by default
+        """
+        resources = resources if resources is not None else self.resources
+        if not resources:
+            raise ValueError("At least one resource is required for the side-by-side view.")
+        calendar = Calendar(self.config)
+        calendar.grid = ResourceGrid(self.config, resources)
+        calendar.grid.draw_grid()
+        calendar.events = ResourceColumnEvents(self.config, [self.__get_resource_events(r) for r in resources])
+        return calendar
+
+    def save_side_by_side(self, filename: Union[str, BinaryIO], resources: Optional[List[str]] = None) -> None:
+        self.side_by_side(resources).save(filename)
+
+    def __get_grid(self) -> CalendarGrid:
+        if self.grid.get_image() is None:
+            self.grid.draw_grid()
+        return self.grid
+
+    def __get_resource_events(self, resource: str) -> CalendarEvents:
+        resource_events: Optional[CalendarEvents] = self._events.get(resource)
+        if resource_events is None:
+            resource_events = self._events[resource] = CalendarEvents(self.config)
+        return resource_events
+
+    def __repr__(self) -> str:
+        return f'ResourceCalendar[resources: {len(self._events)}, ' \
+               f'events: {sum(len(e.events) for e in self._events.values())}]'
+
+
+class ResourceView(Calendar):
+    """
+    The calendar of one resource over the grid and the events stored in 'ResourceCalendar'.
+    'reset' and 'destroy' would clear the shared state, they are not allowed.
+    """
+    def reset(self) -> None:
+        raise RuntimeError('The resource calendar shares the grid and the events, it can\'t be reset')
+
+    def destroy(self):
+        raise RuntimeError('The resource calendar shares the grid and the events, it can\'t be destroyed')
+
+
+class ResourceGrid(CalendarGrid):
+    """
+    The grid with every day split into the columns of the resources. The names of the resources are written under
+    the columns, the long names are wrapped to the column width and the grid grows down to fit them. The days are
+    widened if a column is narrower than a character of the names, the collapsed days have no names.
+    """
+    LABEL_MARGIN = 4  # the space between the names of the neighbour columns and under the names
+
+    def __init__(self, config: CalendarConfig, resources: List[str]):
+        super().__init__(config)
+        self.resources: List[str] = resources
+        self._labels: Dict[int, List[Tuple[str, Tuple[int, int]]]] = {}  # the column width -> the wrapped names
+        self.min_column_width: int = 2 * ResourceGrid.LABEL_MARGIN + max(
+            (FontUtils.get_text_size(style.hour_number_font, char)[0] for char in set(''.join(resources)) if
+             not char.isspace()), default=0)
+        self.geometry.min_day_width = self.min_column_width * len(resources)
+
+    def get_layout_size(self) -> Tuple[int, int]:
+        width, height = super().get_layout_size()
+        return width, height + self.__get_label_height() - style.padding_vertical
+
+    def layout_grid(self, labels: bool = True) -> GridLayout:
+        grid: GridLayout = super().layout_grid(labels)
+        day_count: int = (self.config.get_date_range()[1] - self.config.get_date_range()[0]).days + 1
+        hour_from, hour_to = self.geometry.get_hours_range()
+        top: int = style.padding_vertical + style.hour_height
+        bottom: int = top + (hour_to - hour_from) * style.hour_height
+        label_height: int = self.__get_label_height()
+
+        for day in range(day_count):
+            x_day, x_day_end = self.geometry.get_day_x(day)
+            column_width: float = (x_day_end - x_day) / len(self.resources)
+            for i in range(1, len(self.resources)):
+                x: float = x_day + i * column_width
+                grid.lines.append(LineShape((x, top), (x, bottom), style.line_hour_color, style.line_hour_width))
+            if not labels or column_width < self.min_column_width:
+                continue
+            for i, (label, text_size) in enumerate(self.__get_labels(column_width)):
+                x: float = x_day + (i + 0.5) * column_width - text_size[0] / 2
+                # the wrapped names start at the top, the short ones are centered in the padding as before
+                y: float = bottom + ResourceGrid.LABEL_MARGIN if label_height > style.padding_vertical \
+                    else bottom + (style.padding_vertical - text_size[1]) / 2
+                grid.texts.append(TextBlock(label, (x, y), text_size, 'hour_number_font', style.hour_number_color,
+                                            align='center'))
+        return grid
+
+    def __get_label_height(self) -> int:
+        """
+        The height of the space under the table: 'style.padding_vertical' or more for the wrapped names.
+        """
+        date_from, date_to = self.config.get_date_range()
+        heights: List[int] = [style.padding_vertical]
+        for day in range((date_to - date_from).days + 1):
+            x_day, x_day_end = self.geometry.get_day_x(day)
+            if (x_day_end - x_day) / len(self.resources) < self.min_column_width:
+                continue
+            heights.extend(size[1] + 2 * ResourceGrid.LABEL_MARGIN
+                           for _, size in self.__get_labels((x_day_end - x_day) / len(self.resources)))
+        return max(heights)
+
+    def __get_labels(self, column_width: float) -> List[Tuple[str, Tuple[int, int]]]:
+        key: int = int(column_width)
+        labels: Optional[List[Tuple[str, Tuple[int, int]]]] = self._labels.get(key)
+        if labels is None:
+            width: int = key - ResourceGrid.LABEL_MARGIN
+            labels = self._labels[key] = [self.__wrap_label(resource, width) for resource in self.resources]
+        return labels
+
+    @staticmethod
+    def __wrap_label(resource: str, width: int) -> Tuple[str, Tuple[int, int]]:
+        """
+        Splits the name into the lines by the words and the long words by the characters to fit the width.
+        """
+        font = style.hour_number_font
+        text_size: Tuple[int, int] = FontUtils.get_text_size(font, resource)
+        if text_size[0] <= width:
+            return resource, text_size
+
+        lines: List[str] = []
+        for word in resource.split():
+            line: str = f'{lines[-1]} {word}' if lines else word
+            if lines and FontUtils.get_text_size(font, line)[0] <= width:
+                lines[-1] = line
+                continue
+            lines.append('')
+            for char in word:
+                if lines[-1] and FontUtils.get_text_size(font, lines[-1] + char)[0] > width:
+                    lines.append('')
+                lines[-1] += char
+        label: str = '\n'.join(lines)
+        return label, FontUtils.get_multiline_text_size(font, label)
+
+
+class ResourceColumnEvents(CalendarEvents):
+    """
+    The events of several resources in one calendar. The events of every resource are placed in its own column
+    of the day and cascaded inside it. The events are the copies, the events of the resources are not changed.
+    """
+    def __init__(self, config: CalendarConfig, resources: List[CalendarEvents]):
+        super().__init__(config)
+        self.columns: List[List[Event]] = [[r.make_segment(e) for e in r.events] for r in resources]
+        self.events = [e for column in self.columns for e in column]
+
+    def merge_adjacent_events(self) -> None:
+        for i, column in enumerate(self.columns):
+            self.deadline.check('merge_adjacent_events')
+            column_events: CalendarEvents = self.__column_events(column)
+            column_events.merge_adjacent_events()
+            self.columns[i] = column_events.events
+        self.events = [e for column in self.columns for e in column]
+
+    def group_cascade_events(self) -> None:
+        for index, column in enumerate(self.columns):
+            self.deadline.check('group_cascade_events')
+            for e in column:
+                e.cascade_total, e.cascade_index, e.cascade_group = 1, 1, 0
+            self.__column_events(column).group_cascade_events()
+            for e in column:
+                e.cascade_index += index * e.cascade_total
+                e.cascade_total *= len(self.columns)
+
+    def __column_events(self, column: List[Event]) -> CalendarEvents:
+        column_events = CalendarEvents(self.config)
+        column_events.events = column
+        column_events.deadline = self.deadline
+        return column_events
@@ -0,0 +1,234 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+from calendar_view import spec as job_spec
+from calendar_view.calendar import render_png
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.deadline import RenderTimeoutError
+from calendar_view.core.estimate import AdmissionPolicy, JobTooLargeError
+from calendar_view.core.event import Event
+from calendar_view.core.fingerprint import render_fingerprint
+from calendar_view.core.render_cache import RenderCache
+
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_SIZE = 4 * 1024 * 1024
+
+
+class ServiceOverloaded(Exception):
+    """
+    All workers are busy and the queue is full.
+    """
+
+
+class RenderService(object):
+    """
+    Renders the calendars on the bounded worker pool. At most 'workers + max_queue' renders are accepted at once,
+    the next requests are rejected instead of waiting in an unbounded queue.
+    """
+    def __init__(self, workers: int = 2, max_queue: int = 8, executor: str = 'thread', cache_size: int = 64,
+                 disk_cache: Optional[RenderCache] = None, render_timeout: Optional[float] = None,
+                 admission: Optional[AdmissionPolicy] = None):
+        """
+        :param render_timeout: the time limit of one render in seconds, the render is stopped when it is exceeded
+        :param admission: the budget of one render, the jobs over it are rejected or rendered as the preview
+        """
+        if executor not in ('thread', 'process'):
+            raise ValueError(f"Wrong executor type: {executor}. Use: 'thread' or 'process'")
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor_type = executor
+        self._executor: Executor = ProcessPoolExecutor(max_workers=workers) if executor == 'process' \
+            else ThreadPoolExecutor(max_workers=workers, thread_name_prefix='calendar-render')
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._in_flight: int = 0
+        self._lock = threading.Lock()
+        self._cache_size = cache_size
+        self._cache: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._disk_cache = disk_cache
+        self.render_timeout: Optional[float] = render_timeout
+        self.admission: Optional[AdmissionPolicy] = admission
+
+    @staticmethod
+    def parse(body: bytes) -> Tuple[CalendarConfig, List[Event], str]:
+        """
+        Parses the job specification and computes its ETag. Nothing is drawn here.
+        """
+        try:
+            spec: dict = json.loads(body.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise job_spec.SpecError(f'Wrong JSON: {e}')
+        if not isinstance(spec, dict):
+            raise job_spec.SpecError('The job specification has to be an object')
+        config: CalendarConfig = job_spec.build_config(spec.get('config') or {})
+        config.validate()
+        events: List[Event] = [job_spec.build_event(e) for e in spec.get('events') or []]
+        return config, events, '"{}"'.format(render_fingerprint(config, events))
+
+    def render(self, config: CalendarConfig, events: List[Event], etag: str) -> bytes:
+        with self._lock:
+            cached: Optional[bytes] = self._cache.get(etag)
+            if cached is not None:
+                self._cache.move_to_end(etag)
+                return cached
+
+        if not self._slots.acquire(blocking=False):
+            raise ServiceOverloaded()
+        try:
+            with self._lock:
+                self._in_flight += 1
+            content: bytes = self._executor.submit(render_png, config, events, self._disk_cache,
+                                                  self.render_timeout, self.admission).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+        if self._cache_size > 0:
+            with self._lock:
+                self._cache[etag] = content
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return content
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                'executor': self.executor_type,
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'render_timeout': self.render_timeout,
+                'in_flight': self._in_flight,
+                'cached': len(self._cache),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /render - the body is the JSON job specification {"config": {...}, "events": [...]}.
+        Responds with the PNG image and its ETag. 'If-None-Match' with the same ETag is answered by 304.
+    GET /health - the state of the worker pool.
+    """
+    server_version = 'calendar-view'
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def service(self) -> RenderService:
+        return self.server.service
+
+    def do_GET(self) -> None:
+        if self.path != '/health':
+            self._send_error(HTTPStatus.NOT_FOUND, 'Not found')
+            return
+        self._send(HTTPStatus.OK, json.dumps(self.service.status()).encode('utf-8'), 'application/json')
+
+    def do_POST(self) -> None:
+        if self.path != '/render':
+            self._send_error(HTTPStatus.NOT_FOUND, 'Not found')
+            return
+        try:
+            length: int = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_error(HTTPStatus.BAD_REQUEST, 'Wrong Content-Length', {'Connection': 'close'})
+            return
+        if length > MAX_BODY_SIZE:
+            # the body is not read, so the connection can't be reused
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, 'The request body is too large',
+                             {'Connection': 'close'})
+            return
+        body: bytes = self.rfile.read(length)
+
+        try:
+            config, events, etag = self.service.parse(body)
+        except Exception as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        if_none_match: List[str] = self._if_none_match()
+        if '*' in if_none_match or etag in if_none_match:
+            self._send(HTTPStatus.NOT_MODIFIED, b'', None, etag)
+            return
+
+        try:
+            content: bytes = self.service.render(config, events, etag)
+        except ServiceOverloaded:
+            self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, 'All workers are busy', {'Retry-After': '1'})
+            return
+        except JobTooLargeError as e:
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, str(e))
+            return
+        except RenderTimeoutError as e:
+            logger.warning('Rendering stopped: %s', e)
+            self._send_error(HTTPStatus.GATEWAY_TIMEOUT, str(e))
+            return
+        except Exception as e:
+            logger.exception('Rendering failed')
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+            return
+        self._send(HTTPStatus.OK, content, 'image/png', etag)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.info('%s - %s', self.address_string(), format % args)
+
+    def _if_none_match(self) -> List[str]:
+        """
+        The entity tags of the header. 'If-None-Match' uses the weak comparison, so the 'W/' prefix is dropped.
+        """
+        header: str = self.headers.get('If-None-Match') or ''
+        tags: List[str] = [tag.strip() for tag in header.split(',') if tag.strip()]
+        return [tag[2:] if tag.startswith('W/') else tag for tag in tags]
+
+    def _send_error(self, status: HTTPStatus, message: str, headers: Optional[dict] = None) -> None:
+        body: bytes = json.dumps({'error': message}).encode('utf-8')
+        self._send(status, body, 'application/json', headers=headers)
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: Optional[str], etag: Optional[str] = None,
+              headers: Optional[dict] = None) -> None:
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+class RenderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: RenderService):
+        super().__init__(address, RenderRequestHandler)
+        self.service = service
+
+
+def serve(host: str = '127.0.0.1', port: int = 8080, workers: int = 2, max_queue: int = 8,
+          executor: str = 'thread', cache_size: int = 64, disk_cache: Optional[RenderCache] = None,
+          render_timeout: Optional[float] = None, admission: Optional[AdmissionPolicy] = None) -> None:
+    service = RenderService(workers=workers, max_queue=max_queue, executor=executor, cache_size=cache_size,
+                            disk_cache=disk_cache, render_timeout=render_timeout, admission=admission)
+    server = RenderServer((host, port), service)
+    print(f'Serving on http://{host}:{server.server_port} with {workers} {executor} worker(s)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
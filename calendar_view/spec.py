@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+from typing import List, Optional, Tuple, Union
+
+from calendar_view.calendar import Calendar
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.event import Event, EventStyle, EventStyles
+from calendar_view.core.recurrence import RecurrenceRule
+
+
+logger = logging.getLogger(__name__)
+
+CONFIG_KEYS = ('lang', 'title', 'dates', 'days', 'hours', 'mode', 'show_date', 'show_year', 'legend',
+               'title_vertical_align', 'deduplicate', 'merge_adjacent', 'fit_hours', 'collapse_empty_days')
+EVENT_KEYS = ('title', 'notes', 'day_of_week', 'day', 'start', 'end')
+RECURRENCE_KEYS = ('frequency', 'interval', 'days_of_week', 'count', 'until', 'exceptions')
+
+
+class SpecError(ValueError):
+    """
+    The job specification can't be read or has a wrong structure.
+    """
+
+
+def load_spec_file(path: str) -> List[dict]:
+    """
+    Reads the job specification(s) from the JSON or YAML file.
+    The file contains either one job object or a list of jobs. Every job has the structure:
+    {
+        "output": "yoga_class.png",
+        "config": {"lang": "en", "title": "Yoga Class Schedule", "dates": "Mo - Su", ...},
+        "events": [{"day_of_week": 0, "start": "11:00", "end": "12:30", "title": "Ashtanga", "style": "gray"}, ...]
+    }
+    The events can be kept in a separate file: "events": "yoga_events.json", relative to the job file.
+    The events are read into the job and the path of the file is kept in 'events_file'.
+    """
+    content = _load_file(path)
+    jobs: list = content if isinstance(content, list) else [content]
+    for job in jobs:
+        if not isinstance(job, dict):
+            raise SpecError(f"The job has to be an object, but {type(job).__name__} is found in: {path}")
+        if isinstance(job.get('events'), str):
+            events_file: str = os.path.join(os.path.dirname(path), job['events'])
+            events = _load_file(events_file)
+            if not isinstance(events, list):
+                raise SpecError(f"The events file has to contain a list of events: {events_file}")
+            job['events'] = events
+            job['events_file'] = events_file
+    return jobs
+
+
+def spec_files(path: str, jobs: List[dict]) -> List[str]:
+    """
+    The job file and the events files used by its jobs.
+    """
+    files: List[str] = [path]
+    for job in jobs:
+        if job.get('events_file') and job['events_file'] not in files:
+            files.append(job['events_file'])
+    return files
+
+
+def _load_file(path: str):
+    with open(path, encoding='utf-8') as f:
+        if path.lower().endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise SpecError(f"PyYAML is required to read the YAML file: {path}")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def build_config(spec: dict) -> CalendarConfig:
+    unknown = set(spec) - set(CONFIG_KEYS)
+    if unknown:
+        raise SpecError(f"Unknown config parameters: {', '.join(sorted(unknown))}")
+    return CalendarConfig(**spec)
+
+
+def build_event_style(spec: Union[str, dict, None]) -> EventStyle:
+    """
+    The style is either the name of the predefined style from EventStyles (case-insensitive)
+    or an object with the 'event_border' and 'event_fill' colors as [r, g, b, a].
+    """
+    if spec is None:
+        return EventStyle()
+    if isinstance(spec, str):
+        predefined = getattr(EventStyles, spec.upper(), None)
+        if not isinstance(predefined, EventStyle):
+            raise SpecError(f"Unknown event style: {spec}")
+        return predefined
+    if isinstance(spec, dict):
+        border = spec.get('event_border')
+        fill = spec.get('event_fill')
+        return EventStyle(event_border=tuple(border) if border else None, event_fill=tuple(fill) if fill else None)
+    raise SpecError(f"Wrong event style: {spec}")
+
+
+def build_event(spec: dict) -> Event:
+    unknown = set(spec) - set(EVENT_KEYS) - {'style', 'recurrence'}
+    if unknown:
+        raise SpecError(f"Unknown event parameters: {', '.join(sorted(unknown))}")
+    kwargs = {key: spec[key] for key in EVENT_KEYS if key in spec}
+    return Event(style=build_event_style(spec.get('style')), recurrence=build_recurrence(spec.get('recurrence')),
+                 **kwargs)
+
+
+def build_recurrence(spec: Optional[dict]) -> Optional[RecurrenceRule]:
+    """
+    The recurrence rule, e.g. {"frequency": "weekly", "days_of_week": [1, 3], "until": "2024-06-30"}.
+    """
+    if spec is None:
+        return None
+    if not isinstance(spec, dict):
+        raise SpecError(f"The recurrence has to be an object: {spec}")
+    unknown = set(spec) - set(RECURRENCE_KEYS)
+    if unknown:
+        raise SpecError(f"Unknown recurrence parameters: {', '.join(sorted(unknown))}")
+    return RecurrenceRule(**spec)
+
+
+def build_job(spec: dict) -> Tuple[CalendarConfig, List[Event]]:
+    """
+    The config and the events of the job specification, without building the calendar.
+    """
+    return build_config(spec.get('config') or {}), [build_event(e) for e in spec.get('events') or []]
+
+
+def build_calendar(spec: dict) -> Calendar:
+    """
+    Builds the calendar with all events from the job specification.
+    """
+    config, events = build_job(spec)
+    calendar = Calendar.build(config)
+    calendar.add_events(events)
+    return calendar
+
+
+def job_weight(spec: dict) -> int:
+    """
+    The estimated work of the job, see 'Calendar.estimate', used to schedule the largest jobs first.
+    Nothing is drawn. The job with the wrong specification gets 0, it fails when it's rendered and is reported
+    as the failed job like any other error of 'cli.render_job'.
+    """
+    try:
+        calendar = Calendar(build_config(spec.get('config') or {}))
+        calendar.add_events([build_event(e) for e in spec.get('events') or []])
+        return calendar.estimate().work
+    except Exception:
+        return 0
+
+
+def output_name(spec: dict, spec_path: str, index: int, total: int) -> str:
+    """
+    The image file of the job relative to the output directory.
+    The 'output' of the job can't be an absolute path or lead out of the output directory.
+    """
+    if spec.get('output'):
+        output: str = os.path.normpath(spec['output'])
+        if os.path.isabs(output) or output == os.pardir or output.startswith(os.pardir + os.sep):
+            raise SpecError(f"The output has to be a relative path inside the output directory: {spec['output']}")
+        return output
+    stem: str = os.path.splitext(os.path.basename(spec_path))[0]
+    return f'{stem}.png' if total == 1 else f'{stem}-{index + 1}.png'
@@ -0,0 +1,251 @@
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from calendar_view import spec as job_spec
+from calendar_view.calendar import Calendar
+from calendar_view.core.image_pool import ImagePool
+from calendar_view.core.layout import CalendarLayout
+from calendar_view.core.renderers import PillowRenderer
+
+
+logger = logging.getLogger(__name__)
+
+Stamp = Optional[Tuple[int, int]]
+
+
+def save_atomic(image: Image.Image, filename: str) -> None:
+    """
+    Writes the PNG image to the temporary file next to the target and renames it, so the readers of the file
+    never see the partially written image.
+    """
+    directory: str = os.path.dirname(os.path.abspath(filename))
+    fd, temp = tempfile.mkstemp(prefix=f'.{os.path.basename(filename)}.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            image.save(f, 'PNG')
+        os.chmod(temp, 0o644)
+        os.replace(temp, filename)
+    except BaseException:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        raise
+
+
+class WatchedCalendar(object):
+    """
+    One calendar of the watched job specification. The calendar with its grid, the last layout and the last image
+    are kept between the updates, so the update renders again only the day columns with the changed event boxes.
+    The whole image is rendered if the config, the title, the grid or the legend is changed.
+    """
+    def __init__(self, output: str, pool: Optional[ImagePool] = None):
+        """
+        :param output: the image file
+        :param pool: the pool of the image buffers, the shared 'image_pool' by default
+        """
+        self.output: str = output
+        self.pool: Optional[ImagePool] = pool
+        self.calendar: Optional[Calendar] = None
+        self.image: Optional[Image.Image] = None
+        self.layout: Optional[CalendarLayout] = None
+        self._config: Optional[str] = None
+        self._events: Counter = Counter()
+        self._fitted_grid: Optional[Image.Image] = None
+
+    def update(self, spec: dict) -> Optional[List[int]]:
+        """
+        Applies the job specification and renders the changed parts of the image.
+        Returns the numbers of the days rendered again, None if the whole image is rendered
+        or an empty list if the image is not changed.
+        """
+        config: str = json.dumps(spec.get('config') or {}, sort_keys=True)
+        events: Counter = Counter(json.dumps(e, sort_keys=True) for e in spec.get('events') or [])
+        if config == self._config and events == self._events and self.image is not None:
+            return []
+
+        if config != self._config or self.calendar is None:
+            self.destroy()
+            self.calendar = Calendar(job_spec.build_config(spec.get('config') or {}), pool=self.pool)
+            self.calendar.draw_grid()
+        else:
+            self.calendar.reset()
+        logger.debug('%s: %d events added, %d removed', self.output, sum((events - self._events).values()),
+                     sum((self._events - events).values()))
+        self.calendar.add_events([job_spec.build_event(e) for e in spec.get('events') or []])
+        layout: CalendarLayout = self.calendar.compute_layout()
+        self._config, self._events = config, events
+
+        days: Optional[List[int]] = None if self.image is None else self._changed_days(self.layout, layout)
+        if days is None:
+            self._render(layout)
+        elif days:
+            self._redraw_days(layout, days)
+        self.layout = layout
+        return days
+
+    def destroy(self) -> None:
+        if self.calendar is not None:
+            self.calendar.destroy()
+        if self._fitted_grid is not None:
+            self._fitted_grid.close()
+        self.calendar, self.image, self.layout, self._fitted_grid = None, None, None, None
+        self._config, self._events = None, Counter()
+
+    def _render(self, layout: CalendarLayout) -> None:
+        renderer = PillowRenderer(pool=self.pool)
+        if self._fitted_grid is not None:
+            self._fitted_grid.close()
+            self._fitted_grid = None
+        if self.calendar.grid.geometry.is_fitted():
+            # the grid fitted to the events is kept while the fitted hours and days are the same
+            self._fitted_grid = renderer.render_grid(layout.grid)
+        self.image = renderer.render(layout, grid_image=self._get_grid_image())
+
+    def _redraw_days(self, layout: CalendarLayout, days: List[int]) -> None:
+        renderer = PillowRenderer(pool=self.pool)
+        for left, right in self._day_columns(days, [self.layout, layout]):
+            renderer.redraw_columns(self.image, layout, left, right, grid_image=self._get_grid_image())
+
+    def _get_grid_image(self) -> Optional[Image.Image]:
+        if self._fitted_grid is not None:
+            return self._fitted_grid
+        return self.calendar.grid.get_image()
+
+    @staticmethod
+    def _changed_days(old: CalendarLayout, new: CalendarLayout) -> Optional[List[int]]:
+        """
+        The days with the changed event boxes or None if the rest of the layout is changed.
+        """
+        if (old.size, old.background, old.events_origin, old.legend_origin) != \
+                (new.size, new.background, new.events_origin, new.legend_origin) or \
+                (old.title and old.title.to_dict()) != (new.title and new.title.to_dict()) or \
+                old.grid.to_dict() != new.grid.to_dict() or \
+                [page.to_dict() for page in old.legend_pages] != [page.to_dict() for page in new.legend_pages]:
+            return None
+        old_days: Dict[int, list] = WatchedCalendar._boxes_by_day(old)
+        new_days: Dict[int, list] = WatchedCalendar._boxes_by_day(new)
+        return sorted(day for day in set(old_days) | set(new_days) if old_days.get(day) != new_days.get(day))
+
+    @staticmethod
+    def _boxes_by_day(layout: CalendarLayout) -> Dict[int, list]:
+        days: Dict[int, list] = {}
+        for box in layout.events:
+            days.setdefault(box.day, []).append(box.to_dict())
+        return days
+
+    @staticmethod
+    def _day_columns(days: List[int], layouts: List[CalendarLayout]) -> List[Tuple[int, int]]:
+        """
+        The merged horizontal spans of the old and the new event boxes of the days.
+        """
+        spans: List[Tuple[float, float]] = sorted(PillowRenderer.box_columns(box) for layout in layouts
+                                                  for box in layout.events if box.day in days)
+        columns: List[Tuple[int, int]] = []
+        for left, right in spans:
+            left, right = int(left) - 1, int(right) + 2
+            if columns and left <= columns[-1][1]:
+                columns[-1] = (columns[-1][0], max(columns[-1][1], right))
+            else:
+                columns.append((left, right))
+        return columns
+
+    def __repr__(self) -> str:
+        return f'WatchedCalendar[output: {self.output}, events: {sum(self._events.values())}, ' \
+               f'rendered: {self.image is not None}]'
+
+
+class SpecWatcher(object):
+    """
+    Watches the job specification files and their events files and updates the images when the files are changed.
+    Every calendar is kept in the process between the changes, see 'WatchedCalendar'. The images are written
+    atomically, see 'save_atomic'.
+    """
+    def __init__(self, paths: List[str], output_dir: str = '.', pool: Optional[ImagePool] = None):
+        self.paths: List[str] = paths
+        self.output_dir: str = output_dir
+        self.pool: Optional[ImagePool] = pool
+        self._files: Dict[str, List[str]] = {path: [path] for path in paths}  # the job file -> all its files
+        self._stamps: Dict[str, Dict[str, Stamp]] = {}
+        self._calendars: Dict[str, Dict[str, WatchedCalendar]] = {path: {} for path in paths}
+
+    def poll(self) -> List[Tuple[str, Optional[List[int]]]]:
+        """
+        Checks the files once and updates the images of the changed ones.
+        Returns the written image files with the days rendered again (None if the whole image is rendered).
+        """
+        written: List[Tuple[str, Optional[List[int]]]] = []
+        for path in self.paths:
+            stamps: Dict[str, Stamp] = {file: self._stamp(file) for file in self._files[path]}
+            if stamps == self._stamps.get(path) or stamps[path] is None:
+                continue
+            self._stamps[path] = stamps
+            try:
+                jobs: List[dict] = job_spec.load_spec_file(path)
+            except (OSError, ValueError) as e:
+                # the file can be read in the middle of the editing, it is read again after the next change
+                logger.warning('Cannot read the job specification %s: %s', path, e)
+                continue
+            self._files[path] = job_spec.spec_files(path, jobs)
+            self._stamps[path] = {file: stamps.get(file) or self._stamp(file) for file in self._files[path]}
+            written.extend(self._update(path, jobs))
+        return written
+
+    def run(self, interval: float = 1.0, stop: Optional[Callable[[], bool]] = None,
+            report: Optional[Callable[[str, Optional[List[int]]], None]] = None) -> None:
+        """
+        Polls the files every 'interval' seconds until 'stop' returns True.
+        :param report: called with every written image file and the days rendered again
+        """
+        while stop is None or not stop():
+            for output, days in self.poll():
+                if report is not None:
+                    report(output, days)
+            time.sleep(interval)
+
+    def close(self) -> None:
+        for calendars in self._calendars.values():
+            for calendar in calendars.values():
+                calendar.destroy()
+            calendars.clear()
+
+    def _update(self, path: str, jobs: List[dict]) -> List[Tuple[str, Optional[List[int]]]]:
+        written: List[Tuple[str, Optional[List[int]]]] = []
+        calendars: Dict[str, WatchedCalendar] = self._calendars[path]
+        outputs: List[str] = []
+        for index, spec in enumerate(jobs):
+            output: str = os.path.join(self.output_dir, job_spec.output_name(spec, path, index, len(jobs)))
+            outputs.append(output)
+            calendar: WatchedCalendar = calendars.get(output) or WatchedCalendar(output, self.pool)
+            calendars[output] = calendar
+            try:
+                days: Optional[List[int]] = calendar.update(spec)
+            except ValueError as e:
+                logger.warning('Cannot render %s from %s: %s', output, path, e)
+                calendar.destroy()
+                continue
+            if days == []:
+                continue
+            save_atomic(calendar.image, output)
+            written.append((output, days))
+        for output in set(calendars) - set(outputs):
+            calendars.pop(output).destroy()
+        return written
+
+    @staticmethod
+    def _stamp(file: str) -> Stamp:
+        try:
+            stat: os.stat_result = os.stat(file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def __repr__(self) -> str:
+        return f'SpecWatcher[paths: {len(self.paths)}, output_dir: {self.output_dir}]'
@@ -20,5 +20,14 @@ setuptools.setup(
     install_requires=[
         'Pillow',
     ],
+    extras_require={
+        'yaml': ['PyYAML'],
+        'columnar': ['numpy'],
+    },
+    entry_points={
+        'console_scripts': [
+            'calendar-view=calendar_view.cli:main',
+        ],
+    },
     python_requires='>=3.6',
 )
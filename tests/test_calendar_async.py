@@ -0,0 +1,72 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import patch
+
+from calendar_view.calendar import Calendar, render_many_async
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.deadline import Deadline, RenderCancelledError
+
+
+def build_calendar(title: str) -> Calendar:
+    calendar = Calendar.build(CalendarConfig(title=title, dates='2024-01-01 - 2024-01-02', hours='8 - 12'))
+    calendar.add_event(day='2024-01-01', start='9:00', end='10:00', title='Demo')
+    return calendar
+
+
+class TestCalendarAsync(TestCase):
+    def test_render_async(self):
+        calendar = build_calendar('Async')
+
+        content = asyncio.run(calendar.render_async())
+
+        self.assertTrue(content.startswith(b'\x89PNG'))
+
+    def test_render_many_async_keeps_order(self):
+        calendars = [build_calendar('First'), build_calendar('Second, with a longer title')]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            contents = asyncio.run(render_many_async(calendars, executor=executor))
+
+        self.assertEqual(2, len(contents))
+        self.assertEqual(calendars[0].to_bytes(), contents[0])
+        self.assertEqual(calendars[1].to_bytes(), contents[1])
+
+    def test_render_async_timeout(self):
+        release = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(release.wait, 10)  # the only worker is busy
+            try:
+                with self.assertRaises(asyncio.TimeoutError):
+                    asyncio.run(build_calendar('Timeout').render_async(executor=executor, timeout=0.05))
+            finally:
+                release.set()
+
+    def test_render_many_async_cancel(self):
+        started, release = threading.Event(), threading.Event()
+        stopped: list = []
+        check = Deadline.check
+
+        def blocking_check(deadline: Deadline, stage: str = ''):
+            if stage == 'render' and not started.is_set():
+                started.set()
+                release.wait(10)  # the render is in flight while the task is cancelled
+            try:
+                check(deadline, stage)
+            except RenderCancelledError:
+                stopped.append(stage)
+                raise
+
+        async def cancel_in_flight(executor: ThreadPoolExecutor):
+            task = asyncio.ensure_future(render_many_async([build_calendar('Cancelled')], executor=executor))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 10)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        with patch.object(Deadline, 'check', autospec=True, side_effect=blocking_check):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                asyncio.run(cancel_in_flight(executor))
+                release.set()
+        # the worker stops at the next check instead of finishing the render
+        self.assertEqual(['render'], stopped)
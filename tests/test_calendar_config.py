@@ -1,6 +1,8 @@
 from datetime import date, timedelta
 from unittest import TestCase
+from unittest.mock import patch
 
+from calendar_view.core import time_utils
 from calendar_view.core.config import CalendarConfig
 
 
@@ -45,6 +47,15 @@ class TestCalendarConfig(TestCase):
         self.assertEqual(date(2019, 6, 17), start)
         self.assertEqual(date(2019, 6, 20), end)
 
+    def test_get_date_range_is_parsed_once(self):
+        cfg = CalendarConfig(lang='en', dates='2019-06-17 - 2019-06-20')
+        with patch.object(time_utils, 'parse_date_interval', wraps=time_utils.parse_date_interval) as parse:
+            for _ in range(3):
+                self.assertEqual((date(2019, 6, 17), date(2019, 6, 20)), cfg.get_date_range())
+            cfg.dates = '2019-06-18 - 2019-06-19'
+            self.assertEqual((date(2019, 6, 18), date(2019, 6, 19)), cfg.get_date_range())
+        self.assertEqual(2, parse.call_count)
+
     def test_modes_affect_hours(self):
         cfg = CalendarConfig(mode='day_hours')
         self.assertEqual((8, 22), cfg.get_hours_range())
@@ -0,0 +1,113 @@
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import TestCase
+from unittest.mock import patch
+
+from PIL import Image
+
+from calendar_view import cli
+from calendar_view import spec as job_spec
+
+
+def job(output: str, days: int, events: int) -> dict:
+    return {
+        'output': output,
+        'config': {'title': output, 'days': days, 'hours': '8 - 12'},
+        'events': [{'day_of_week': i % days, 'start': '9:00', 'end': '10:00', 'title': f'Event {i}'}
+                   for i in range(events)],
+    }
+
+
+class TestCli(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'jobs.json')
+        self.output_dir = os.path.join(self.tmp.name, 'output')
+        self._write([job('small.png', 1, 1), job('large.png', 7, 20), job('medium.png', 3, 5)])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, jobs: list):
+        with open(self.path, 'w') as f:
+            json.dump(jobs, f)
+
+    def _main(self, *args: str):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = cli.main(['render', self.path, '-o', self.output_dir] + list(args))
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_largest_first(self):
+        jobs = cli.collect_jobs([self.path], self.output_dir)
+        self.assertEqual(['large.png', 'medium.png', 'small.png'], [os.path.basename(j.output) for j in jobs])
+
+    def test_render(self):
+        code, stdout, _ = self._main()
+        self.assertEqual(0, code)
+        self.assertIn('Rendered 3 of 3 calendars', stdout)
+        self.assertIn('calendars/s', stdout)
+        self.assertEqual(['large.png', 'medium.png', 'small.png'], sorted(os.listdir(self.output_dir)))
+
+    def test_process_pool(self):
+        code, stdout, _ = self._main('-j', '2')
+        self.assertEqual(0, code)
+        self.assertIn('with 2 worker(s)', stdout)
+        with Image.open(os.path.join(self.output_dir, 'large.png')) as image:
+            self.assertEqual('RGBA', image.mode)
+
+    def test_cache(self):
+        cache_dir = os.path.join(self.tmp.name, 'cache')
+        self.assertEqual(0, self._main('--cache-dir', cache_dir)[0])
+        with open(os.path.join(self.output_dir, 'large.png'), 'rb') as f:
+            expected = f.read()
+        os.remove(os.path.join(self.output_dir, 'large.png'))
+
+        # the cache hit doesn't build the calendar and doesn't draw the grid
+        with patch.object(job_spec, 'build_calendar', side_effect=AssertionError('built')):
+            code, stdout, _ = self._main('--cache-dir', cache_dir)
+        self.assertEqual(0, code)
+        self.assertIn('3 from cache', stdout)
+        with open(os.path.join(self.output_dir, 'large.png'), 'rb') as f:
+            self.assertEqual(expected, f.read())
+
+    def test_cache_recurring_event(self):
+        recurring = {'output': 'yoga.png', 'config': {'dates': '2024-01-01 - 2024-01-07', 'hours': '8 - 20'},
+                     'events': [{'day': '2023-12-26', 'start': '18:00', 'end': '19:00', 'title': 'Yoga',
+                                 'recurrence': {'frequency': 'weekly', 'days_of_week': [1, 3]}},
+                                {'day': '2024-02-01', 'start': '9:00', 'end': '10:00', 'title': 'Hidden'}]}
+        self._write([recurring])
+        cache_dir = os.path.join(self.tmp.name, 'cache')
+        self.assertEqual(0, self._main('--cache-dir', cache_dir)[0])
+
+        with patch.object(job_spec, 'build_calendar', side_effect=AssertionError('built')):
+            code, stdout, _ = self._main('--cache-dir', cache_dir)
+        self.assertEqual(0, code)
+        self.assertIn('1 from cache', stdout)
+
+    def test_failed_job(self):
+        self._write([job('good.png', 1, 1), dict(job('bad.png', 1, 1), config={'hours': '20 - 8'}),
+                     dict(job('wrong.png', 1, 1), config={'days': 'seven'}),
+                     dict(job('broken.png', 1, 1), config={'dates': 2024})])
+        code, stdout, stderr = self._main('-j', '2')
+        self.assertEqual(1, code)
+        self.assertIn('3 failed', stdout)
+        self.assertEqual(3, stderr.count('FAILED'))
+        self.assertEqual(['good.png'], os.listdir(self.output_dir))
+
+    def test_nested_output(self):
+        self._write([job('team/week.png', 1, 1), job('team/ops/day.png', 1, 1)])
+        code, _, _ = self._main()
+        self.assertEqual(0, code)
+        self.assertTrue(os.path.isfile(os.path.join(self.output_dir, 'team', 'week.png')))
+        self.assertTrue(os.path.isfile(os.path.join(self.output_dir, 'team', 'ops', 'day.png')))
+
+    def test_output_outside(self):
+        self._write([job('../escape.png', 1, 1)])
+        code, _, stderr = self._main()
+        self.assertEqual(2, code)
+        self.assertIn('output directory', stderr)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'escape.png')))
@@ -0,0 +1,94 @@
+from datetime import datetime
+from unittest import TestCase, skipIf
+from unittest.mock import patch
+
+from calendar_view.calendar import Calendar
+from calendar_view.core import columnar
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.event import Event, EventStyles
+
+COLUMNS = {
+    'start': [datetime(2024, 1, 1, 9, 0), datetime(2024, 1, 1, 22, 0), datetime(2023, 12, 30, 10, 0),
+              datetime(2024, 1, 2, 23, 0), datetime(2024, 1, 9, 9, 0), datetime(2024, 1, 2, 12, 0), None],
+    'end': [datetime(2024, 1, 1, 10, 30), datetime(2024, 1, 3, 8, 0), datetime(2024, 1, 1, 11, 0),
+            datetime(2024, 1, 3, 0, 0), datetime(2024, 1, 9, 10, 0), datetime(2024, 1, 2, 12, 0),
+            datetime(2024, 1, 2, 11, 0)],
+    'title': ['Standup', 'Night shift', 'Conference', 'Late call', 'Hidden', 'Empty', 'Missing'],
+    'style': ['green', None, 'red', EventStyles.BLUE, None, None, None],
+}
+
+
+def build() -> Calendar:
+    return Calendar(CalendarConfig(dates='2024-01-01 - 2024-01-03', hours='0 - 24', legend=False))
+
+
+def spans(calendar: Calendar) -> list:
+    return [(e.title, e.get_start_date(calendar.config), e.start_time, e.end_time, e.style)
+            for e in calendar.events.events]
+
+
+class TestColumnar(TestCase):
+    def test_same_as_events(self):
+        expected = build()
+        for start, end, title, style in zip(*COLUMNS.values()):
+            if start is not None and start < end:
+                expected.add_event(Event(start=start, end=end, title=title,
+                                         style=getattr(EventStyles, style.upper()) if isinstance(style, str)
+                                         else style))
+
+        calendar = build()
+        with self.assertLogs(columnar.logger, 'WARNING'):
+            rows = calendar.add_frame(COLUMNS)
+
+        self.assertEqual(sorted(spans(expected), key=repr), sorted(spans(calendar), key=repr))
+        self.assertEqual(expected.to_bytes(), calendar.to_bytes())
+        self.assertEqual([0, 1, 2, 3, None, None, None], [r.row if r else None for r in rows])
+
+    def test_multi_day_rows_are_split(self):
+        calendar = build()
+        calendar.add_columns(COLUMNS['start'][1:2], COLUMNS['end'][1:2], ['Night shift'])
+
+        segments = calendar.events.events
+        self.assertEqual([(1320, 1440), (0, 1440), (0, 480)], [(s.start_minute, s.end_minute) for s in segments])
+        self.assertIs(segments[0].event, segments[1].event)
+        self.assertEqual([segments[0].event], calendar.events.get_index().conflicts(
+            Event(start=datetime(2024, 1, 2, 7, 0), end=datetime(2024, 1, 2, 9, 0))))
+
+    def test_missing_column(self):
+        with self.assertRaises(ValueError):
+            build().add_frame({'start': COLUMNS['start']})
+        with self.assertRaises(ValueError):
+            build().add_columns(COLUMNS['start'][:1], COLUMNS['end'][:1], style=['purple'])
+
+    def test_reversed_rows(self):
+        start = [datetime(2024, 1, 1, 9, 0), datetime(2024, 1, 2, 12, 0)]
+        end = [datetime(2024, 1, 1, 10, 0), datetime(2024, 1, 1, 13, 0)]
+        calendar = build()
+        with self.assertRaisesRegex(ValueError, r'\[1\]'):
+            calendar.add_columns(start, end, ['One', 'Reversed'])
+        self.assertEqual([], calendar.events.events)
+        with self.assertRaises(ValueError):
+            Event(start=start[1], end=end[1])
+
+    def test_string_timestamps(self):
+        start = ['2024-01-01T09:00', '2024-01-02T22:00', None]
+        end = ['2024-01-01T10:00', '2024-01-03T01:30', '2024-01-03T02:00']
+        for numpy in {columnar.numpy, None}:
+            with self.subTest(numpy=numpy is not None), patch.object(columnar, 'numpy', numpy):
+                calendar = build()
+                with self.assertLogs(columnar.logger, 'WARNING'):
+                    calendar.add_columns(start, end, ['One', 'Two', 'Missing'])
+                self.assertEqual([('One', 540, 600), ('Two', 1320, 1440), ('Two', 0, 90)],
+                                 [(s.title, s.start_minute, s.end_minute) for s in calendar.events.events])
+                with self.assertRaises(ValueError):
+                    build().add_columns(['2024-01-01 nine'], ['2024-01-01T10:00'])
+
+    @skipIf(columnar.numpy is None, 'numpy is not installed')
+    def test_numpy_columns(self):
+        numpy = columnar.numpy
+        calendar = build()
+        calendar.add_columns(numpy.array(['2024-01-01T09:00', '2024-01-02T22:00', 'NaT'], dtype='datetime64[m]'),
+                             numpy.array(['2024-01-01T10:00', '2024-01-03T01:30', 'NaT'], dtype='datetime64[m]'),
+                             numpy.array(['One', 'Two', 'Three'], dtype=object))
+        self.assertEqual([('One', 540, 600), ('Two', 1320, 1440), ('Two', 0, 90)],
+                         [(s.title, s.start_minute, s.end_minute) for s in calendar.events.events])
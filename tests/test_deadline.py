@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+from http.client import HTTPConnection
+from unittest import TestCase
+
+from calendar_view.calendar import Calendar, render_png
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.deadline import CancellationToken, Deadline, RenderCancelledError, RenderTimeoutError
+from calendar_view.server import RenderServer, RenderService
+
+
+def build_calendar() -> Calendar:
+    calendar = Calendar.build(CalendarConfig(title='Deadline', dates='2024-01-01 - 2024-01-03', hours='8 - 14',
+                                             legend=True))
+    calendar.add_event(day='2024-01-01', start='9:00', end='10:00', title='First')
+    calendar.add_event(day='2024-01-02', start='11:00', end='12:30', title='Second', notes='Notes')
+    return calendar
+
+
+class TestDeadline(TestCase):
+    def test_no_limit(self):
+        deadline = Deadline()
+        deadline.check('layout')
+        self.assertIsNone(deadline.remaining())
+
+    def test_expired(self):
+        deadline = Deadline(0.01)
+        time.sleep(0.02)
+        self.assertEqual(0, deadline.remaining())
+        with self.assertRaises(RenderTimeoutError):
+            deadline.check('layout')
+
+    def test_cancelled(self):
+        token = CancellationToken()
+        deadline = Deadline(60, token)
+        deadline.check('layout')
+        token.cancel()
+        with self.assertRaises(RenderCancelledError):
+            deadline.check('layout')
+
+
+class TestRenderDeadline(TestCase):
+    def test_render_without_deadline_is_unchanged(self):
+        expected: bytes = build_calendar().to_bytes()
+
+        self.assertEqual(expected, build_calendar().to_bytes(deadline=Deadline(60)))
+
+    def test_expired_render_releases_images(self):
+        calendar = build_calendar()
+        deadline = Deadline(0)
+        time.sleep(0.001)
+
+        with self.assertRaises(RenderTimeoutError):
+            calendar.to_bytes(deadline=deadline)
+        self.assertIsNone(calendar.full_image)
+        self.assertEqual([], calendar.legend_pages)
+
+        # the calendar can be rendered again after the interrupted render
+        self.assertTrue(calendar.to_bytes().startswith(b'\x89PNG'))
+
+    def test_cancelled_render(self):
+        token = CancellationToken()
+        token.cancel()
+
+        with self.assertRaises(RenderCancelledError):
+            build_calendar().to_bytes(deadline=Deadline(token=token))
+
+    def test_render_png_timeout(self):
+        calendar = build_calendar()
+
+        with self.assertRaises(RenderTimeoutError):
+            render_png(calendar.config, calendar.events.events, timeout=0)
+
+
+class TestServerTimeout(TestCase):
+    def test_gateway_timeout(self):
+        service = RenderService(workers=1, max_queue=1, cache_size=0, render_timeout=0)
+        server = RenderServer(('127.0.0.1', 0), service)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            body = json.dumps({
+                'config': {'dates': '2024-01-01 - 2024-01-02', 'hours': '8 - 12'},
+                'events': [{'day': '2024-01-01', 'start': '9:00', 'end': '10:00', 'title': 'Demo'}],
+            }).encode('utf-8')
+            connection = HTTPConnection('127.0.0.1', server.server_port, timeout=30)
+            connection.request('POST', '/render', body=body)
+            response = connection.getresponse()
+            content = json.loads(response.read())
+            connection.close()
+
+            self.assertEqual(504, response.status)
+            self.assertIn('error', content)
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.shutdown()
@@ -0,0 +1,65 @@
+from datetime import datetime, time
+from unittest import TestCase
+
+from calendar_view.calendar import Calendar
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.event import EventStyles
+
+
+class TestDeduplicate(TestCase):
+    def test_duplicates_are_skipped(self):
+        calendar = Calendar.build(CalendarConfig(dates='2024-01-01 - 2024-01-03', deduplicate=True))
+        for _ in range(3):
+            calendar.add_event(day='2024-01-01', start='9:00', end='10:00', title='Booking', notes='Room 1')
+        calendar.add_event(day='2024-01-01', start='9:00', end='10:00', title='Booking', notes='Room 2')
+        calendar.add_event(day='2024-01-01', start='9:00', end='10:00', title='Booking', notes='Room 1',
+                           style=EventStyles.RED)
+
+        self.assertEqual(3, len(calendar.events.events))
+        calendar.events.layout_events()
+        self.assertEqual({3}, {e.cascade_total for e in calendar.events.events})
+
+    def test_duplicates_are_kept_by_default(self):
+        calendar = Calendar.build(CalendarConfig(dates='2024-01-01 - 2024-01-03'))
+        for _ in range(2):
+            calendar.add_event(day='2024-01-01', start='9:00', end='10:00', title='Booking')
+        self.assertEqual(2, len(calendar.events.events))
+
+    def test_duplicate_segments(self):
+        calendar = Calendar.build(CalendarConfig(dates='2024-01-01 - 2024-01-03', deduplicate=True))
+        for _ in range(2):
+            calendar.add_event(title='Shift', start=datetime(2024, 1, 1, 20), end=datetime(2024, 1, 2, 8))
+        self.assertEqual(2, len(calendar.events.events))
+
+
+class TestMergeAdjacent(TestCase):
+    def test_back_to_back_events_are_merged(self):
+        calendar = Calendar.build(CalendarConfig(dates='2024-01-01 - 2024-01-03', merge_adjacent=True))
+        calendar.add_event(day='2024-01-01', start='10:00', end='11:00', title='Slot')
+        calendar.add_event(day='2024-01-01', start='8:00', end='9:00', title='Other')
+        calendar.add_event(day='2024-01-01', start='9:00', end='10:00', title='Slot')
+        calendar.add_event(day='2024-01-01', start='11:00', end='12:00', title='Slot', style=EventStyles.RED)
+        calendar.add_event(day='2024-01-01', start='12:00', end='13:00', title='Slot')
+        calendar.add_event(day='2024-01-02', start='11:00', end='12:00', title='Slot')
+
+        calendar.events.layout_events()
+
+        events = [(e.title, e.get_start_date(calendar.config).day, e.start_time, e.end_time)
+                  for e in calendar.events.events]
+        self.assertEqual([('Other', 1, time(8), time(9)),
+                          ('Slot', 1, time(9), time(11)),
+                          ('Slot', 1, time(11), time(12)),
+                          ('Slot', 1, time(12), time(13)),
+                          ('Slot', 2, time(11), time(12))], events)
+
+    def test_merge_to_the_end_of_day(self):
+        calendar = Calendar.build(CalendarConfig(dates='2024-01-01 - 2024-01-03', merge_adjacent=True))
+        calendar.add_event(day='2024-01-01', start='20:00', end='22:00', title='Shift')
+        calendar.add_event(title='Shift', start=datetime(2024, 1, 1, 22), end=datetime(2024, 1, 2, 6))
+
+        calendar.events.layout_events()
+
+        first = calendar.events.events[0]
+        self.assertEqual((time(20), time(0)), (first.start_time, first.end_time))
+        self.assertEqual(2, len(calendar.events.events))
+        calendar.save('/dev/null')
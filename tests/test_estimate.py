@@ -0,0 +1,95 @@
+import pickle
+from io import BytesIO
+from unittest import TestCase
+
+from PIL import Image
+
+from calendar_view.calendar import Calendar, render_png
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.estimate import AdmissionPolicy, JobTooLargeError
+from calendar_view.server import RenderService
+
+
+def build(legend: bool = False) -> Calendar:
+    calendar = Calendar(CalendarConfig(title='Estimate', dates='2024-01-01 - 2024-01-03', hours='8 - 14',
+                                       legend=legend))
+    calendar.add_event(day='2024-01-01', start='9:00', end='10:30', title='First')
+    calendar.add_event(day='2024-01-01', start='10:00', end='11:00', title='Second')
+    calendar.add_event(day='2024-01-01', start='10:30', end='12:00', title='Third', notes='Notes')
+    calendar.add_event(day='2024-01-02', start='11:00', end='12:30', title='Alone')
+    return calendar
+
+
+class TestEstimate(TestCase):
+    def test_size_without_drawing(self):
+        calendar = build()
+        estimate = calendar.estimate()
+        self.assertIsNone(calendar.grid.get_image())
+
+        calendar.save(BytesIO())
+        self.assertEqual(calendar.full_image.size, estimate.size)
+        self.assertEqual(4, estimate.events)
+        self.assertEqual(3, estimate.overlapping)
+        self.assertEqual(3, estimate.max_cascade)
+        self.assertGreater(estimate.peak_memory, 4 * estimate.pixels)
+
+    def test_legend(self):
+        calendar = build(legend=True)
+        estimate = calendar.estimate()
+        calendar.save(BytesIO())
+
+        self.assertEqual(1, len(estimate.legend_sizes))
+        self.assertEqual(calendar.full_image.size[0], estimate.size[0])
+        self.assertAlmostEqual(calendar.full_image.size[1], estimate.size[1], delta=10)
+
+    def test_cascade_sizes_match_groups(self):
+        calendar = build()
+        self.assertEqual([3, 1], calendar.events.get_cascade_sizes())
+        calendar.events.layout_events()
+        self.assertEqual([3, 3, 3, 1], [e.cascade_total for e in calendar.events.events])
+
+
+class TestAdmission(TestCase):
+    def test_within_budget(self):
+        calendar = build()
+        decision = AdmissionPolicy(max_pixels=10 ** 8).decide(calendar.estimate())
+        self.assertEqual(AdmissionPolicy.RENDER, decision.action)
+        self.assertEqual([], decision.reasons)
+
+    def test_reject(self):
+        with self.assertRaises(JobTooLargeError) as context:
+            build().to_bytes(policy=AdmissionPolicy(max_pixels=1000))
+        self.assertEqual(1, len(context.exception.reasons))
+
+    def test_reject_in_process(self):
+        error = pickle.loads(pickle.dumps(JobTooLargeError(build().estimate(), ['pixels'])))
+        self.assertEqual(['pixels'], error.reasons)
+
+        calendar = build()
+        service = RenderService(workers=1, executor='process', admission=AdmissionPolicy(max_pixels=10))
+        try:
+            for _ in range(2):  # the pool is not broken by the rejected job
+                with self.assertRaises(JobTooLargeError) as context:
+                    service.render(calendar.config, calendar.events.events, '"reject"')
+                self.assertEqual(1, len(context.exception.reasons))
+        finally:
+            service.shutdown()
+
+    def test_downscale(self):
+        calendar = build()
+        max_memory = calendar.estimate().peak_memory // 10
+        content = calendar.to_bytes(policy=AdmissionPolicy(max_memory=max_memory, action=AdmissionPolicy.DOWNSCALE))
+
+        image = Image.open(BytesIO(content))
+        self.assertLessEqual(image.size[0] * image.size[1] * 4 * 6, max_memory)
+        self.assertIsNone(calendar.full_image)
+
+    def test_preview(self):
+        calendar = build()
+        policy = AdmissionPolicy(max_pixels=1000, action=AdmissionPolicy.PREVIEW, preview_width=300)
+        content = render_png(calendar.config, calendar.events.events, policy=policy)
+        self.assertEqual(300, Image.open(BytesIO(content)).size[0])
+
+    def test_wrong_action(self):
+        with self.assertRaises(ValueError):
+            AdmissionPolicy(action='tile')
@@ -0,0 +1,69 @@
+import pickle
+from datetime import date, datetime, time
+from unittest import TestCase
+
+from PIL import ImageChops
+
+from calendar_view.calendar import Calendar
+from calendar_view.core import data
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.event import Event, EventSegment
+
+
+class TestEventSegment(TestCase):
+    def setUp(self):
+        self.config = CalendarConfig(dates='2024-01-01 - 2024-01-05', legend=False)
+
+    def test_split_to_segments(self):
+        calendar = Calendar.build(self.config)
+        shift = Event(title='Shift', start=datetime(2023, 12, 30, 22), end=datetime(2024, 1, 3, 6))
+        calendar.add_event(shift)
+
+        segments = calendar.events.events
+        self.assertEqual(3, len(segments))
+        self.assertTrue(all(isinstance(s, EventSegment) and s.event is shift for s in segments))
+        self.assertEqual([0, 1, 2], [s.day_index for s in segments])
+        self.assertEqual((time(0), time(0)), (segments[0].start_time, segments[0].end_time))
+        self.assertEqual(date(2024, 1, 2), segments[0].get_end_date(self.config))
+        self.assertEqual((time(0), time(6)), (segments[2].start_time, segments[2].end_time))
+        self.assertEqual('Shift', segments[2].title)
+
+    def test_overnight_event(self):
+        calendar = Calendar.build(self.config)
+        calendar.add_event(title='Night', start=datetime(2024, 1, 2, 22, 30), end=datetime(2024, 1, 3, 7))
+        segments = calendar.events.events
+        self.assertEqual([(1, 22 * 60 + 30, 1440), (2, 0, 7 * 60)],
+                         [(s.day_index, s.start_minute, s.end_minute) for s in segments])
+
+    def test_validated_once(self):
+        calendar = Calendar.build(CalendarConfig(dates='2024-01-01 - 2024-01-05', hours='8 - 18', legend=False))
+        with self.assertLogs(data.logger, 'WARNING') as logs:
+            calendar.add_event(title='Late', start=datetime(2024, 1, 1, 7), end=datetime(2024, 1, 4, 20))
+        self.assertEqual(2, len(logs.output))
+        self.assertIn('its start is before time range: 07:00', logs.output[0])
+        self.assertIn('its end is after time range: 20:00', logs.output[1])
+
+        with self.assertNoLogs(data.logger, 'WARNING'):
+            calendar.add_event(title='Shift', start=datetime(2023, 12, 30, 9), end=datetime(2024, 1, 9, 20))
+        self.assertEqual([date(2024, 1, d) for d in range(1, 6)],
+                         [s.get_start_date(None) for s in calendar.events.events[4:]])
+
+    def test_same_image_as_one_day_events(self):
+        split = Calendar.build(self.config)
+        split.add_event(title='Night', start=datetime(2024, 1, 2, 18), end=datetime(2024, 1, 4, 7))
+        split.save('/dev/null')
+
+        explicit = Calendar.build(self.config)
+        explicit.add_event(title='Night', start=datetime(2024, 1, 2, 18), end=datetime(2024, 1, 3, 0))
+        explicit.add_event(title='Night', start=datetime(2024, 1, 3, 0), end=datetime(2024, 1, 4, 0))
+        explicit.add_event(title='Night', start=datetime(2024, 1, 4, 0), end=datetime(2024, 1, 4, 7))
+        explicit.save('/dev/null')
+
+        self.assertIsNone(ImageChops.difference(split.full_image, explicit.full_image).getbbox(alpha_only=False))
+
+    def test_pickle(self):
+        calendar = Calendar.build(self.config)
+        calendar.add_event(title='Shift', start=datetime(2024, 1, 1, 8), end=datetime(2024, 1, 2, 8))
+        segments = pickle.loads(pickle.dumps(calendar.events.events))
+        self.assertEqual(calendar.events.events, segments)
+        self.assertIs(segments[0].event, segments[1].event)
@@ -0,0 +1,87 @@
+from io import BytesIO
+from unittest import TestCase
+
+from PIL import Image, ImageChops
+
+from calendar_view.calendar import Calendar
+from calendar_view.config import style
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.image_pool import ImagePool
+from calendar_view.core.renderers import PillowRenderer
+
+
+def build(**kwargs) -> Calendar:
+    calendar = Calendar.build(CalendarConfig(dates='2024-01-01 - 2024-01-05', legend=False, **kwargs))
+    calendar.add_event(day='2024-01-02', start='10:30', end='12:00', title='Review')
+    calendar.add_event(day='2024-01-04', start='13:00', end='13:45', title='Talk')
+    return calendar
+
+
+class TestFitCanvas(TestCase):
+    def test_fit_hours(self):
+        calendar = build(fit_hours=True)
+        layout = calendar.compute_layout()
+        self.assertEqual((10, 14), calendar.grid.geometry.get_hours_range())
+        self.assertEqual(str(10), layout.grid.texts[0].text)
+        self.assertEqual(4 * style.hour_height + style.hour_height + 2 * style.padding_vertical, layout.grid.size[1])
+        # the event starts half an hour after the first line
+        self.assertEqual(style.padding_vertical + style.hour_height + style.hour_height / 2, layout.events[0].rect[1])
+
+    def test_fit_hours_within_config(self):
+        calendar = build(fit_hours=True, hours='11 - 20')
+        calendar.compute_layout()
+        self.assertEqual((11, 14), calendar.grid.geometry.get_hours_range())
+
+    def test_collapse_empty_days(self):
+        calendar = build(collapse_empty_days=True)
+        layout = calendar.compute_layout()
+        widths = [style.collapsed_day_width, style.day_width] * 2 + [style.collapsed_day_width]
+        self.assertEqual(sum(widths) + 2 * style.padding_horizontal, layout.grid.size[0])
+        second_day = calendar.events.get_day_x(1)
+        self.assertEqual((style.padding_horizontal + style.collapsed_day_width,
+                          style.padding_horizontal + style.collapsed_day_width + style.day_width), second_day)
+        self.assertGreater(layout.events[0].rect[0], second_day[0])
+        self.assertLess(layout.events[0].rect[2], second_day[1])
+
+    def test_same_image_as_configured_range(self):
+        fitted = build(fit_hours=True)
+        buffer = BytesIO()
+        fitted.save(buffer)
+
+        configured = build(hours='10 - 14')
+        configured.save('/dev/null')
+
+        image = Image.open(buffer).convert('RGBA')
+        self.assertIsNone(ImageChops.difference(configured.full_image, image).getbbox(alpha_only=False))
+
+    def test_draw_events(self):
+        for kwargs in ({'fit_hours': True}, {'collapse_empty_days': True}, {'hours': '8 - 20'}):
+            calendar = build(**kwargs)
+            image = calendar.events.draw_events()
+            layout = calendar.compute_layout()
+            self.assertEqual(layout.grid.size, image.size, kwargs)
+
+            expected = Image.new('RGBA', layout.grid.size, (0, 0, 0, 0))
+            PillowRenderer().draw_event_boxes(expected, layout.events)
+            self.assertIsNone(ImageChops.difference(expected, image).getbbox(alpha_only=False), kwargs)
+
+    def test_event_layer_is_lazy(self):
+        pool = ImagePool()
+        calendar = Calendar(CalendarConfig(dates='2024-01-01 - 2024-01-05', hours='8 - 20'), pool=pool)
+        calendar.draw_grid()
+        calendar.add_event(day='2024-01-02', start='10:30', end='12:00', title='Review')
+        calendar.save(BytesIO())
+        self.assertIsNone(calendar.events.event_image)  # the render doesn't need the layer
+
+        image = calendar.events.draw_events()
+        self.assertEqual(calendar.grid.get_size(), image.size)
+        calendar.reset()
+        self.assertIsNone(calendar.events.event_image)
+        self.assertTrue(any(image in images for images in pool._free.values()))
+
+    def test_without_events(self):
+        calendar = Calendar.build(CalendarConfig(dates='2024-01-01 - 2024-01-02', hours='8 - 12', fit_hours=True,
+                                                 collapse_empty_days=True))
+        calendar.save(BytesIO())
+        self.assertEqual((8, 12), calendar.grid.geometry.get_hours_range())
+        self.assertFalse(calendar.grid.geometry.is_collapsed(0))
@@ -0,0 +1,121 @@
+from datetime import datetime
+from unittest import TestCase
+
+from PIL import Image, ImageChops
+
+from calendar_view.calendar import Calendar
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.event import Event
+from calendar_view.core.image_pool import ImagePool
+
+
+class TestImagePool(TestCase):
+    def test_reuses_released_image(self):
+        pool = ImagePool()
+        image = pool.acquire((40, 30))
+        pool.release(image)
+        self.assertIs(image, pool.acquire((40, 30)))
+        self.assertEqual(1, pool.hits)
+        self.assertEqual(1, pool.misses)
+
+    def test_reused_image_is_cleared(self):
+        pool = ImagePool()
+        image = pool.acquire((40, 30))
+        image.paste((10, 20, 30, 40), (5, 5, 20, 20))
+        pool.release(image)
+        for color in [(0, 0, 0, 0), (255, 255, 255, 255), 'white']:
+            expected = Image.new('RGBA', (40, 30), color)
+            actual = pool.acquire((40, 30), color)
+            self.assertIsNone(ImageChops.difference(expected, actual).getbbox(alpha_only=False))
+            pool.release(actual)
+
+    def test_other_size_is_new(self):
+        pool = ImagePool()
+        pool.release(pool.acquire((40, 30)))
+        image = pool.acquire((30, 40))
+        self.assertEqual((30, 40), image.size)
+        self.assertEqual(2, pool.misses)
+
+    def test_bounded_size(self):
+        pool = ImagePool(max_bytes=2 * 40 * 30 * 4)
+        pool.release(*[Image.new('RGBA', (40, 30)) for _ in range(3)])
+        pool.release(Image.new('RGBA', (100, 100)))  # larger than the pool
+        self.assertEqual(2 * 40 * 30 * 4, pool._size)
+
+        pool.release(Image.new('RGBA', (30, 40)))  # the oldest size is dropped first
+        self.assertEqual([('RGBA', (40, 30)), ('RGBA', (30, 40))], list(pool._free))
+        self.assertEqual(1, len(pool._free[('RGBA', (40, 30))]))
+
+
+class TestCalendarReset(TestCase):
+    @staticmethod
+    def _build(pool: ImagePool) -> Calendar:
+        config = CalendarConfig(lang='en', title='Reset', dates='2019-09-16 - 2019-09-20', hours='8 - 18')
+        calendar = Calendar(config, pool)
+        calendar.draw_grid()
+        return calendar
+
+    @staticmethod
+    def _events(hour: int):
+        return [Event(title='Yoga', start=datetime(2019, 9, 16, hour), end=datetime(2019, 9, 16, hour + 2)),
+                Event(title='Lunch', start=datetime(2019, 9, 18, 12), end=datetime(2019, 9, 18, 13))]
+
+    def test_reset_renders_the_same(self):
+        pool = ImagePool()
+        calendar = self._build(pool)
+        calendar.add_events(self._events(9))
+        first = calendar.to_bytes()
+
+        calendar.reset()
+        self.assertEqual([], calendar.events.events)
+        self.assertIsNone(calendar.full_image)
+        calendar.add_events(self._events(14))
+        calendar.to_bytes()
+        calendar.reset()
+        calendar.add_events(self._events(9))
+
+        self.assertEqual(first, calendar.to_bytes())
+
+    def test_reset_reuses_buffers(self):
+        pool = ImagePool()
+        calendar = self._build(pool)
+        calendar.add_events(self._events(9))
+        calendar.to_bytes()
+        misses = pool.misses
+
+        calendar.reset()
+        calendar.add_events(self._events(14))
+        calendar.to_bytes()
+
+        self.assertEqual(misses, pool.misses)
+        self.assertGreater(pool.hits, 0)
+
+    def test_rendered_image_is_not_pooled(self):
+        pool = ImagePool()
+        calendar = self._build(pool)
+        calendar.add_events(self._events(9))
+        image = calendar.render()
+        expected = image.tobytes()
+        calendar.destroy()
+
+        other = self._build(pool)
+        other.add_events(self._events(14))
+        other.render()
+        self.assertEqual(expected, image.tobytes())
+
+        other.reset()
+        other.add_events(self._events(9))
+        other.render()
+        self.assertEqual(expected, image.tobytes())
+
+    def test_same_as_new_calendar(self):
+        pool = ImagePool()
+        calendar = self._build(pool)
+        calendar.add_events(self._events(14))
+        calendar.to_bytes()
+        calendar.reset()
+        calendar.add_events(self._events(9))
+
+        fresh = self._build(ImagePool())
+        fresh.add_events(self._events(9))
+        self.assertEqual(fresh.to_bytes(), calendar.to_bytes())
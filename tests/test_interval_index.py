@@ -0,0 +1,71 @@
+from datetime import date, datetime
+from unittest import TestCase
+
+from calendar_view.core.calendar_events import CalendarEvents
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.event import Event
+
+
+def build_events() -> CalendarEvents:
+    events = CalendarEvents(CalendarConfig(dates='2024-01-01 - 2024-01-03', hours='8 - 18', legend=False))
+    events.add_event(Event(day='2024-01-01', start='9:00', end='10:00', title='Standup'))
+    events.add_event(Event(day='2024-01-01', start='9:30', end='11:00', title='Review'))
+    events.add_event(Event(day='2024-01-01', start='13:00', end='14:00', title='Lunch talk'))
+    events.add_event(Event(start=datetime(2024, 1, 2, 22, 0), end=datetime(2024, 1, 3, 9, 0), title='Night shift'))
+    return events
+
+
+class TestIntervalIndex(TestCase):
+    def test_conflicts(self):
+        events = build_events()
+        index = events.get_index()
+        standup, review, talk, shift = events.events[0], events.events[1], events.events[2], events.events[3].event
+
+        self.assertEqual([review], index.conflicts(standup))
+        self.assertEqual([], index.conflicts(talk))
+        self.assertEqual([standup, review], index.conflicts(Event(day='2024-01-01', start='9:45', end='10:15')))
+        # the multi-day event is found by any of its segments and returned once
+        self.assertEqual([shift], index.conflicts(Event(start=datetime(2024, 1, 2, 20, 0),
+                                                        end=datetime(2024, 1, 3, 8, 30))))
+
+    def test_overlapping_is_half_open(self):
+        index = build_events().get_index()
+        self.assertEqual([], index.overlapping(date(2024, 1, 1), 11 * 60, 13 * 60))
+        self.assertEqual(1, len(index.overlapping(date(2024, 1, 1), 11 * 60, 13 * 60 + 1)))
+
+    def test_free_slots(self):
+        index = build_events().get_index()
+        slots = index.free_slots([date(2024, 1, 1), date(2024, 1, 3)], 45)
+        self.assertEqual([
+            (datetime(2024, 1, 1, 8, 0), datetime(2024, 1, 1, 9, 0)),
+            (datetime(2024, 1, 1, 11, 0), datetime(2024, 1, 1, 13, 0)),
+            (datetime(2024, 1, 1, 14, 0), datetime(2024, 1, 1, 18, 0)),
+            (datetime(2024, 1, 3, 9, 0), datetime(2024, 1, 3, 18, 0)),
+        ], slots)
+        self.assertEqual([(datetime(2024, 1, 1, 11, 0), datetime(2024, 1, 1, 13, 0))],
+                         index.free_slots([date(2024, 1, 1)], 90, (9, 14)))
+
+    def test_busy_minutes(self):
+        index = build_events().get_index()
+        self.assertEqual(180, index.busy_minutes(date(2024, 1, 1)))
+        self.assertEqual([0, 60, 60, 0, 0, 60], index.busy_minutes_per_hour(date(2024, 1, 1), (8, 14)))
+        self.assertEqual(120, index.busy_minutes(date(2024, 1, 2)))
+        self.assertEqual(0, index.busy_minutes(date(2024, 1, 5)))
+
+    def test_rebuilt_after_change(self):
+        events = build_events()
+        index = events.get_index()
+        self.assertIs(index, events.get_index())
+
+        events.add_event(Event(day='2024-01-01', start='13:30', end='15:00', title='Extra'))
+        self.assertIsNot(index, events.get_index())
+        self.assertEqual(1, len(events.get_index().conflicts(events.events[2])))
+
+    def test_cascade_groups(self):
+        events = build_events()
+        events.add_event(Event(day='2024-01-01', start='10:30', end='12:00', title='Chained'))
+        events.group_cascade_events()
+
+        # the chained event overlaps the review only, but joins the group of the standup through it
+        self.assertEqual([3, 3, 1, 1, 1, 3], [e.cascade_total for e in events.events])
+        self.assertEqual([1, 2, 3], sorted(e.cascade_index for e in events.events if e.cascade_total == 3))
@@ -0,0 +1,92 @@
+import json
+from io import BytesIO
+from unittest import TestCase
+from xml.etree import ElementTree
+
+from PIL import Image, ImageChops
+
+from calendar_view.calendar import Calendar
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.event import EventStyles
+from calendar_view.core.layout import CalendarLayout
+from calendar_view.core.renderers import JsonRenderer, PillowRenderer, SvgRenderer
+
+
+def build_calendar(**kwargs) -> Calendar:
+    calendar = Calendar.build(CalendarConfig(title='Schedule', dates='2024-01-01 - 2024-01-03', hours='8 - 14', **kwargs))
+    calendar.add_event(day='2024-01-01', start='9:00', end='11:00', title='Yoga', notes='Bring a mat')
+    calendar.add_event(day='2024-01-02', start='10:00', end='12:30', title='Pilates & <Stretching>', style=EventStyles.RED)
+    return calendar
+
+
+class TestLayout(TestCase):
+    def test_layout_is_rendered_as_saved(self):
+        calendar = build_calendar()
+        buffer = BytesIO()
+        calendar.save(buffer)
+        expected = Image.open(buffer).convert('RGBA')
+
+        actual = PillowRenderer().render(calendar.compute_layout())
+
+        self.assertEqual(expected.size, actual.size)
+        self.assertIsNone(ImageChops.difference(expected, actual).getbbox(alpha_only=False))
+
+    def test_layout_positions(self):
+        layout = build_calendar().compute_layout()
+        self.assertEqual(2, len(layout.events))
+        self.assertEqual('Yoga', layout.events[0].title.text)
+        self.assertEqual('Schedule', layout.title.text)
+        self.assertEqual([], layout.legend_pages)
+        self.assertGreater(layout.events_origin[1], 0)
+
+    def test_legend_layout(self):
+        layout = build_calendar(legend=True).compute_layout()
+        self.assertIsNone(layout.events[0].title)
+        self.assertEqual(1, len(layout.legend_pages))
+        self.assertEqual(2, len(layout.legend_pages[0].texts))
+        self.assertEqual(layout.size[1], layout.legend_origin[1] + layout.legend_pages[0].size[1])
+
+    def test_json_round_trip(self):
+        layout = build_calendar(legend=True).compute_layout()
+        content: str = JsonRenderer().render(layout)
+
+        restored = CalendarLayout.from_dict(json.loads(content))
+
+        self.assertEqual(layout.to_dict(), restored.to_dict())
+        self.assertIsNone(ImageChops.difference(PillowRenderer().render(layout),
+                                                PillowRenderer().render(restored)).getbbox(alpha_only=False))
+
+    def test_svg(self):
+        layout = build_calendar().compute_layout()
+        root = ElementTree.fromstring(SvgRenderer().render(layout))
+        self.assertEqual(str(layout.size[0]), root.get('width'))
+        texts = ''.join(root.itertext())
+        self.assertIn('<Stretching>', texts)
+
+
+class TestPreview(TestCase):
+    def test_preview_size(self):
+        calendar = Calendar(CalendarConfig(dates='2024-01-01 - 2024-01-07', hours='8 - 20'))
+        self.assertEqual((280, 50), calendar.render_preview(280, 50).size)
+        width, height = calendar.render_preview(280).size
+        self.assertEqual(280, width)
+        self.assertAlmostEqual(280 * 600 / 2800, height, delta=2)
+
+    def test_preview_has_no_texts(self):
+        calendar = build_calendar(legend=True)
+        layout = calendar.compute_preview_layout(120)
+
+        self.assertIsNone(layout.title)
+        self.assertEqual([], layout.grid.texts)
+        self.assertEqual([], layout.legend_pages)
+        self.assertEqual(2, len(layout.events))
+        self.assertTrue(all(e.title is None and e.notes is None for e in layout.events))
+
+    def test_preview_draws_events(self):
+        calendar = build_calendar()
+        layout = calendar.compute_preview_layout(300)
+        image = calendar.render_preview(300)
+
+        x1, y1, x2, y2 = layout.events[0].rect
+        center = (int((x1 + x2) / 2), int((y1 + y2) / 2))
+        self.assertNotEqual(image.getpixel((0, 0)), image.getpixel(center))
@@ -0,0 +1,63 @@
+from unittest import TestCase, mock
+
+from calendar_view.calendar import Calendar
+from calendar_view.config import style
+from calendar_view.core.calendar_events import LegendEntry
+from calendar_view.core.config import CalendarConfig
+
+
+def entries(count: int, height: int = 30):
+    return [LegendEntry(f'line {i}', (100 + i, height)) for i in range(count)]
+
+
+class TestLegend(TestCase):
+    def test_split_pages_single_column(self):
+        pages = LegendEntry.split_pages(entries(5))
+        self.assertEqual(1, len(pages))
+        self.assertEqual([5], [len(c) for c in pages[0]])
+
+    @mock.patch.object(style, 'legend_columns', 2)
+    def test_split_pages_balanced_columns(self):
+        pages = LegendEntry.split_pages(entries(5))
+        self.assertEqual(1, len(pages))
+        self.assertEqual([3, 2], [len(c) for c in pages[0]])
+
+    @mock.patch.object(style, 'legend_columns', 2)
+    @mock.patch.object(style, 'legend_spacing', 10)
+    @mock.patch.object(style, 'legend_padding_top', 0)
+    @mock.patch.object(style, 'legend_padding_bottom', 0)
+    @mock.patch.object(style, 'legend_max_height', 100)
+    def test_split_pages_max_height(self):
+        # 3 lines per column: 3 * 30 + 2 * 10 = 110 > 100, so only 2 lines fit
+        pages = LegendEntry.split_pages(entries(9))
+        self.assertEqual([[2, 2], [2, 2], [1]], [[len(c) for c in page] for page in pages])
+        for page in pages:
+            for column in page:
+                self.assertLessEqual(LegendEntry.column_height(column), 100)
+
+    @mock.patch.object(style, 'legend_max_height', 300)
+    def test_calendar_legend_pages(self):
+        calendar = Calendar.build(CalendarConfig(dates='2024-01-01 - 2024-01-02', legend=True))
+        for hour in range(20):
+            calendar.add_event(day='2024-01-01', start=f'{hour}:00', end=f'{hour}:30', title=f'Event {hour}')
+
+        calendar.events.group_cascade_events()
+        pages = calendar.events.draw_legend_pages()
+
+        self.assertGreater(len(pages), 1)
+        for page in pages:
+            self.assertLessEqual(page.size[1], 300)
+
+    def test_auto_legend_does_not_change_config(self):
+        config = CalendarConfig(dates='2024-01-01 - 2024-01-02')
+        calendar = Calendar.build(config)
+        calendar.add_event(day='2024-01-01', start='9:00', end='10:00', title='Short')
+        calendar.events.layout_events()
+        self.assertFalse(calendar.events.is_legend_visible())
+
+        calendar.add_event(day='2024-01-02', start='9:00', end='9:30',
+                           title='A very long title that does not fit into the event at all')
+        calendar.events.layout_events()
+
+        self.assertTrue(calendar.events.is_legend_visible())
+        self.assertIsNone(config.legend)
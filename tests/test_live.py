@@ -0,0 +1,53 @@
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import patch
+
+from PIL import ImageChops
+
+from calendar_view.calendar import Calendar
+from calendar_view.config import style
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.renderers import PillowRenderer
+from calendar_view.live import LiveCalendar
+
+
+class TestLiveCalendar(TestCase):
+    def setUp(self):
+        calendar = Calendar.build(CalendarConfig(title='Lobby', dates='2024-01-01 - 2024-01-05', hours='8 - 18'))
+        calendar.add_event(day='2024-01-02', start='9:00', end='11:00', title='Standup')
+        calendar.add_event(day='2024-01-03', start='9:00', end='11:00', title='Review')
+        self.live = LiveCalendar(calendar)
+
+    def test_now_line(self):
+        image = self.live.render(datetime(2024, 1, 2, 14, 30))
+        base_size = self.live.base_image.size
+        self.assertEqual(base_size, image.size)
+
+        bbox = ImageChops.difference(self.live.base_image, image).getbbox(alpha_only=False)
+        self.assertIsNotNone(bbox)
+        self.assertLessEqual(bbox[3] - bbox[1], style.now_line_width + 1)
+        self.assertLessEqual(bbox[2] - bbox[0], style.day_width + style.now_line_width)
+
+    def test_current_event(self):
+        self.live.refresh()
+        boxes = self.live.current_event_boxes(datetime(2024, 1, 2, 10, 0))
+        self.assertEqual(1, len(boxes))
+        self.assertEqual(1, boxes[0].day)
+        self.assertEqual([], self.live.current_event_boxes(datetime(2024, 1, 2, 11, 0)))
+
+    def test_not_visible_moment(self):
+        for now in (datetime(2024, 1, 8, 10), datetime(2024, 1, 2, 20)):
+            image = self.live.render(now)
+            self.assertIsNone(ImageChops.difference(self.live.base_image, image).getbbox(alpha_only=False))
+
+    def test_base_is_rendered_once(self):
+        self.live.refresh()
+        base = self.live.base_image
+        with patch.object(PillowRenderer, 'render', autospec=True, side_effect=PillowRenderer.render) as render:
+            for minute in range(10):
+                self.live.render(datetime(2024, 1, 2, 10, minute))
+            self.assertEqual(0, render.call_count)
+            self.assertIs(base, self.live.base_image)
+
+            self.live.refresh()
+            self.assertEqual(1, render.call_count)
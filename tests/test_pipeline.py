@@ -0,0 +1,66 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest import TestCase
+
+from PIL import Image
+
+from calendar_view.calendar import Calendar
+from calendar_view.core.config import CalendarConfig
+from calendar_view.pipeline import EncodePipeline
+
+
+class TestEncodePipeline(TestCase):
+    @staticmethod
+    def _calendar(hour: int) -> Calendar:
+        config = CalendarConfig(lang='en', title='Pipeline', dates='2019-09-16 - 2019-09-18', hours='8 - 18')
+        calendar = Calendar(config)
+        calendar.add_event(title='Yoga', start=datetime(2019, 9, 16, hour), end=datetime(2019, 9, 16, hour + 2))
+        return calendar
+
+    def test_same_as_to_bytes(self):
+        expected = [self._calendar(hour).to_bytes() for hour in (9, 12, 15)]
+        with EncodePipeline() as pipeline:
+            futures = [pipeline.submit(self._calendar(hour)) for hour in (9, 12, 15)]
+        self.assertEqual(expected, [f.result() for f in futures])
+
+    def test_reused_calendar(self):
+        expected = [self._calendar(hour).to_bytes() for hour in (9, 12)]
+        calendar = self._calendar(9)
+        calendar.draw_grid()
+        with EncodePipeline() as pipeline:
+            first = pipeline.submit(calendar)
+            self.assertIsNone(calendar.full_image)
+            calendar.reset()
+            calendar.add_events(self._calendar(12).events.events)
+            second = pipeline.submit(calendar)
+        self.assertEqual(expected, [first.result(), second.result()])
+
+    def test_bounded_in_flight(self):
+        executor = ThreadPoolExecutor(1)
+        blocked = threading.Event()
+        executor.submit(blocked.wait)  # the encoder is busy
+        pipeline = EncodePipeline(max_in_flight=2, executor=executor)
+        image = Image.new('RGBA', (10, 10))
+        pipeline.submit_image(image)
+        pipeline.submit_image(image)
+        self.assertEqual(2, pipeline.in_flight())
+
+        third = threading.Thread(target=pipeline.submit_image, args=(image,))
+        third.start()
+        third.join(0.2)
+        self.assertTrue(third.is_alive())  # waits for the free slot
+
+        blocked.set()
+        third.join(5)
+        self.assertFalse(third.is_alive())
+        pipeline.wait()
+        self.assertEqual(0, pipeline.in_flight())
+        executor.shutdown()
+
+    def test_encoding_error(self):
+        with EncodePipeline() as pipeline:
+            future = pipeline.submit_image(Image.new('RGBA', (10, 10)), '/nonexistent/dir/image.png')
+            with self.assertRaises(OSError):
+                pipeline.wait()
+        self.assertIsInstance(future.exception(), OSError)
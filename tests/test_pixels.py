@@ -0,0 +1,61 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from unittest import TestCase, skipIf
+
+from calendar_view.calendar import Calendar
+from calendar_view.core import pixels
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.tiles import TileRenderer
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def build_calendar(tiles: TileRenderer = None) -> Calendar:
+    config = CalendarConfig(lang='en', title='Pixels', dates='2019-09-16 - 2019-09-18', hours='8 - 18')
+    calendar = Calendar(config, tiles=tiles)
+    calendar.add_event(title='Yoga', start=datetime(2019, 9, 16, 9), end=datetime(2019, 9, 16, 11))
+    return calendar
+
+
+class TestPixels(TestCase):
+    def test_to_buffer(self):
+        calendar = build_calendar()
+        buffer = calendar.to_buffer()
+        width, height = calendar.full_image.size
+        self.assertEqual(width * height * 4, len(buffer))
+        self.assertEqual(calendar.full_image.tobytes(), bytes(buffer))
+        self.assertEqual(calendar.full_image.getpixel((10, 5)), tuple(buffer[(5 * width + 10) * 4:][:4]))
+
+    def test_tiles_buffer_is_not_copied(self):
+        with ProcessPoolExecutor(2) as executor:
+            calendar = build_calendar(TileRenderer(executor, bands=2))
+            image = calendar.render()
+            buffer = pixels.get_pixels(image)
+            self.assertIs(image.pixel_buffer.obj, buffer.obj)  # the view of the shared memory
+            self.assertEqual(build_calendar().render().tobytes(), bytes(buffer))
+
+    def test_raw_file(self):
+        calendar = build_calendar()
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'calendar.raw')
+            size = calendar.save_raw(filename)
+            self.assertEqual(calendar.full_image.size, size)
+            self.assertEqual(size[0] * size[1] * 4, os.path.getsize(filename))
+
+            image = pixels.map_raw(filename, size)
+            self.assertTrue(image.readonly)
+            self.assertEqual(calendar.full_image.tobytes(), image.tobytes())
+            del image
+
+    @skipIf(numpy is None, 'numpy is not installed')
+    def test_to_array(self):
+        calendar = build_calendar()
+        array = calendar.to_array()
+        width, height = calendar.full_image.size
+        self.assertEqual((height, width, 4), array.shape)
+        self.assertEqual(calendar.full_image.getpixel((10, 5)), tuple(array[5, 10]))
@@ -0,0 +1,102 @@
+import random
+from datetime import date, datetime, timedelta
+from unittest import TestCase
+
+from calendar_view.calendar import Calendar
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.event import Event
+from calendar_view.core.recurrence import RecurrenceRule
+
+
+def naive_occurrences(rule: RecurrenceRule, start: date, date_from: date, date_to: date):
+    """
+    Walks through the whole series day by day.
+    """
+    result = []
+    index = 0
+    day = start
+    first_week = start - timedelta(days=start.weekday())
+    while rule.until is None or day <= rule.until:
+        if rule.frequency == RecurrenceRule.DAILY:
+            matches = (day - start).days % rule.interval == 0
+        else:
+            week = (day - first_week).days // 7
+            matches = week % rule.interval == 0 and day.weekday() in (rule.days_of_week or [start.weekday()])
+        if matches:
+            if rule.count is not None and index >= rule.count:
+                break
+            index += 1
+            if date_from <= day <= date_to and day not in rule.exceptions:
+                result.append(day)
+        if day > date_to:
+            break
+        day += timedelta(days=1)
+    return result
+
+
+class TestRecurrenceRule(TestCase):
+    def test_daily_interval(self):
+        rule = RecurrenceRule(RecurrenceRule.DAILY, interval=3)
+        days = list(rule.occurrences(date(2024, 1, 1), date(2024, 1, 5), date(2024, 1, 12)))
+        self.assertEqual([date(2024, 1, 7), date(2024, 1, 10)], days)
+
+    def test_weekly_days(self):
+        rule = RecurrenceRule(days_of_week=[1, 3], exceptions=['2024-03-07'])
+        days = list(rule.occurrences(date(2020, 1, 7), date(2024, 3, 4), date(2024, 3, 10)))
+        self.assertEqual([date(2024, 3, 5)], days)
+
+    def test_count_and_until(self):
+        start = date(2024, 1, 2)  # Tuesday
+        rule = RecurrenceRule(days_of_week=[1, 3], count=3)
+        self.assertEqual([date(2024, 1, 2), date(2024, 1, 4), date(2024, 1, 9)],
+                         list(rule.occurrences(start, date(2024, 1, 1), date(2024, 2, 1))))
+        rule = RecurrenceRule(RecurrenceRule.DAILY, until='2024-01-04')
+        self.assertEqual(3, len(list(rule.occurrences(start, date(2024, 1, 1), date(2024, 2, 1)))))
+
+    def test_long_series_is_not_walked(self):
+        rule = RecurrenceRule(RecurrenceRule.DAILY)
+        days = list(rule.occurrences(date(1900, 1, 1), date(2099, 1, 1), date(2099, 1, 3)))
+        self.assertEqual(3, len(days))
+
+    def test_same_as_naive_expansion(self):
+        rnd = random.Random(7)
+        for _ in range(300):
+            frequency = rnd.choice([RecurrenceRule.DAILY, RecurrenceRule.WEEKLY])
+            start = date(2024, 1, 1) + timedelta(days=rnd.randint(0, 60))
+            date_from = date(2024, 1, 1) + timedelta(days=rnd.randint(0, 120))
+            date_to = date_from + timedelta(days=rnd.randint(0, 15))
+            rule = RecurrenceRule(
+                frequency,
+                interval=rnd.randint(1, 4),
+                days_of_week=rnd.sample(range(7), rnd.randint(1, 3)) if frequency == RecurrenceRule.WEEKLY
+                and rnd.random() < 0.7 else None,
+                count=rnd.choice([None, rnd.randint(1, 30)]),
+                until=rnd.choice([None, start + timedelta(days=rnd.randint(0, 150))]),
+                exceptions=[start + timedelta(days=rnd.randint(0, 100)) for _ in range(3)],
+            )
+            self.assertEqual(naive_occurrences(rule, start, date_from, date_to),
+                             list(rule.occurrences(start, date_from, date_to)), rule)
+
+    def test_wrong_values(self):
+        self.assertRaises(ValueError, RecurrenceRule, 'monthly')
+        self.assertRaises(ValueError, RecurrenceRule, interval=0)
+        self.assertRaises(ValueError, RecurrenceRule, days_of_week=[7])
+        self.assertRaises(ValueError, Event, day_of_week=1, start='10:00', end='11:00', recurrence=RecurrenceRule())
+
+
+class TestRecurringEvents(TestCase):
+    def test_only_visible_occurrences_are_added(self):
+        calendar = Calendar.build(CalendarConfig(dates='2024-03-04 - 2024-03-10'))
+        calendar.add_event(title='Yoga', day='2020-01-07', start='18:00', end='19:00',
+                           recurrence=RecurrenceRule(days_of_week=[1, 3]))
+        days = [e.get_start_date(calendar.config) for e in calendar.events.events]
+        self.assertEqual([date(2024, 3, 5), date(2024, 3, 7)], days)
+        self.assertTrue(all(e.title == 'Yoga' and e.recurrence is None for e in calendar.events.events))
+
+    def test_overnight_occurrence_before_range(self):
+        calendar = Calendar.build(CalendarConfig(dates='2024-03-04 - 2024-03-06'))
+        calendar.add_event(title='Night shift', start=datetime(2024, 1, 1, 22), end=datetime(2024, 1, 2, 6),
+                           recurrence=RecurrenceRule(RecurrenceRule.DAILY))
+        events = calendar.events.events
+        self.assertEqual(date(2024, 3, 4), events[0].get_start_date(calendar.config))
+        self.assertEqual('00:00', events[0].start_time.strftime('%H:%M'))
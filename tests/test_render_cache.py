@@ -0,0 +1,73 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from calendar_view.calendar import Calendar
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.event import Event
+from calendar_view.core.render_cache import RenderCache
+
+
+class TestRenderCache(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_put_and_get(self):
+        cache = RenderCache(self.tmp.name)
+        self.assertIsNone(cache.get('ab12'))
+
+        cache.put('ab12', b'image')
+
+        self.assertEqual(b'image', cache.get('ab12'))
+
+    def test_evicts_least_recently_used(self):
+        cache = RenderCache(self.tmp.name, max_size=25)
+        cache.put('aa01', b'0123456789')
+        cache.put('bb02', b'0123456789')
+        old = time.time() - 100
+        os.utime(cache._path('aa01'), (old, old))
+        os.utime(cache._path('bb02'), (old + 1, old + 1))
+        cache.get('aa01')  # recently used now
+
+        cache.put('cc03', b'0123456789')
+
+        self.assertIsNotNone(cache.get('aa01'))
+        self.assertIsNone(cache.get('bb02'))
+        self.assertIsNotNone(cache.get('cc03'))
+
+    def test_scans_only_over_limit(self):
+        cache = RenderCache(self.tmp.name, max_size=100)
+        with patch('calendar_view.core.render_cache.os.walk', wraps=os.walk) as walk:
+            for i in range(9):
+                cache.put(f'aa{i:02}', b'0123456789')
+            self.assertEqual(1, walk.call_count)  # the first put finds the size of the directory
+
+            cache.put('bb01', b'0123456789')
+            cache.put('bb02', b'0123456789')
+            self.assertEqual(2, walk.call_count)
+        self.assertLessEqual(cache._size, 90)
+
+    def test_calendar_save_reuses_image(self):
+        cache = RenderCache(self.tmp.name)
+        config = CalendarConfig(dates='2024-01-01 - 2024-01-02', hours='8 - 12')
+        events = [Event(day='2024-01-01', start='9:00', end='10:00', title='Demo')]
+
+        first = Calendar.build(config)
+        first.add_events(events)
+        content = first.to_bytes(cache)
+        self.assertIsNotNone(first.full_image)
+
+        second = Calendar.build(config)
+        second.add_events(events)
+        self.assertEqual(content, second.to_bytes(cache))
+        self.assertIsNone(second.full_image)  # nothing is drawn
+
+        third = Calendar.build(config)
+        third.add_event(day='2024-01-01', start='9:00', end='10:30', title='Demo')
+        third.to_bytes(cache)
+        self.assertIsNotNone(third.full_image)
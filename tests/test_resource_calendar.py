@@ -0,0 +1,85 @@
+from io import BytesIO
+from unittest import TestCase
+
+from PIL import Image, ImageChops
+
+from calendar_view.calendar import Calendar
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.deadline import CancellationToken, Deadline, RenderCancelledError
+from calendar_view.resource_calendar import ResourceCalendar
+
+
+class TestResourceCalendar(TestCase):
+    def setUp(self):
+        self.config = CalendarConfig(dates='2024-01-01 - 2024-01-03', hours='8 - 14', legend=False)
+        self.rooms = ResourceCalendar(self.config)
+        self.rooms.add_event('Room A', day='2024-01-01', start='9:00', end='10:00', title='Standup')
+        self.rooms.add_event('Room A', day='2024-01-01', start='9:30', end='11:00', title='Review')
+        self.rooms.add_event('Room B', day='2024-01-02', start='12:00', end='13:00', title='Lunch talk')
+
+    def test_index(self):
+        self.assertEqual(['Room A', 'Room B'], self.rooms.resources)
+        self.assertEqual(['Standup', 'Review'], [e.title for e in self.rooms.get_events('Room A')])
+        self.assertEqual([], self.rooms.get_events('Room C'))
+
+    def test_same_image_as_separate_calendar(self):
+        buffer = BytesIO()
+        self.rooms.save('Room A', buffer)
+        self.rooms.save('Room B', BytesIO())
+
+        calendar = Calendar.build(self.config)
+        calendar.add_event(day='2024-01-01', start='9:00', end='10:00', title='Standup')
+        calendar.add_event(day='2024-01-01', start='9:30', end='11:00', title='Review')
+        calendar.save('/dev/null')
+
+        image = Image.open(buffer).convert('RGBA')
+        self.assertIsNone(ImageChops.difference(calendar.full_image, image).getbbox(alpha_only=False))
+        self.assertIs(self.rooms.calendar('Room A').grid, self.rooms.calendar('Room B').grid)
+
+    def test_side_by_side(self):
+        calendar = self.rooms.side_by_side()
+        layout = calendar.compute_layout()
+
+        self.assertEqual(['Room A', 'Room B'], [t.text for t in layout.grid.texts[-2:]])
+        standup, review, talk = layout.events
+        day_0, day_1 = calendar.events.get_day_x(0), calendar.events.get_day_x(1)
+        # the events of 'Room A' are cascaded in the left half of the day, 'Room B' is in the right half
+        self.assertLess(standup.rect[0], review.rect[0])
+        self.assertLessEqual(review.rect[2], (day_0[0] + day_0[1]) / 2 + 1)
+        self.assertGreaterEqual(talk.rect[0], (day_1[0] + day_1[1]) / 2)
+        self.assertEqual([4, 4, 2], [e.cascade_total for e in calendar.events.events])
+
+        calendar.save(BytesIO())
+        self.assertEqual([4, 4, 2], [e.cascade_total for e in calendar.events.events])
+        # the events of the resources are not changed
+        self.assertEqual(1, self.rooms.get_events('Room A')[0].cascade_total)
+
+    def test_many_narrow_columns(self):
+        resources = [f'Meeting room {i}' for i in range(30)]
+        calendar = ResourceCalendar(self.config).side_by_side(resources)
+        layout = calendar.compute_layout()
+
+        labels = layout.grid.texts[-len(resources):]
+        self.assertEqual([''.join(r.split()) for r in resources], [''.join(t.text.split()) for t in labels])
+        for left, right in zip(labels, labels[1:]):
+            self.assertLess(left.position[0] + left.size[0], right.position[0])  # not overlapped
+        # the grid grows down to fit the wrapped names
+        bottom = max(t.position[1] + t.size[1] for t in labels)
+        self.assertLessEqual(bottom, layout.grid.size[1])
+        self.assertGreater(layout.grid.size[1], Calendar(self.config).compute_layout().grid.size[1])
+        calendar.save(BytesIO())
+
+    def test_calendar_can_not_be_reset(self):
+        calendar = self.rooms.calendar('Room A')
+        self.assertRaises(RuntimeError, calendar.reset)
+        self.assertRaises(RuntimeError, calendar.destroy)
+        self.assertEqual(2, len(self.rooms.get_events('Room A')))
+        self.assertIsNotNone(self.rooms.grid.get_image())
+
+    def test_side_by_side_deadline(self):
+        token = CancellationToken()
+        token.cancel()
+        calendar = self.rooms.side_by_side()
+        calendar.events.deadline = Deadline(token=token)
+        self.assertRaises(RenderCancelledError, calendar.events.group_cascade_events)
+        self.assertRaises(RenderCancelledError, calendar.events.merge_adjacent_events)
@@ -0,0 +1,76 @@
+import json
+import threading
+from http.client import HTTPConnection
+from unittest import TestCase
+
+from calendar_view.server import RenderServer, RenderService
+
+
+class TestRenderServer(TestCase):
+    def setUp(self):
+        self.service = RenderService(workers=1, max_queue=1)
+        self.server = RenderServer(('127.0.0.1', 0), self.service)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.shutdown()
+
+    def _post(self, body: bytes, headers: dict = None):
+        connection = HTTPConnection('127.0.0.1', self.server.server_port, timeout=30)
+        connection.request('POST', '/render', body=body, headers=headers or {})
+        response = connection.getresponse()
+        content = response.read()
+        connection.close()
+        return response, content
+
+    def test_render_and_not_modified(self):
+        body = json.dumps({
+            'config': {'dates': '2024-01-01 - 2024-01-02', 'hours': '8 - 12'},
+            'events': [{'day': '2024-01-01', 'start': '9:00', 'end': '10:00', 'title': 'Demo'}],
+        }).encode('utf-8')
+
+        response, content = self._post(body)
+        self.assertEqual(200, response.status)
+        self.assertEqual('image/png', response.getheader('Content-Type'))
+        self.assertTrue(content.startswith(b'\x89PNG'))
+        etag = response.getheader('ETag')
+        self.assertIsNotNone(etag)
+
+        response, content = self._post(body, {'If-None-Match': etag})
+        self.assertEqual(304, response.status)
+        self.assertEqual(b'', content)
+        self.assertEqual(etag, response.getheader('ETag'))
+
+        for header in (f'"other", W/{etag}', '*'):
+            response, _ = self._post(body, {'If-None-Match': header})
+            self.assertEqual(304, response.status, header)
+        response, _ = self._post(body, {'If-None-Match': '"other"'})
+        self.assertEqual(200, response.status)
+
+    def test_bad_request(self):
+        response, _ = self._post(b'{"config": {"colour": "red"}}')
+        self.assertEqual(400, response.status)
+
+    def test_bad_content_length(self):
+        for length in ('abc', '-5'):
+            response, content = self._post(b'{}', {'Content-Length': length})
+            self.assertEqual(400, response.status, length)
+            self.assertIn(b'Content-Length', content)
+
+    def test_queue_is_full(self):
+        body = json.dumps({'config': {'dates': '2024-01-01 - 2024-01-02', 'hours': '8 - 12'}}).encode('utf-8')
+        # the worker and the queue place are taken
+        for _ in range(self.service.workers + self.service.max_queue):
+            self.service._slots.acquire()
+        try:
+            response, _ = self._post(body)
+            self.assertEqual(503, response.status)
+            self.assertEqual('1', response.getheader('Retry-After'))
+        finally:
+            for _ in range(self.service.workers + self.service.max_queue):
+                self.service._slots.release()
+        response, _ = self._post(body)
+        self.assertEqual(200, response.status)
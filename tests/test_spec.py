@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+from datetime import date, time
+from unittest import TestCase
+
+from calendar_view import spec
+from calendar_view.core.event import EventStyles
+
+
+class TestSpec(TestCase):
+    def test_build_event(self):
+        event = spec.build_event({'day': '2024-01-02', 'start': '10:00', 'end': '11:30', 'title': 'Demo',
+                                  'style': 'red'})
+        self.assertEqual('Demo', event.title)
+        self.assertEqual(date(2024, 1, 2), event.get_start_date(None))
+        self.assertEqual(time(11, 30), event.end_time)
+        self.assertEqual(EventStyles.RED, event.style)
+
+        self.assertRaises(spec.SpecError, spec.build_event, {'start': '10:00', 'end': '11:00', 'room': 'A'})
+        self.assertRaises(spec.SpecError, spec.build_event, {'start': '10:00', 'end': '11:00', 'style': 'pink'})
+
+    def test_build_recurrence(self):
+        event = spec.build_event({'day': '2024-01-02', 'start': '10:00', 'end': '11:00',
+                                  'recurrence': {'frequency': 'weekly', 'days_of_week': [1, 3], 'until': '2024-06-30'}})
+        self.assertEqual([1, 3], event.recurrence.days_of_week)
+        self.assertEqual(date(2024, 6, 30), event.recurrence.until)
+
+        self.assertRaises(spec.SpecError, spec.build_recurrence, {'frequency': 'weekly', 'byday': 'TU'})
+        self.assertRaises(spec.SpecError, spec.build_recurrence, 'weekly')
+
+    def test_build_event_style(self):
+        event_style = spec.build_event_style({'event_border': [1, 2, 3, 4], 'event_fill': [5, 6, 7, 8]})
+        self.assertEqual((1, 2, 3, 4), event_style.event_border)
+        self.assertEqual((5, 6, 7, 8), event_style.event_fill)
+
+    def test_build_config(self):
+        config = spec.build_config({'dates': '2024-01-01 - 2024-01-03', 'hours': '8 - 20'})
+        self.assertEqual((date(2024, 1, 1), date(2024, 1, 3)), config.get_date_range())
+        self.assertEqual((8, 20), config.get_hours_range())
+        self.assertRaises(spec.SpecError, spec.build_config, {'colour': 'red'})
+
+    def test_load_spec_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'week.json')
+            with open(path, 'w') as f:
+                json.dump([{'config': {'days': 2}}, {'config': {'days': 3}, 'output': 'custom.png'}], f)
+
+            jobs = spec.load_spec_file(path)
+
+        self.assertEqual(2, len(jobs))
+        self.assertEqual('week-1.png', spec.output_name(jobs[0], path, 0, len(jobs)))
+        self.assertEqual('custom.png', spec.output_name(jobs[1], path, 1, len(jobs)))
+
+    def test_events_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'lobby.json')
+            with open(path, 'w') as f:
+                json.dump({'config': {'days': 2}, 'events': 'events.json'}, f)
+            with open(os.path.join(tmp, 'events.json'), 'w') as f:
+                json.dump([{'day_of_week': 0, 'start': '10:00', 'end': '11:00'}], f)
+
+            jobs = spec.load_spec_file(path)
+            self.assertEqual(1, len(jobs[0]['events']))
+            self.assertEqual([path, os.path.join(tmp, 'events.json')], spec.spec_files(path, jobs))
+
+            with open(os.path.join(tmp, 'events.json'), 'w') as f:
+                json.dump({'day_of_week': 0}, f)
+            self.assertRaises(spec.SpecError, spec.load_spec_file, path)
+
+    def test_job_weight(self):
+        event = {'day_of_week': 0, 'start': '10:00', 'end': '11:00', 'title': 'Demo'}
+        small = {'config': {'days': 1, 'hours': '8 - 12'}, 'events': [event]}
+        many_events = {'config': {'days': 1, 'hours': '8 - 12'}, 'events': [event] * 20}
+        long_hours = {'config': {'days': 1, 'hours': '0 - 24'}, 'events': [event]}
+        self.assertLess(spec.job_weight(small), spec.job_weight(many_events))
+        self.assertLess(spec.job_weight(small), spec.job_weight(long_hours))
+        self.assertEqual(0, spec.job_weight({'config': {'colour': 'red'}}))
+
+    def test_output_name(self):
+        self.assertEqual(os.path.join('team', 'week.png'),
+                         spec.output_name({'output': 'team/./week.png'}, 'jobs.json', 0, 1))
+        for output in ('/tmp/week.png', '../week.png', 'team/../../week.png', '..'):
+            self.assertRaises(spec.SpecError, spec.output_name, {'output': output}, 'jobs.json', 0, 1)
@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+from PIL import Image, ImageChops, ImageDraw
+
+from calendar_view.config import style
+from calendar_view.core.text_cache import TextMaskCache
+
+
+class TestTextMaskCache(TestCase):
+    def test_same_as_multiline_text(self):
+        cache = TextMaskCache()
+        for xy, text, align in [((20, 10), 'Title', 'center'),
+                                ((33.25, 10.75), 'Notes:\nthe second line', 'left'),
+                                ((140.5, 60.4), 'Title', 'center')]:
+            expected = Image.new('RGBA', (300, 150), (196, 234, 188, 210))
+            ImageDraw.Draw(expected).multiline_text(xy, text, font=style.event_notes_font, fill='gray', align=align)
+            actual = Image.new('RGBA', (300, 150), (196, 234, 188, 210))
+
+            cache.draw_multiline_text(actual, xy, text, style.event_notes_font, 'gray', align)
+
+            self.assertIsNone(ImageChops.difference(expected, actual).getbbox(alpha_only=False))
+
+    def test_reuses_masks(self):
+        cache = TextMaskCache()
+        image = Image.new('RGBA', (300, 300))
+        for y in (10, 50, 90):
+            cache.draw_multiline_text(image, (10, y), 'Yoga', style.event_title_font, 'black')
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(2, cache.hits)
+
+    def test_bounded_size(self):
+        cache = TextMaskCache(max_bytes=20000)
+        for i in range(50):
+            cache.get_mask(style.event_title_font, f'Title {i}', 'left', (0, 0))
+        self.assertLessEqual(cache._size, 20000)
+        self.assertGreater(len(cache._masks), 0)
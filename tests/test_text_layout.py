@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from PIL import ImageFont
+
+from calendar_view.config import style
+from calendar_view.core import text_layout
+from calendar_view.core.utils import FontUtils
+
+
+class TestTextLayout(TestCase):
+    def setUp(self):
+        self.configured = style.text_layout
+
+    def tearDown(self):
+        style.text_layout = self.configured
+
+    def test_needs_shaping(self):
+        for text in ['Yoga', 'Café with Zoë', 'Встреча', 'Γιόγκα', '会议', '']:
+            self.assertFalse(text_layout.needs_shaping(text), text)
+        for text in ['اجتماع', 'योग', 'ประชุม', 'ישיבה', 'Café', 'Yoga (योग)']:
+            self.assertTrue(text_layout.needs_shaping(text), text)
+
+    def test_auto(self):
+        style.text_layout = text_layout.AUTO
+        font = style.event_title_font
+        raqm = ImageFont.Layout.RAQM if text_layout.is_raqm_available() else ImageFont.Layout.BASIC
+        self.assertIs(font, text_layout.font_for(font, 'Yoga'))
+        self.assertEqual(raqm, text_layout.font_for(font, 'योग').layout_engine)
+        self.assertIs(text_layout.font_for(font, 'योग'), text_layout.font_for(font, 'اجتماع'))
+
+    def test_configured_layout(self):
+        font = ImageFont.truetype(style.event_title_font.path, 20)  # raqm if it is installed
+        style.text_layout = text_layout.BASIC
+        self.assertEqual(ImageFont.Layout.BASIC, text_layout.font_for(font, 'योग').layout_engine)
+        self.assertEqual(font.size, text_layout.font_for(font, 'योग').size)
+
+        style.text_layout = 'complex'
+        with self.assertRaises(ValueError):
+            text_layout.font_for(font, 'Yoga')
+
+    def test_same_size_for_latin(self):
+        text = 'HOT Core Yoga, 75 mins'
+        style.text_layout = text_layout.BASIC
+        basic = FontUtils.get_text_size(style.event_title_font, text)
+        style.text_layout = text_layout.AUTO
+        self.assertEqual(basic, FontUtils.get_text_size(style.event_title_font, text))
@@ -0,0 +1,87 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import resource_tracker
+from unittest import TestCase
+from unittest.mock import patch
+
+from PIL import ImageChops
+
+from calendar_view.calendar import Calendar
+from calendar_view.core.config import CalendarConfig
+from calendar_view.core.image_pool import ImagePool
+from calendar_view.core.renderers import PillowRenderer
+from calendar_view.core import tiles
+from calendar_view.core.tiles import TileRenderer
+
+
+def build_calendar(tiles: TileRenderer = None) -> Calendar:
+    config = CalendarConfig(lang='en', title='Tiles', dates='2019-09-16 - 2019-09-20', hours='8 - 18', legend=True)
+    calendar = Calendar(config, tiles=tiles)
+    calendar.add_event(title='Yoga', notes='Room 1', start=datetime(2019, 9, 16, 9), end=datetime(2019, 9, 16, 11))
+    calendar.add_event(title='Planning', start=datetime(2019, 9, 16, 10), end=datetime(2019, 9, 16, 12))
+    calendar.add_event(title='Lunch', start=datetime(2019, 9, 18, 12), end=datetime(2019, 9, 18, 13))
+    return calendar
+
+
+class TestRenderBand(TestCase):
+    def test_same_as_render(self):
+        layout = build_calendar().compute_layout()
+        width, height = layout.size
+        full = PillowRenderer().render(layout)
+        for top, bottom in [(0, height), (0, 50), (37, 151), (150, 420), (height - 90, height - 3)]:
+            band = PillowRenderer().render_band(layout, top, bottom)
+            self.assertEqual((width, bottom - top), band.size)
+            self.assertIsNone(ImageChops.difference(full.crop((0, top, width, bottom)), band).getbbox(alpha_only=False),
+                              f'band {top} - {bottom}')
+
+
+class TestTileRenderer(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ProcessPoolExecutor(2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def test_get_bands(self):
+        tiles = TileRenderer(self.executor, bands=3)
+        self.assertEqual([(0, 100), (100, 200), (200, 301)], tiles.get_bands(301))
+        self.assertEqual([(0, 100)], tiles.get_bands(100))
+
+    def test_same_as_pillow_renderer(self):
+        layout = build_calendar().compute_layout()
+        image = TileRenderer(self.executor, bands=3).render(layout)
+        self.assertTrue(image.readonly)
+        self.assertIsNone(ImageChops.difference(PillowRenderer().render(layout), image).getbbox(alpha_only=False))
+
+        pool = ImagePool()
+        pool.release(image)  # the view of the shared memory is not pooled
+        self.assertEqual(0, pool._size)
+
+    def test_calendar(self):
+        expected = build_calendar().to_bytes()
+        calendar = build_calendar(TileRenderer(self.executor, bands=4))
+        self.assertEqual(expected, calendar.to_bytes())
+        calendar.reset()
+        self.assertIsNone(calendar.full_image)
+
+    def test_spawned_workers(self):
+        layout = build_calendar().compute_layout()
+        expected = PillowRenderer().render(layout)
+        with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context('spawn')) as executor:
+            for _ in range(2):
+                image = TileRenderer(executor, bands=3).render(layout)
+                self.assertIsNone(ImageChops.difference(expected, image).getbbox(alpha_only=False))
+
+    def test_worker_does_not_track_memory(self):
+        memory = tiles.ImageMemory(create=True, size=16)
+        try:
+            with patch.object(resource_tracker, 'register') as register:
+                attached = tiles._attach_memory(memory.name)
+                self.assertIs(register, resource_tracker.register)
+            attached.close()
+            register.assert_not_called()
+        finally:
+            memory.unlink()
@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from PIL import Image, ImageChops
+
+from calendar_view import spec as job_spec
+from calendar_view.core.renderers import PillowRenderer
+from calendar_view.watch import SpecWatcher, WatchedCalendar, save_atomic
+
+
+CONFIG = {'title': 'Lobby', 'dates': '2024-01-01 - 2024-01-05', 'hours': '8 - 18'}
+EVENTS = [
+    {'day': '2024-01-01', 'start': '9:00', 'end': '11:00', 'title': 'Standup', 'notes': 'Room 1'},
+    {'day': '2024-01-02', 'start': '10:00', 'end': '12:00', 'title': 'Planning', 'style': 'green'},
+    {'day': '2024-01-04', 'start': '13:00', 'end': '15:00', 'title': 'Review', 'style': 'blue'},
+]
+
+
+def render_full(spec: dict) -> Image.Image:
+    return PillowRenderer().render(job_spec.build_calendar(spec).compute_layout())
+
+
+class TestWatchedCalendar(TestCase):
+    def assertSameImage(self, expected: Image.Image, actual: Image.Image):
+        self.assertIsNone(ImageChops.difference(expected, actual).getbbox(alpha_only=False))
+
+    def test_changed_days(self):
+        calendar = WatchedCalendar('lobby.png')
+        self.assertIsNone(calendar.update({'config': CONFIG, 'events': EVENTS}))
+        self.assertEqual([], calendar.update({'config': CONFIG, 'events': list(reversed(EVENTS))}))
+
+        overlap = {'day': '2024-01-02', 'start': '11:00', 'end': '13:00', 'title': 'Lunch'}
+        spec = {'config': CONFIG, 'events': EVENTS + [overlap]}
+        self.assertEqual([1], calendar.update(spec))
+        self.assertSameImage(render_full(spec), calendar.image)
+
+        spec = {'config': CONFIG, 'events': [dict(EVENTS[0], day='2024-01-03')] + EVENTS[1:]}
+        self.assertEqual([0, 1, 2], calendar.update(spec))
+        self.assertSameImage(render_full(spec), calendar.image)
+
+    def test_full_render(self):
+        calendar = WatchedCalendar('lobby.png')
+        calendar.update({'config': CONFIG, 'events': EVENTS})
+        spec = {'config': dict(CONFIG, title='Hall'), 'events': EVENTS}
+        self.assertIsNone(calendar.update(spec))
+        self.assertSameImage(render_full(spec), calendar.image)
+
+        spec = {'config': dict(CONFIG, title='Hall', legend=True), 'events': EVENTS}
+        calendar.update(spec)
+        spec['events'] = EVENTS[:2]
+        self.assertIsNone(calendar.update(spec))  # the legend is changed
+
+    def test_fitted_grid(self):
+        config = dict(CONFIG, fit_hours=True)
+        calendar = WatchedCalendar('lobby.png')
+        calendar.update({'config': config, 'events': EVENTS})
+        spec = {'config': config, 'events': EVENTS[:1] + [dict(EVENTS[1], title='Retro')] + EVENTS[2:]}
+        self.assertEqual([1], calendar.update(spec))
+        self.assertSameImage(render_full(spec), calendar.image)
+
+        spec = {'config': config, 'events': EVENTS[:2]}
+        self.assertIsNone(calendar.update(spec))  # the fitted hours are changed
+        self.assertSameImage(render_full(spec), calendar.image)
+
+
+class TestSpecWatcher(TestCase):
+    def test_poll(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'lobby.json')
+            events_path = os.path.join(tmp, 'events.json')
+            with open(path, 'w') as f:
+                json.dump({'config': CONFIG, 'events': 'events.json'}, f)
+            with open(events_path, 'w') as f:
+                json.dump(EVENTS, f)
+
+            watcher = SpecWatcher([path], tmp)
+            output = os.path.join(tmp, 'lobby.png')
+            self.assertEqual([(output, None)], watcher.poll())
+            self.assertEqual([], watcher.poll())
+
+            with open(events_path, 'w') as f:
+                json.dump(EVENTS[:2], f)
+            os.utime(events_path, ns=(0, 1))
+            self.assertEqual([(output, [3])], watcher.poll())
+            with Image.open(output) as image:
+                self.assertIsNone(ImageChops.difference(
+                    render_full({'config': CONFIG, 'events': EVENTS[:2]}), image).getbbox(alpha_only=False))
+
+            with open(events_path, 'w') as f:
+                f.write('[{"day": ')  # in the middle of the editing
+            self.assertEqual([], watcher.poll())
+            self.assertEqual(['events.json', 'lobby.json', 'lobby.png'], sorted(os.listdir(tmp)))
+            watcher.close()
+
+    def test_save_atomic(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'lobby.png')
+            save_atomic(Image.new('RGBA', (4, 3)), filename)
+            self.assertEqual(['lobby.png'], os.listdir(tmp))
+            with Image.open(filename) as image:
+                self.assertEqual((4, 3), image.size)